@@ -5,6 +5,10 @@ It exposes the ASGI callable as a module-level variable named ``application``.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
+
+Las vistas async (p. ej. AsyncRegisterView) corren en el event loop solo
+bajo este handler, servido con un servidor ASGI:
+    uvicorn activapro.asgi:application --workers 4
 """
 
 import os
@@ -87,6 +87,20 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+# Debe ser compartida por todos los procesos: las versiones de PlanTreeService,
+# ComplianceService y CatalogService, las claves de idempotencia de webhooks y
+# los perfiles cacheados se invalidan escribiendo acá (LocMemCache es por proceso)
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': 'redis://127.0.0.1:6379/1',
+        'KEY_PREFIX': 'activapro',
+    }
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -133,6 +147,31 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # Para usar el modelo User de Django
 AUTH_USER_MODEL = 'auth.User'  # O tu modelo personalizado si lo tienes
 
+# PrincipalBackend carga el usuario con su perfil en una consulta y lo cachea.
+# ModelBackend queda para las sesiones abiertas antes del cambio.
+AUTHENTICATION_BACKENDS = [
+    'api.auth_backends.PrincipalBackend',
+    'django.contrib.auth.backends.ModelBackend',
+]
+
+# Segundos que se cachea el usuario autenticado con su perfil (ver PrincipalService)
+PRINCIPAL_CACHE_TTL = 300
+
 # Configuración de archivos media (para las imágenes)
 MEDIA_URL = '/media/'
-MEDIA_ROOT = BASE_DIR / 'media'
\ No newline at end of file
+MEDIA_ROOT = BASE_DIR / 'media'
+
+# Hilos para generar miniaturas de ImagenEjecucion fuera del request
+IMAGE_RENDITION_WORKERS = 2
+
+# Procesos del pool que hashea contraseñas en la importación masiva de alumnos. El pool es
+# persistente y lo levanta cada worker web que atiende una importación, así que el total
+# puede llegar a (workers web x PASSWORD_HASH_WORKERS) procesos: se acota a 2 por worker
+# (nunca más que los núcleos disponibles; None = uno por núcleo)
+PASSWORD_HASH_WORKERS = 2
+
+# Hilos para el hasheo y la transacción del registro async (AsyncRegisterView)
+REGISTRATION_WORKERS = 4
+
+# Entrenadores con tipos personalizados en el catálogo en memoria (ver CatalogService)
+CATALOG_COACH_LRU = 256
@@ -1,12 +1,18 @@
 from django.contrib import admin
+from django.db import transaction
+from django.forms.models import BaseInlineFormSet
+
 from .models import (
     Entrenador, Alumno,
     TipoActividad, TipoRutina,
     Rutina,
     PlanEntrenamiento, Semana, DiaPlantilla,
     AsignacionPlan, DiaAsignado,
-    EjecucionEntrenamiento, ImagenEjecucion
+    EjecucionEntrenamiento, ImagenEjecucion,
+    ResumenSemanal, CargaDiaria, RecordPersonal, BlobMedia, EventoWebhook
 )
+from .services.plan_assignment import PlanAssignmentService
+from .services.plan_sync import PlanSyncService
 
 @admin.register(Entrenador)
 class EntrenadorAdmin(admin.ModelAdmin):
@@ -38,38 +44,73 @@ class RutinaAdmin(admin.ModelAdmin):
     list_filter = ['tipo_actividad', 'tipo_rutina', 'created_at']
     search_fields = ['nombre', 'descripcion']
 
+class PlanSyncBatchAdmin(admin.ModelAdmin):
+    """Los cambios de un formulario o acción del admin disparan una sola sincronización por plan"""
+
+    def changeform_view(self, *args, **kwargs):
+        with PlanSyncService.batch():
+            return super().changeform_view(*args, **kwargs)
+
+    def delete_view(self, *args, **kwargs):
+        with PlanSyncService.batch():
+            return super().delete_view(*args, **kwargs)
+
+    def changelist_view(self, *args, **kwargs):
+        with PlanSyncService.batch():
+            return super().changelist_view(*args, **kwargs)
+
 class SemanaInline(admin.TabularInline):
     model = Semana
     extra = 1
 
 @admin.register(PlanEntrenamiento)
-class PlanEntrenamientoAdmin(admin.ModelAdmin):
+class PlanEntrenamientoAdmin(PlanSyncBatchAdmin):
     list_display = ['nombre', 'entrenador', 'tipo_actividad', 'duracion_semanas', 'is_template']
     list_filter = ['is_template', 'tipo_actividad', 'created_at']
     search_fields = ['nombre', 'descripcion']
     inlines = [SemanaInline]
 
+class DiaPlantillaFormSet(BaseInlineFormSet):
+    def delete_existing(self, obj, commit=True):
+        if commit:
+            PlanSyncService.delete_template_day(obj)
+
 class DiaPlantillaInline(admin.TabularInline):
     model = DiaPlantilla
+    formset = DiaPlantillaFormSet
     extra = 7
 
 @admin.register(Semana)
-class SemanaAdmin(admin.ModelAdmin):
+class SemanaAdmin(PlanSyncBatchAdmin):
     list_display = ['plan', 'numero_semana', 'nombre']
     list_filter = ['plan']
     inlines = [DiaPlantillaInline]
 
 @admin.register(DiaPlantilla)
-class DiaPlantillaAdmin(admin.ModelAdmin):
+class DiaPlantillaAdmin(PlanSyncBatchAdmin):
     list_display = ['semana', 'dia_semana', 'rutina', 'orden', 'es_descanso']
     list_filter = ['dia_semana', 'semana__plan']
 
+    def delete_model(self, request, obj):
+        PlanSyncService.delete_template_day(obj)
+
+    def delete_queryset(self, request, queryset):
+        with PlanSyncService.batch(), transaction.atomic():
+            for dia_plantilla in queryset:
+                PlanSyncService.delete_template_day(dia_plantilla)
+
 @admin.register(AsignacionPlan)
 class AsignacionPlanAdmin(admin.ModelAdmin):
-    list_display = ['plan', 'alumno', 'fecha_inicio', 'fecha_fin', 'estado', 'esta_activo']
-    list_filter = ['estado', 'fecha_inicio']
+    list_display = ['plan', 'alumno', 'fecha_inicio', 'fecha_fin', 'estado', 'modo_calendario', 'esta_activo']
+    list_filter = ['estado', 'modo_calendario', 'fecha_inicio']
     search_fields = ['alumno__user__username', 'plan__nombre']
 
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        if not change:
+            # Genera los días concretos de la nueva asignación
+            PlanAssignmentService.generate_days(obj)
+
 @admin.register(DiaAsignado)
 class DiaAsignadoAdmin(admin.ModelAdmin):
     list_display = ['asignacion_plan', 'fecha_especifica', 'dia_semana', 'completado']
@@ -78,6 +119,7 @@ class DiaAsignadoAdmin(admin.ModelAdmin):
 class ImagenEjecucionInline(admin.TabularInline):
     model = ImagenEjecucion
     extra = 1
+    readonly_fields = ['miniatura', 'display', 'ancho', 'alto', 'procesada']
 
 @admin.register(EjecucionEntrenamiento)
 class EjecucionEntrenamientoAdmin(admin.ModelAdmin):
@@ -89,6 +131,40 @@ class EjecucionEntrenamientoAdmin(admin.ModelAdmin):
     inlines = [ImagenEjecucionInline]
 
 class ImagenEjecucionAdmin(admin.ModelAdmin):
-    list_display = ['ejecucion', 'imagen', 'descripcion', 'uploaded_at']
-    list_filter = ['uploaded_at']
-    search_fields = ['descripcion', 'ejecucion__dia_asignado__asignacion_plan__alumno__user__username']
\ No newline at end of file
+    list_display = ['ejecucion', 'imagen', 'descripcion', 'procesada', 'uploaded_at']
+    list_filter = ['procesada', 'uploaded_at']
+    search_fields = ['descripcion', 'ejecucion__dia_asignado__asignacion_plan__alumno__user__username']
+
+@admin.register(ResumenSemanal)
+class ResumenSemanalAdmin(admin.ModelAdmin):
+    list_display = ['alumno', 'semana', 'tipo_actividad', 'distancia_km', 'duracion_minutos', 'sesiones']
+    list_filter = ['semana', 'tipo_actividad']
+    search_fields = ['alumno__user__username']
+
+@admin.register(CargaDiaria)
+class CargaDiariaAdmin(admin.ModelAdmin):
+    list_display = ['alumno', 'fecha', 'trimp', 'atl', 'ctl', 'tsb']
+    list_filter = ['fecha']
+    search_fields = ['alumno__user__username']
+
+@admin.register(RecordPersonal)
+class RecordPersonalAdmin(admin.ModelAdmin):
+    list_display = ['alumno', 'tipo_actividad', 'categoria', 'ritmo_seg_km', 'tiempo_seg', 'distancia_km', 'fecha']
+    list_filter = ['categoria', 'tipo_actividad']
+    search_fields = ['alumno__user__username']
+    raw_id_fields = ['ejecucion']
+
+@admin.register(BlobMedia)
+class BlobMediaAdmin(admin.ModelAdmin):
+    list_display = ['nombre', 'tamano', 'referencias', 'updated_at']
+    list_filter = ['updated_at']
+    search_fields = ['nombre']
+    readonly_fields = ['nombre', 'tamano', 'referencias', 'created_at', 'updated_at']
+
+
+@admin.register(EventoWebhook)
+class EventoWebhookAdmin(admin.ModelAdmin):
+    list_display = ['clave', 'tipo', 'user_id', 'resultado', 'procesado_at', 'created_at']
+    list_filter = ['tipo', 'resultado', 'procesado_at']
+    search_fields = ['clave', 'user_id']
+    readonly_fields = ['clave', 'tipo', 'user_id', 'payload', 'procesado_at', 'resultado', 'created_at', 'updated_at']
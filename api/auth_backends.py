@@ -0,0 +1,30 @@
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.models import User
+
+from .services.principal import PrincipalService, principal_queryset
+
+
+class PrincipalBackend(ModelBackend):
+    """
+    ModelBackend que entrega el usuario con su perfil (Entrenador o Alumno
+    con su entrenador) ya cargado: en el login con una consulta con JOINs y
+    en cada petición autenticada desde la cache de PrincipalService.
+    """
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        if username is None:
+            username = kwargs.get(User.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+        user = principal_queryset().filter(**{User.USERNAME_FIELD: username}).first()
+        if user is None:
+            # Se hashea igual para no revelar por el tiempo de respuesta qué usuarios existen
+            User().set_password(password)
+            return None
+        if user.check_password(password) and self.user_can_authenticate(user):
+            return user
+        return None
+
+    def get_user(self, user_id):
+        user = PrincipalService.load(user_id)
+        return user if self.user_can_authenticate(user) else None
@@ -0,0 +1,60 @@
+from django.core.management.base import BaseCommand
+from django.db.models import OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from ...models.plan_assignment import DiaAsignado
+from ...models.execution import EjecucionEntrenamiento
+
+
+class Command(BaseCommand):
+    help = (
+        "Completa en las ejecuciones históricas los campos derivados: "
+        "ritmo_seg_km, alumno y tipo_actividad."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=2000)
+        parser.add_argument(
+            '--todas',
+            action='store_true',
+            help="Recalcula también las filas que ya tienen los campos completos."
+        )
+
+    def handle(self, *args, **options):
+        ejecuciones = EjecucionEntrenamiento.objects.all()
+
+        # alumno y tipo_actividad: un UPDATE con subconsultas, sin traer filas a Python
+        dia = DiaAsignado.objects.filter(pk=OuterRef('dia_asignado_id'))
+        pendientes = ejecuciones if options['todas'] else ejecuciones.filter(alumno__isnull=True)
+        contexto = pendientes.update(
+            alumno_id=Subquery(dia.values('asignacion_plan__alumno_id')[:1]),
+            tipo_actividad_id=Subquery(dia.values(
+                tipo=Coalesce(
+                    'dia_plantilla__rutina__tipo_actividad_id',
+                    'asignacion_plan__plan__tipo_actividad_id'
+                )
+            )[:1])
+        )
+
+        # ritmo_seg_km: el texto libre se interpreta en Python, por lotes
+        pendientes = ejecuciones if options['todas'] else ejecuciones.filter(ritmo_seg_km__isnull=True)
+        filas = pendientes.only('id', 'ritmo', 'distancia_km', 'duracion_minutos').order_by()
+
+        lote = []
+        ritmos = 0
+        for ejecucion in filas.iterator(chunk_size=options['chunk_size']):
+            ritmo = ejecucion.calcular_ritmo_seg_km()
+            if ritmo is None:
+                continue
+            ejecucion.ritmo_seg_km = ritmo
+            lote.append(ejecucion)
+            if len(lote) >= options['chunk_size']:
+                ritmos += EjecucionEntrenamiento.objects.bulk_update(lote, ['ritmo_seg_km'])
+                lote = []
+        if lote:
+            ritmos += EjecucionEntrenamiento.objects.bulk_update(lote, ['ritmo_seg_km'])
+
+        self.stdout.write(
+            f"Alumno / tipo de actividad completados en {contexto} ejecuciones. "
+            f"Ritmo normalizado en {ritmos} ejecuciones."
+        )
@@ -0,0 +1,78 @@
+import time
+from datetime import date
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from ...models import (
+    Entrenador, Alumno, TipoActividad, Rutina,
+    PlanEntrenamiento, Semana, DiaPlantilla, DiaAsignado
+)
+from ...services.plan_assignment import PlanAssignmentService
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark de asignación por cohorte (por defecto 500 alumnos x plan de 12 semanas). "
+        "Los datos se crean dentro de una transacción que se revierte al terminar."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--alumnos', type=int, default=500)
+        parser.add_argument('--semanas', type=int, default=12)
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self._run(options['alumnos'], options['semanas'])
+                raise _Rollback()
+        except _Rollback:
+            pass
+
+    def _run(self, n_alumnos, n_semanas):
+        coach_user = User.objects.create(username='bench_coach_cohorte')
+        entrenador = Entrenador.objects.create(user=coach_user, is_active=True)
+        tipo = TipoActividad.objects.create(nombre='bench_running', entrenador=entrenador)
+        rutina = Rutina.objects.create(entrenador=entrenador, tipo_actividad=tipo, nombre='bench')
+
+        plan = PlanEntrenamiento.objects.create(
+            entrenador=entrenador,
+            tipo_actividad=tipo,
+            nombre='bench',
+            duracion_semanas=n_semanas,
+            is_template=True
+        )
+        semanas = Semana.objects.bulk_create(
+            [Semana(plan=plan, numero_semana=n) for n in range(1, n_semanas + 1)]
+        )
+        DiaPlantilla.objects.bulk_create([
+            DiaPlantilla(semana=semana, dia_semana=dia, orden=orden, rutina=rutina)
+            for semana in semanas
+            for orden, (dia, _) in enumerate(DiaPlantilla.DIAS_SEMANA)
+        ])
+
+        users = User.objects.bulk_create([
+            User(username=f'bench_alumno_{i}', password='!') for i in range(n_alumnos)
+        ])
+        alumnos = Alumno.objects.bulk_create([
+            Alumno(user=user, entrenador=entrenador) for user in users
+        ])
+
+        with CaptureQueriesContext(connection) as queries:
+            inicio = time.perf_counter()
+            asignaciones, errores = PlanAssignmentService.assign_cohort(
+                plan, [a.id for a in alumnos], date.today()
+            )
+            duracion = time.perf_counter() - inicio
+
+        dias = DiaAsignado.objects.filter(asignacion_plan__plan=plan).count()
+        self.stdout.write(
+            f"{len(asignaciones)} asignaciones, {dias} días, {len(errores)} errores\n"
+            f"{len(queries)} consultas en {duracion * 1000:.1f} ms"
+        )
@@ -0,0 +1,104 @@
+import time
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from ...models import (
+    Entrenador, Alumno, TipoActividad, TipoRutina, Rutina,
+    PlanEntrenamiento, Semana, DiaPlantilla, EjecucionEntrenamiento
+)
+from ...services.plan_assignment import PlanAssignmentService
+from ...views.calendar import CalendarView
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Presupuesto de latencia p95 del calendario del alumno. Falla si el p95 supera el "
+        "presupuesto (la regresión de consultas está en api.tests.test_calendar)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--semanas', type=int, default=24)
+        parser.add_argument('--repeticiones', type=int, default=200)
+        parser.add_argument('--p95-ms', type=float, default=50.0)
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self._run(options)
+                raise _Rollback()
+        except _Rollback:
+            pass
+
+    def _run(self, options):
+        hoy = timezone.localdate()
+        coach_user = User.objects.create(username='bench_coach_calendario')
+        entrenador = Entrenador.objects.create(user=coach_user, is_active=True)
+        tipo = TipoActividad.objects.create(nombre='bench_running', entrenador=entrenador)
+        tipo_rutina = TipoRutina.objects.create(nombre='bench_series', entrenador=entrenador)
+        rutina = Rutina.objects.create(
+            entrenador=entrenador, tipo_actividad=tipo, tipo_rutina=tipo_rutina, nombre='bench'
+        )
+        plan = PlanEntrenamiento.objects.create(
+            entrenador=entrenador, tipo_actividad=tipo, nombre='bench',
+            duracion_semanas=options['semanas'], is_template=True
+        )
+        semanas = Semana.objects.bulk_create([
+            Semana(plan=plan, numero_semana=n) for n in range(1, options['semanas'] + 1)
+        ])
+        DiaPlantilla.objects.bulk_create([
+            DiaPlantilla(
+                semana=semana, dia_semana=dia, orden=orden,
+                rutina=rutina if orden % 2 == 0 else None
+            )
+            for semana in semanas
+            for orden, (dia, _) in enumerate(DiaPlantilla.DIAS_SEMANA)
+        ])
+
+        factory = APIRequestFactory()
+        vista = CalendarView.as_view()
+
+        for modo in ('materializado', 'virtual'):
+            alumno_user = User.objects.create(username=f'bench_alumno_calendario_{modo}')
+            alumno = Alumno.objects.create(user=alumno_user, entrenador=entrenador)
+            asignacion = PlanAssignmentService.assign_plan(
+                plan, alumno, hoy - timedelta(days=30), modo_calendario=modo
+            )
+            if modo == 'materializado':
+                EjecucionEntrenamiento.objects.bulk_create([
+                    EjecucionEntrenamiento(dia_asignado=dia, fecha_hora_ejecucion=timezone.now())
+                    for dia in asignacion.dias_asignados.filter(fecha_especifica__lt=hoy)
+                ])
+
+            # Primera petición fuera de la medición: carga el catálogo de tipos en memoria
+            request = factory.get('/api/calendario/', {'from': hoy.isoformat(), 'to': hoy.isoformat()})
+            force_authenticate(request, user=User.objects.get(pk=alumno_user.pk))
+            vista(request)
+
+            tiempos = []
+            request_data = {'from': hoy.isoformat(), 'to': (hoy + timedelta(days=30)).isoformat()}
+            for _ in range(options['repeticiones']):
+                request = factory.get('/api/calendario/', request_data)
+                force_authenticate(request, user=User.objects.get(pk=alumno_user.pk))
+                inicio = time.perf_counter()
+                response = vista(request)
+                response.render()
+                tiempos.append((time.perf_counter() - inicio) * 1000)
+                if response.status_code != 200:
+                    raise CommandError(f"Respuesta inesperada {response.status_code}: {response.data}")
+
+            tiempos.sort()
+            p95 = tiempos[int(len(tiempos) * 0.95) - 1]
+            self.stdout.write(
+                f"[{modo}] p50 {tiempos[len(tiempos) // 2]:.2f} ms, p95 {p95:.2f} ms"
+            )
+            if p95 > options['p95_ms']:
+                raise CommandError(f"[{modo}] p95 {p95:.2f} ms supera el presupuesto de {options['p95_ms']} ms")
@@ -0,0 +1,98 @@
+import time
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from ...models import (
+    Entrenador, Alumno, TipoActividad, Rutina,
+    PlanEntrenamiento, Semana, DiaPlantilla, DiaAsignado
+)
+from ...services.compliance import ComplianceService
+from ...services.plan_assignment import PlanAssignmentService
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark del reporte de cumplimiento sobre dia_asignado "
+        "(por defecto 1000 alumnos x 143 semanas ~ 1M filas). "
+        "Los datos se crean dentro de una transacción que se revierte al terminar."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--alumnos', type=int, default=1000)
+        parser.add_argument('--semanas', type=int, default=143)
+        parser.add_argument('--semanas-reporte', type=int, default=12)
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self._run(options)
+                raise _Rollback()
+        except _Rollback:
+            pass
+
+    def _run(self, options):
+        hoy = timezone.localdate()
+        coach_user = User.objects.create(username='bench_coach_cumplimiento')
+        entrenador = Entrenador.objects.create(user=coach_user, is_active=True)
+        tipo = TipoActividad.objects.create(nombre='bench_running', entrenador=entrenador)
+        rutina = Rutina.objects.create(entrenador=entrenador, tipo_actividad=tipo, nombre='bench')
+
+        plan = PlanEntrenamiento.objects.create(
+            entrenador=entrenador, tipo_actividad=tipo, nombre='bench',
+            duracion_semanas=options['semanas'], is_template=True
+        )
+        semanas = Semana.objects.bulk_create([
+            Semana(plan=plan, numero_semana=n) for n in range(1, options['semanas'] + 1)
+        ])
+        DiaPlantilla.objects.bulk_create([
+            DiaPlantilla(
+                semana=semana, dia_semana=dia, orden=orden,
+                rutina=rutina if orden % 3 else None
+            )
+            for semana in semanas
+            for orden, (dia, _) in enumerate(DiaPlantilla.DIAS_SEMANA)
+        ])
+
+        users = User.objects.bulk_create([
+            User(username=f'bench_alumno_cumplimiento_{i}', password='!')
+            for i in range(options['alumnos'])
+        ])
+        alumnos = Alumno.objects.bulk_create([
+            Alumno(user=user, entrenador=entrenador) for user in users
+        ])
+
+        inicio_plan = hoy - timedelta(weeks=options['semanas'] - 1)
+        inicio = time.perf_counter()
+        PlanAssignmentService.assign_cohort(plan, [a.id for a in alumnos], inicio_plan)
+        DiaAsignado.objects.filter(
+            asignacion_plan__plan=plan,
+            fecha_especifica__lt=hoy,
+            dia_semana__in=['lunes', 'miercoles', 'viernes', 'sabado']
+        ).update(completado=True)
+        carga = time.perf_counter() - inicio
+
+        filas = DiaAsignado.objects.filter(asignacion_plan__plan=plan).count()
+        self.stdout.write(f"{filas} filas en dia_asignado generadas en {carga:.1f} s")
+
+        desde = hoy - timedelta(weeks=options['semanas_reporte'])
+        cache.delete(ComplianceService.version_key(entrenador.pk))
+
+        for etiqueta in ('frío', 'cacheado'):
+            with CaptureQueriesContext(connection) as queries:
+                inicio = time.perf_counter()
+                resultado = ComplianceService.coach_compliance(entrenador, desde, hoy)
+                duracion = time.perf_counter() - inicio
+            self.stdout.write(
+                f"[{etiqueta}] {len(resultado)} celdas alumno/semana, "
+                f"{len(queries)} consultas, {duracion * 1000:.1f} ms"
+            )
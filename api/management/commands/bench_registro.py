@@ -0,0 +1,77 @@
+import asyncio
+import time
+import uuid
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.test import AsyncClient, override_settings
+
+# Prefijo de los usuarios creados por el benchmark (se borran al terminar)
+PREFIJO = 'bench_registro_'
+
+RUTAS = {
+    'sync': '/api/auth/register/',
+    'async': '/api/auth/register/async/',
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Carga concurrente sobre el registro sync (RegisterView) y async (AsyncRegisterView) "
+        "a través del handler ASGI. Reporta peticiones por segundo y latencias p50 / p99. "
+        "Ambas vistas corren bajo ASGI: no mide RegisterView servida por WSGI."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--solicitudes', type=int, default=40)
+        parser.add_argument('--concurrencia', type=int, default=8)
+        parser.add_argument('--vistas', nargs='+', choices=list(RUTAS), default=list(RUTAS))
+
+    def handle(self, *args, **options):
+        if options['solicitudes'] < 1 or options['concurrencia'] < 1:
+            raise CommandError("--solicitudes y --concurrencia deben ser mayores a 0.")
+        try:
+            with override_settings(ALLOWED_HOSTS=['testserver']):
+                for vista in options['vistas']:
+                    resultado = asyncio.run(
+                        self._run(RUTAS[vista], options['solicitudes'], options['concurrencia'])
+                    )
+                    self._report(vista, resultado)
+        finally:
+            User.objects.filter(username__startswith=PREFIJO).delete()
+
+    async def _run(self, ruta, solicitudes, concurrencia):
+        client = AsyncClient()
+        semaforo = asyncio.Semaphore(concurrencia)
+        latencias = []
+        errores = []
+
+        async def registrar():
+            sufijo = uuid.uuid4().hex[:12]
+            payload = {
+                'username': f'{PREFIJO}{sufijo}',
+                'email': f'{PREFIJO}{sufijo}@example.com',
+                'password': 'bench-registro-1',
+                'role': 'coach',
+            }
+            async with semaforo:
+                inicio = time.perf_counter()
+                response = await client.post(ruta, payload, content_type='application/json')
+                latencias.append((time.perf_counter() - inicio) * 1000)
+            if response.status_code != 201:
+                errores.append(response.status_code)
+
+        inicio = time.perf_counter()
+        await asyncio.gather(*(registrar() for _ in range(solicitudes)))
+        total = time.perf_counter() - inicio
+        return total, sorted(latencias), errores
+
+    def _report(self, vista, resultado):
+        total, latencias, errores = resultado
+        if errores:
+            raise CommandError(f"[{vista}] {len(errores)} respuestas inesperadas: {sorted(set(errores))}")
+        p99 = latencias[max(int(len(latencias) * 0.99) - 1, 0)]
+        self.stdout.write(
+            f"[{vista}] {len(latencias) / total:.1f} req/s, "
+            f"p50 {latencias[len(latencias) // 2]:.1f} ms, p99 {p99:.1f} ms"
+        )
@@ -0,0 +1,127 @@
+import json
+import random
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client, override_settings
+
+from ...models import Entrenador, EventoWebhook
+from ...services.webhook_inbox import WebhookInboxService, IDEMPOTENCY_CACHE_PREFIX
+
+# Prefijo de usuarios y claves creados por la simulación (se borran al terminar)
+PREFIJO = 'fake_pagos_'
+RUTA = '/api/auth/payment/coach-activate/'
+
+
+class Command(BaseCommand):
+    help = (
+        "Proveedor de pagos simulado: crea entrenadores inactivos, envía el webhook de "
+        "activación de cada uno con reintentos duplicados y concurrencia, mide la latencia "
+        "del acuse, drena la bandeja y verifica que todos queden activos. Sin --url envía "
+        "las peticiones en proceso; con --url contra un servidor que use la misma base."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--entrenadores', type=int, default=200)
+        parser.add_argument('--reintentos', type=int, default=3, help="Entregas por evento.")
+        parser.add_argument('--concurrencia', type=int, default=8)
+        parser.add_argument('--url', help="URL base de un servidor en marcha, p. ej. http://localhost:8000")
+
+    def handle(self, *args, **options):
+        if options['entrenadores'] < 1 or options['reintentos'] < 1 or options['concurrencia'] < 1:
+            raise CommandError("--entrenadores, --reintentos y --concurrencia deben ser mayores a 0.")
+        try:
+            with override_settings(ALLOWED_HOSTS=['testserver', 'localhost', '127.0.0.1']):
+                self._run(options)
+        finally:
+            claves = list(
+                EventoWebhook.objects.filter(clave__startswith=PREFIJO).values_list('clave', flat=True)
+            )
+            cache.delete_many([f'{IDEMPOTENCY_CACHE_PREFIX}{clave}' for clave in claves])
+            EventoWebhook.objects.filter(clave__startswith=PREFIJO).delete()
+            User.objects.filter(username__startswith=PREFIJO).delete()
+
+    def _run(self, options):
+        usuarios = User.objects.bulk_create([
+            User(username=f'{PREFIJO}{n}', email=f'{PREFIJO}{n}@example.com')
+            for n in range(options['entrenadores'])
+        ])
+        Entrenador.objects.bulk_create([Entrenador(user=user, is_active=False) for user in usuarios])
+
+        entregas = [user.id for user in usuarios for _ in range(options['reintentos'])]
+        random.shuffle(entregas)
+        enviar = self._sender(options['url'])
+
+        def entregar(user_id):
+            inicio = time.perf_counter()
+            codigo = enviar(user_id, f'{PREFIJO}evt_{user_id}')
+            return codigo, (time.perf_counter() - inicio) * 1000
+
+        inicio = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options['concurrencia']) as pool:
+            resultados = list(pool.map(entregar, entregas))
+        total = time.perf_counter() - inicio
+
+        codigos = [codigo for codigo, _ in resultados]
+        inesperados = sorted({codigo for codigo in codigos if codigo not in (200, 202)})
+        if inesperados:
+            raise CommandError(f"Respuestas inesperadas del webhook: {inesperados}")
+
+        latencias = sorted(latencia for _, latencia in resultados)
+        p99 = latencias[max(int(len(latencias) * 0.99) - 1, 0)]
+        self.stdout.write(
+            f"{len(entregas)} entregas en {total:.2f} s ({len(entregas) / total:.1f} req/s), "
+            f"p50 {latencias[len(latencias) // 2]:.1f} ms, p99 {p99:.1f} ms; "
+            f"{codigos.count(202)} encoladas, {codigos.count(200)} duplicadas"
+        )
+
+        filas = EventoWebhook.objects.filter(clave__startswith=PREFIJO).count()
+        if filas != len(usuarios):
+            raise CommandError(f"Se esperaban {len(usuarios)} eventos en la bandeja y hay {filas}.")
+
+        inicio = time.perf_counter()
+        procesados, activados = WebhookInboxService.drain_pending()
+        self.stdout.write(
+            f"Drenado: {procesados} eventos, {activados} entrenadores activados "
+            f"en {(time.perf_counter() - inicio) * 1000:.1f} ms"
+        )
+        pendientes = Entrenador.objects.filter(user__in=usuarios, is_active=False).count()
+        if pendientes:
+            raise CommandError(f"{pendientes} entrenadores quedaron sin activar.")
+
+    def _sender(self, url):
+        """Función (user_id, event_id) -> código HTTP para el modo elegido"""
+        if url:
+            destino = url.rstrip('/') + RUTA
+
+            def enviar(user_id, event_id):
+                request = urllib.request.Request(
+                    destino,
+                    data=json.dumps({'user_id': user_id, 'event_id': event_id}).encode(),
+                    headers={'Content-Type': 'application/json', 'Idempotency-Key': event_id},
+                    method='POST'
+                )
+                try:
+                    with urllib.request.urlopen(request, timeout=30) as response:
+                        return response.status
+                except urllib.error.HTTPError as e:
+                    return e.code
+            return enviar
+
+        clientes = threading.local()
+
+        def enviar(user_id, event_id):
+            if not hasattr(clientes, 'client'):
+                clientes.client = Client()
+            response = clientes.client.post(
+                RUTA, {'user_id': user_id, 'event_id': event_id},
+                content_type='application/json', headers={'Idempotency-Key': event_id}
+            )
+            return response.status_code
+        return enviar
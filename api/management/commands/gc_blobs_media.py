@@ -0,0 +1,39 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from ...services.media_blobs import MediaBlobService, BLOB_GC_GRACE
+
+
+class Command(BaseCommand):
+    help = (
+        "Elimina los blobs de media sin referencias (MEDIA_ROOT/ejecuciones/blobs/) y las "
+        "miniaturas / versiones para pantalla de imágenes que ya no existen. "
+        "Con --reconstruir recalcula antes las referencias y con --migrar mueve al "
+        "storage por contenido las imágenes guardadas con la ruta anterior."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--gracia-horas', type=float, default=BLOB_GC_GRACE.total_seconds() / 3600,
+            help="Horas sin uso antes de borrar un blob."
+        )
+        parser.add_argument('--reconstruir', action='store_true')
+        parser.add_argument('--migrar', action='store_true')
+        parser.add_argument('--dry-run', action='store_true', help="Solo informa, no borra.")
+
+    def handle(self, *args, **options):
+        dry_run = options['dry_run']
+
+        if options['migrar']:
+            migradas = MediaBlobService.migrate_legacy(dry_run=dry_run)
+            self.stdout.write(f"{migradas} imágenes migradas al storage por contenido.")
+        if options['reconstruir'] and not dry_run:
+            referenciados = MediaBlobService.rebuild()
+            self.stdout.write(f"Referencias recalculadas: {referenciados} blobs en uso.")
+
+        eliminados, liberados = MediaBlobService.collect(
+            gracia=timedelta(hours=options['gracia_horas']), dry_run=dry_run
+        )
+        accion = "se eliminarían" if dry_run else "eliminados"
+        self.stdout.write(f"{eliminados} archivos {accion} ({liberados / 1024 / 1024:.1f} MB).")
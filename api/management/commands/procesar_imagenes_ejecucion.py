@@ -0,0 +1,51 @@
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.management.base import BaseCommand
+
+from ...models.execution import ImagenEjecucion
+from ...services.image_renditions import ImageRenditionService, render_renditions
+
+
+class Command(BaseCommand):
+    help = (
+        "Genera miniatura y versión para pantalla de las imágenes de ejecuciones existentes "
+        "(MEDIA_ROOT/ejecuciones/). El redimensionado corre en un pool de procesos."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=None, help="Procesos (por defecto, uno por núcleo).")
+        parser.add_argument('--lote', type=int, default=50)
+        parser.add_argument('--todas', action='store_true', help="Reprocesa también las ya procesadas.")
+
+    def handle(self, *args, **options):
+        imagenes = ImagenEjecucion.objects.exclude(imagen='').order_by('pk')
+        if not options['todas']:
+            imagenes = imagenes.filter(procesada=False)
+
+        procesadas = errores = 0
+        ultimo_id = 0
+        with ProcessPoolExecutor(max_workers=options['workers']) as pool:
+            while True:
+                lote = list(imagenes.filter(pk__gt=ultimo_id)[:options['lote']])
+                if not lote:
+                    break
+                ultimo_id = lote[-1].pk
+
+                originales = []
+                for imagen in lote:
+                    try:
+                        originales.append((imagen, ImageRenditionService.read_original(imagen)))
+                    except OSError as e:
+                        errores += 1
+                        self.stderr.write(f"Imagen {imagen.pk}: no se pudo leer {imagen.imagen.name} ({e})")
+
+                futuros = [(imagen, pool.submit(render_renditions, datos)) for imagen, datos in originales]
+                for imagen, futuro in futuros:
+                    try:
+                        ImageRenditionService.store(imagen, futuro.result())
+                        procesadas += 1
+                    except Exception as e:
+                        errores += 1
+                        self.stderr.write(f"Imagen {imagen.pk}: {e}")
+
+        self.stdout.write(f"{procesadas} imágenes procesadas, {errores} con errores.")
@@ -0,0 +1,30 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from ...services.webhook_inbox import WebhookInboxService, DRAIN_LOTE
+
+
+class Command(BaseCommand):
+    help = (
+        "Aplica los eventos pendientes de la bandeja de webhooks (activación de entrenadores) "
+        "de a lotes. Con --continuo queda esperando eventos nuevos."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--lote', type=int, default=DRAIN_LOTE)
+        parser.add_argument('--continuo', action='store_true')
+        parser.add_argument(
+            '--intervalo', type=float, default=1.0,
+            help="Segundos de espera con la bandeja vacía (solo con --continuo)."
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            procesados, activados = WebhookInboxService.drain_pending(options['lote'])
+            if procesados or not options['continuo']:
+                self.stdout.write(f"{procesados} eventos procesados, {activados} entrenadores activados.")
+            if not options['continuo']:
+                return
+            if not procesados:
+                time.sleep(options['intervalo'])
@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand
+
+from ...models.execution import EjecucionEntrenamiento
+from ...services.training_load import TrainingLoadService
+
+
+class Command(BaseCommand):
+    help = (
+        "Recalcula CargaDiaria (TRIMP / ATL / CTL / TSB) desde la primera ejecución "
+        "de cada alumno (carga inicial, reparación o tras cambiar su FC de reposo / máxima)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--alumno',
+            type=int,
+            action='append',
+            dest='alumnos',
+            help="ID de alumno a reconstruir (se puede repetir). Por defecto, todos."
+        )
+
+    def handle(self, *args, **options):
+        alumno_ids = options['alumnos']
+        if alumno_ids is None:
+            alumno_ids = (
+                EjecucionEntrenamiento.objects
+                .filter(alumno__isnull=False)
+                .values_list('alumno_id', flat=True)
+                .distinct()
+                .order_by('alumno_id')
+            )
+
+        alumnos = dias = 0
+        for alumno_id in alumno_ids:
+            dias += TrainingLoadService.recompute(alumno_id)
+            alumnos += 1
+        self.stdout.write(f"{dias} días de carga generados para {alumnos} alumnos.")
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from ...services.personal_records import PersonalRecordService
+
+
+class Command(BaseCommand):
+    help = "Reconstruye RecordPersonal desde las ejecuciones (carga inicial o reparación)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--alumno',
+            type=int,
+            action='append',
+            dest='alumnos',
+            help="ID de alumno a reconstruir (se puede repetir). Por defecto, todos."
+        )
+
+    def handle(self, *args, **options):
+        filas = PersonalRecordService.rebuild(options['alumnos'])
+        self.stdout.write(f"{filas} records personales generados.")
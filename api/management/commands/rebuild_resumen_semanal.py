@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from ...services.weekly_rollup import WeeklyRollupService
+
+
+class Command(BaseCommand):
+    help = "Reconstruye ResumenSemanal desde las ejecuciones (carga inicial o reparación)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--alumno',
+            type=int,
+            action='append',
+            dest='alumnos',
+            help="ID de alumno a reconstruir (se puede repetir). Por defecto, todos."
+        )
+
+    def handle(self, *args, **options):
+        filas = WeeklyRollupService.rebuild(options['alumnos'])
+        self.stdout.write(f"{filas} resúmenes semanales generados.")
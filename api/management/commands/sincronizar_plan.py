@@ -0,0 +1,29 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from ...models.training_plan import PlanEntrenamiento
+from ...services.plan_sync import PlanSyncService
+
+
+class Command(BaseCommand):
+    help = "Propaga la plantilla de un plan a los días futuros no completados de sus asignaciones."
+
+    def add_arguments(self, parser):
+        parser.add_argument('plan_id', type=int)
+        parser.add_argument('--desde', help="Fecha inicial (YYYY-MM-DD). Por defecto, hoy.")
+
+    def handle(self, *args, **options):
+        if not PlanEntrenamiento.objects.filter(pk=options['plan_id']).exists():
+            raise CommandError(f"No existe el plan {options['plan_id']}.")
+
+        desde = None
+        if options['desde']:
+            desde = date.fromisoformat(options['desde'])
+
+        resultado = PlanSyncService.sync_plan(options['plan_id'], desde)
+        self.stdout.write(
+            f"Actualizados: {resultado['actualizados']}, "
+            f"creados: {resultado['creados']}, "
+            f"eliminados: {resultado['eliminados']}"
+        )
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0002_entrenador_is_active'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='asignacionplan',
+            name='modo_calendario',
+            field=models.CharField(choices=[('materializado', 'Materializado'), ('virtual', 'Virtual')], default='materializado', help_text='Virtual = los días se derivan de la plantilla y solo se guardan al registrar una ejecución', max_length=20, verbose_name='Modo de Calendario'),
+        ),
+    ]
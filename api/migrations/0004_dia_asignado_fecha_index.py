@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0003_asignacionplan_modo_calendario'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='diaasignado',
+            index=models.Index(fields=['fecha_especifica', 'asignacion_plan'], include=('dia_plantilla', 'completado'), name='dia_asig_fecha_asig_idx'),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:26
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0004_dia_asignado_fecha_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ejecucionentrenamiento',
+            name='alumno',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='ejecuciones', to='api.alumno', verbose_name='Alumno'),
+        ),
+        migrations.AddField(
+            model_name='ejecucionentrenamiento',
+            name='ritmo_seg_km',
+            field=models.PositiveIntegerField(blank=True, editable=False, help_text='Ritmo normalizado en segundos por kilómetro', null=True, verbose_name='Ritmo (seg/km)'),
+        ),
+        migrations.AddField(
+            model_name='ejecucionentrenamiento',
+            name='tipo_actividad',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='ejecuciones', to='api.tipoactividad', verbose_name='Tipo de Actividad'),
+        ),
+        migrations.AddIndex(
+            model_name='ejecucionentrenamiento',
+            index=models.Index(fields=['tipo_actividad', 'ritmo_seg_km'], name='ejecucion_e_tipo_ac_5d0be7_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ejecucionentrenamiento',
+            index=models.Index(fields=['alumno', 'fecha_hora_ejecucion'], name='ejecucion_e_alumno__0f2e5f_idx'),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:27
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0005_ejecucion_ritmo_seg_km'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResumenSemanal',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('semana', models.DateField(help_text='Lunes de la semana ISO', verbose_name='Semana')),
+                ('distancia_km', models.DecimalField(decimal_places=2, default=0, max_digits=10, verbose_name='Distancia (km)')),
+                ('duracion_minutos', models.PositiveIntegerField(default=0, verbose_name='Duración (minutos)')),
+                ('sesiones', models.PositiveIntegerField(default=0, verbose_name='Sesiones')),
+                ('pulsaciones_suma', models.PositiveBigIntegerField(default=0, verbose_name='Suma de Pulsaciones Promedio')),
+                ('pulsaciones_sesiones', models.PositiveIntegerField(default=0, verbose_name='Sesiones con Pulsaciones')),
+                ('alumno', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='resumenes_semanales', to='api.alumno', verbose_name='Alumno')),
+                ('tipo_actividad', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='resumenes_semanales', to='api.tipoactividad', verbose_name='Tipo de Actividad')),
+            ],
+            options={
+                'verbose_name': 'Resumen Semanal',
+                'verbose_name_plural': 'Resúmenes Semanales',
+                'db_table': 'resumen_semanal',
+                'ordering': ['alumno', 'semana'],
+                'constraints': [models.UniqueConstraint(fields=('alumno', 'semana', 'tipo_actividad'), name='resumen_semanal_unico', nulls_distinct=False)],
+            },
+        ),
+    ]
@@ -0,0 +1,62 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0006_resumen_semanal'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='imagenejecucion',
+            name='alto',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True, verbose_name='Alto Original (px)'),
+        ),
+        migrations.AddField(
+            model_name='imagenejecucion',
+            name='ancho',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True, verbose_name='Ancho Original (px)'),
+        ),
+        migrations.AddField(
+            model_name='imagenejecucion',
+            name='display',
+            field=models.ImageField(blank=True, editable=False, height_field='display_alto', null=True, upload_to='ejecuciones/display/%Y/%m/%d/', verbose_name='Versión para Pantalla', width_field='display_ancho'),
+        ),
+        migrations.AddField(
+            model_name='imagenejecucion',
+            name='display_alto',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='imagenejecucion',
+            name='display_ancho',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='imagenejecucion',
+            name='miniatura',
+            field=models.ImageField(blank=True, editable=False, height_field='miniatura_alto', null=True, upload_to='ejecuciones/miniaturas/%Y/%m/%d/', verbose_name='Miniatura', width_field='miniatura_ancho'),
+        ),
+        migrations.AddField(
+            model_name='imagenejecucion',
+            name='miniatura_alto',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='imagenejecucion',
+            name='miniatura_ancho',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='imagenejecucion',
+            name='procesada',
+            field=models.BooleanField(default=False, editable=False, help_text='Indica si ya se generaron la miniatura y la versión para pantalla', verbose_name='Procesada'),
+        ),
+        migrations.AddIndex(
+            model_name='imagenejecucion',
+            index=models.Index(fields=['procesada'], name='imagen_ejec_procesa_e056d4_idx'),
+        ),
+    ]
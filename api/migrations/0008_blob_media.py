@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:33
+
+import api.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0007_imagen_ejecucion_renditions'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='imagenejecucion',
+            name='imagen',
+            field=models.ImageField(help_text='Se guarda una sola vez por contenido (ver ContentAddressedStorage)', max_length=255, storage=api.storage.execution_image_storage, upload_to='ejecuciones/', verbose_name='Imagen'),
+        ),
+        migrations.CreateModel(
+            name='BlobMedia',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('nombre', models.CharField(help_text='Ruta relativa a MEDIA_ROOT (incluye el hash SHA-256 del contenido)', max_length=255, unique=True, verbose_name='Nombre')),
+                ('tamano', models.PositiveBigIntegerField(blank=True, null=True, verbose_name='Tamaño (bytes)')),
+                ('referencias', models.PositiveIntegerField(default=0, verbose_name='Referencias')),
+            ],
+            options={
+                'verbose_name': 'Blob de Media',
+                'verbose_name_plural': 'Blobs de Media',
+                'db_table': 'blob_media',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['referencias', 'updated_at'], name='blob_media_referen_c78e3f_idx')],
+            },
+        ),
+    ]
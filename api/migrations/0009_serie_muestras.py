@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:37
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0008_blob_media'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SerieMuestras',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('inicio', models.DateTimeField(verbose_name='Inicio')),
+                ('puntos', models.PositiveIntegerField(verbose_name='Cantidad de Muestras')),
+                ('duracion_seg', models.PositiveIntegerField(verbose_name='Duración (seg)')),
+                ('tiempo', models.BinaryField()),
+                ('pulsaciones', models.BinaryField()),
+                ('velocidad', models.BinaryField()),
+                ('altitud', models.BinaryField()),
+                ('vista', models.BinaryField(help_text='Vista reducida (LTTB) de cada canal para gráficos')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('ejecucion', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='serie_muestras', to='api.ejecucionentrenamiento', verbose_name='Ejecución')),
+            ],
+            options={
+                'verbose_name': 'Serie de Muestras',
+                'verbose_name_plural': 'Series de Muestras',
+                'db_table': 'serie_muestras',
+            },
+        ),
+    ]
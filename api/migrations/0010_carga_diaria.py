@@ -0,0 +1,44 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:39
+
+import django.core.validators
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0009_serie_muestras'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='alumno',
+            name='fc_maxima',
+            field=models.PositiveSmallIntegerField(blank=True, help_text='Para el cálculo de carga (TRIMP). Por defecto 220 - edad', null=True, validators=[django.core.validators.MinValueValidator(120), django.core.validators.MaxValueValidator(250)], verbose_name='FC Máxima'),
+        ),
+        migrations.AddField(
+            model_name='alumno',
+            name='fc_reposo',
+            field=models.PositiveSmallIntegerField(blank=True, help_text='Para el cálculo de carga (TRIMP). Por defecto 60', null=True, validators=[django.core.validators.MinValueValidator(30), django.core.validators.MaxValueValidator(120)], verbose_name='FC en Reposo'),
+        ),
+        migrations.CreateModel(
+            name='CargaDiaria',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('fecha', models.DateField(verbose_name='Fecha')),
+                ('trimp', models.FloatField(default=0, verbose_name='TRIMP')),
+                ('atl', models.FloatField(default=0, verbose_name='Carga Aguda (ATL)')),
+                ('ctl', models.FloatField(default=0, verbose_name='Carga Crónica (CTL)')),
+                ('tsb', models.FloatField(default=0, verbose_name='Balance (TSB)')),
+                ('alumno', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='cargas_diarias', to='api.alumno', verbose_name='Alumno')),
+            ],
+            options={
+                'verbose_name': 'Carga Diaria',
+                'verbose_name_plural': 'Cargas Diarias',
+                'db_table': 'carga_diaria',
+                'ordering': ['alumno', 'fecha'],
+                'constraints': [models.UniqueConstraint(fields=('alumno', 'fecha'), name='carga_diaria_unica')],
+            },
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0010_carga_diaria'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RecordPersonal',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('categoria', models.CharField(choices=[('1k', '1 km'), ('5k', '5 km'), ('10k', '10 km'), ('21k', 'Media Maratón'), ('42k', 'Maratón'), ('distancia', 'Distancia Más Larga')], max_length=10, verbose_name='Categoría')),
+                ('ritmo_seg_km', models.PositiveIntegerField(blank=True, null=True, verbose_name='Ritmo (seg/km)')),
+                ('tiempo_seg', models.PositiveIntegerField(blank=True, help_text='Tiempo estimado para la distancia de la categoría al ritmo del record', null=True, verbose_name='Tiempo (seg)')),
+                ('distancia_km', models.DecimalField(decimal_places=2, max_digits=6, verbose_name='Distancia (km)')),
+                ('fecha', models.DateTimeField(verbose_name='Fecha del Record')),
+                ('alumno', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='records_personales', to='api.alumno', verbose_name='Alumno')),
+                ('ejecucion', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='records_personales', to='api.ejecucionentrenamiento', verbose_name='Ejecución')),
+                ('tipo_actividad', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='records_personales', to='api.tipoactividad', verbose_name='Tipo de Actividad')),
+            ],
+            options={
+                'verbose_name': 'Record Personal',
+                'verbose_name_plural': 'Records Personales',
+                'db_table': 'record_personal',
+                'ordering': ['alumno', 'tipo_actividad', 'categoria'],
+                'constraints': [models.UniqueConstraint(fields=('alumno', 'tipo_actividad', 'categoria'), name='record_personal_unico', nulls_distinct=False)],
+            },
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0011_record_personal'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EventoWebhook',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('clave', models.CharField(help_text='Idempotency-Key del proveedor (o derivada del evento)', max_length=255, unique=True, verbose_name='Clave de idempotencia')),
+                ('tipo', models.CharField(choices=[('coach_activation', 'Activación de Entrenador')], default='coach_activation', max_length=30, verbose_name='Tipo')),
+                ('user_id', models.PositiveIntegerField(verbose_name='ID de usuario')),
+                ('payload', models.JSONField(blank=True, default=dict, verbose_name='Payload')),
+                ('procesado_at', models.DateTimeField(blank=True, null=True, verbose_name='Procesado')),
+                ('resultado', models.CharField(blank=True, choices=[('activado', 'Activado'), ('no_encontrado', 'Entrenador no encontrado')], max_length=20, verbose_name='Resultado')),
+            ],
+            options={
+                'verbose_name': 'Evento de Webhook',
+                'verbose_name_plural': 'Eventos de Webhook',
+                'db_table': 'evento_webhook',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(condition=models.Q(('procesado_at__isnull', True)), fields=['id'], name='evento_webhook_pendiente_idx')],
+            },
+        ),
+    ]
@@ -4,7 +4,10 @@ from .activity_types import TipoActividad, TipoRutina
 from .routine import Rutina
 from .training_plan import PlanEntrenamiento, Semana, DiaPlantilla
 from .plan_assignment import AsignacionPlan, DiaAsignado
-from .execution import EjecucionEntrenamiento, ImagenEjecucion
+from .execution import EjecucionEntrenamiento, ImagenEjecucion, SerieMuestras
+from .analytics import ResumenSemanal, CargaDiaria, RecordPersonal
+from .media import BlobMedia
+from .webhooks import EventoWebhook
 
 __all__ = [
     # Base
@@ -34,4 +37,16 @@ __all__ = [
     # Ejecuciones
     'EjecucionEntrenamiento',
     'ImagenEjecucion',
+    'SerieMuestras',
+
+    # Analítica
+    'ResumenSemanal',
+    'CargaDiaria',
+    'RecordPersonal',
+
+    # Media
+    'BlobMedia',
+
+    # Webhooks
+    'EventoWebhook',
 ]
\ No newline at end of file
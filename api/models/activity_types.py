@@ -35,13 +35,13 @@ class TipoActividad(models.Model):
         ]
 
     def __str__(self):
-        if self.entrenador:
+        if self.entrenador_id is not None:
             return f"{self.nombre} (personalizado por {self.entrenador.nombre_completo})"
         return f"{self.nombre} (global)"
 
     @property
     def es_global(self):
-        return self.entrenador is None
+        return self.entrenador_id is None
 
 
 class TipoRutina(models.Model):
@@ -77,10 +77,10 @@ class TipoRutina(models.Model):
         ]
 
     def __str__(self):
-        if self.entrenador:
+        if self.entrenador_id is not None:
             return f"{self.nombre} (personalizado por {self.entrenador.nombre_completo})"
         return f"{self.nombre} (global)"
 
     @property
     def es_global(self):
-        return self.entrenador is None
\ No newline at end of file
+        return self.entrenador_id is None
\ No newline at end of file
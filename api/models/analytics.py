@@ -0,0 +1,199 @@
+from django.db import models
+from .user_profiles import Alumno
+from .activity_types import TipoActividad
+from .execution import EjecucionEntrenamiento
+
+class ResumenSemanal(models.Model):
+    """
+    Totales semanales de entrenamiento por alumno y tipo de actividad.
+    Se mantiene incrementalmente al crear, editar o borrar ejecuciones
+    (ver WeeklyRollupService) y se reconstruye con rebuild_resumen_semanal
+    """
+    alumno = models.ForeignKey(
+        Alumno,
+        on_delete=models.CASCADE,
+        related_name='resumenes_semanales',
+        verbose_name='Alumno'
+    )
+    semana = models.DateField(
+        verbose_name='Semana',
+        help_text='Lunes de la semana ISO'
+    )
+    tipo_actividad = models.ForeignKey(
+        TipoActividad,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='resumenes_semanales',
+        verbose_name='Tipo de Actividad'
+    )
+    distancia_km = models.DecimalField(
+        max_digits=10,
+        decimal_places=2,
+        default=0,
+        verbose_name='Distancia (km)'
+    )
+    duracion_minutos = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Duración (minutos)'
+    )
+    sesiones = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Sesiones'
+    )
+    pulsaciones_suma = models.PositiveBigIntegerField(
+        default=0,
+        verbose_name='Suma de Pulsaciones Promedio'
+    )
+    pulsaciones_sesiones = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Sesiones con Pulsaciones'
+    )
+
+    class Meta:
+        db_table = 'resumen_semanal'
+        verbose_name = 'Resumen Semanal'
+        verbose_name_plural = 'Resúmenes Semanales'
+        ordering = ['alumno', 'semana']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['alumno', 'semana', 'tipo_actividad'],
+                nulls_distinct=False,
+                name='resumen_semanal_unico'
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.alumno.nombre_completo} - Semana del {self.semana}"
+
+    @property
+    def pulsaciones_promedio(self):
+        if self.pulsaciones_sesiones:
+            return round(self.pulsaciones_suma / self.pulsaciones_sesiones)
+        return None
+
+
+class CargaDiaria(models.Model):
+    """
+    Carga de entrenamiento diaria por alumno: TRIMP del día y las medias
+    exponenciales aguda (ATL, 7 días) y crónica (CTL, 42 días), con el
+    balance TSB = CTL - ATL del día anterior. Al registrar una ejecución se
+    recalcula solo desde su fecha en adelante (ver TrainingLoadService)
+    """
+    alumno = models.ForeignKey(
+        Alumno,
+        on_delete=models.CASCADE,
+        related_name='cargas_diarias',
+        verbose_name='Alumno'
+    )
+    fecha = models.DateField(
+        verbose_name='Fecha'
+    )
+    trimp = models.FloatField(
+        default=0,
+        verbose_name='TRIMP'
+    )
+    atl = models.FloatField(
+        default=0,
+        verbose_name='Carga Aguda (ATL)'
+    )
+    ctl = models.FloatField(
+        default=0,
+        verbose_name='Carga Crónica (CTL)'
+    )
+    tsb = models.FloatField(
+        default=0,
+        verbose_name='Balance (TSB)'
+    )
+
+    class Meta:
+        db_table = 'carga_diaria'
+        verbose_name = 'Carga Diaria'
+        verbose_name_plural = 'Cargas Diarias'
+        ordering = ['alumno', 'fecha']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['alumno', 'fecha'],
+                name='carga_diaria_unica'
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.alumno.nombre_completo} - {self.fecha}"
+
+
+class RecordPersonal(models.Model):
+    """
+    Mejor marca del alumno por tipo de actividad y categoría de distancia.
+    Se mantiene al registrar, editar o borrar ejecuciones (ver
+    PersonalRecordService) y se reconstruye con rebuild_records_personales
+    """
+    CATEGORIA_CHOICES = [
+        ('1k', '1 km'),
+        ('5k', '5 km'),
+        ('10k', '10 km'),
+        ('21k', 'Media Maratón'),
+        ('42k', 'Maratón'),
+        ('distancia', 'Distancia Más Larga'),
+    ]
+
+    alumno = models.ForeignKey(
+        Alumno,
+        on_delete=models.CASCADE,
+        related_name='records_personales',
+        verbose_name='Alumno'
+    )
+    tipo_actividad = models.ForeignKey(
+        TipoActividad,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='records_personales',
+        verbose_name='Tipo de Actividad'
+    )
+    categoria = models.CharField(
+        max_length=10,
+        choices=CATEGORIA_CHOICES,
+        verbose_name='Categoría'
+    )
+    ejecucion = models.ForeignKey(
+        EjecucionEntrenamiento,
+        on_delete=models.CASCADE,
+        related_name='records_personales',
+        verbose_name='Ejecución'
+    )
+    ritmo_seg_km = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        verbose_name='Ritmo (seg/km)'
+    )
+    tiempo_seg = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        verbose_name='Tiempo (seg)',
+        help_text='Tiempo estimado para la distancia de la categoría al ritmo del record'
+    )
+    distancia_km = models.DecimalField(
+        max_digits=6,
+        decimal_places=2,
+        verbose_name='Distancia (km)'
+    )
+    fecha = models.DateTimeField(
+        verbose_name='Fecha del Record'
+    )
+
+    class Meta:
+        db_table = 'record_personal'
+        verbose_name = 'Record Personal'
+        verbose_name_plural = 'Records Personales'
+        ordering = ['alumno', 'tipo_actividad', 'categoria']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['alumno', 'tipo_actividad', 'categoria'],
+                nulls_distinct=False,
+                name='record_personal_unico'
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.alumno.nombre_completo} - {self.get_categoria_display()}"
@@ -1,7 +1,16 @@
+import re
+
 from django.db import models
 from django.core.validators import MinValueValidator, MaxValueValidator
+from django.utils import timezone
 from .base import TimeStampedModel
+from .user_profiles import Alumno
+from .activity_types import TipoActividad
 from .plan_assignment import DiaAsignado
+from ..storage import execution_image_storage
+
+# "5:30/km", "5:30", "5'30''"
+RITMO_REGEX = re.compile(r"^\s*(\d{1,2})\s*[:'’]\s*(\d{1,2})")
 
 class EjecucionEntrenamiento(TimeStampedModel):
     """
@@ -62,6 +71,33 @@ class EjecucionEntrenamiento(TimeStampedModel):
         validators=[MinValueValidator(1), MaxValueValidator(5)]
     )
 
+    # Campos derivados, se completan al guardar (ver backfill_metricas_ejecucion)
+    ritmo_seg_km = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        editable=False,
+        verbose_name='Ritmo (seg/km)',
+        help_text='Ritmo normalizado en segundos por kilómetro'
+    )
+    alumno = models.ForeignKey(
+        Alumno,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        editable=False,
+        related_name='ejecuciones',
+        verbose_name='Alumno'
+    )
+    tipo_actividad = models.ForeignKey(
+        TipoActividad,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        editable=False,
+        related_name='ejecuciones',
+        verbose_name='Tipo de Actividad'
+    )
+
     class Meta:
         db_table = 'ejecucion_entrenamiento'
         verbose_name = 'Ejecución de Entrenamiento'
@@ -69,17 +105,99 @@ class EjecucionEntrenamiento(TimeStampedModel):
         ordering = ['-fecha_hora_ejecucion']
         indexes = [
             models.Index(fields=['dia_asignado', 'fecha_hora_ejecucion']),
+            models.Index(fields=['tipo_actividad', 'ritmo_seg_km']),
+            models.Index(fields=['alumno', 'fecha_hora_ejecucion']),
         ]
 
+    # Valores que se recuerdan al leer de la base para calcular diferencias al guardar
+    CAMPOS_SEGUIDOS = (
+        'dia_asignado_id', 'alumno_id', 'tipo_actividad_id', 'fecha_hora_ejecucion',
+        'distancia_km', 'duracion_minutos', 'pulsaciones_promedio',
+    )
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._recordar_valores()
+        return instance
+
+    def _recordar_valores(self):
+        self._valores_originales = {
+            campo: self.__dict__.get(campo) for campo in self.CAMPOS_SEGUIDOS
+        }
+
+    @property
+    def valores_originales(self):
+        """Valores leídos de la base (None si la instancia es nueva)"""
+        return getattr(self, '_valores_originales', None)
+
     def __str__(self):
         return f"Ejecución - {self.dia_asignado.asignacion_plan.alumno.nombre_completo} - {self.fecha_hora_ejecucion}"
 
     def save(self, *args, **kwargs):
-        """Al guardar, marca el día como completado"""
+        """Al guardar, completa los campos derivados y marca el día como completado"""
+        derivados = ['ritmo_seg_km']
+        self.ritmo_seg_km = self.calcular_ritmo_seg_km()
+
+        originales = self.valores_originales or {}
+        if self.alumno_id is None or self.dia_asignado_id != originales.get('dia_asignado_id'):
+            contexto = EjecucionEntrenamiento.resolver_contexto([self.dia_asignado_id])
+            self.alumno_id, self.tipo_actividad_id = contexto.get(self.dia_asignado_id, (None, None))
+            derivados += ['alumno', 'tipo_actividad']
+
+        if kwargs.get('update_fields') is not None:
+            kwargs['update_fields'] = set(kwargs['update_fields']) | set(derivados)
+
         super().save(*args, **kwargs)
-        if not self.dia_asignado.completado:
-            self.dia_asignado.completado = True
-            self.dia_asignado.save()
+        self._recordar_valores()
+        if EjecucionEntrenamiento.dia_asignado.is_cached(self):
+            dia = self.dia_asignado
+            if not dia.completado:
+                dia.completado = True
+                dia.save(update_fields=['completado', 'updated_at'])
+        else:
+            # Sin cargar el día: el UPDATE no escribe nada si ya estaba completado
+            DiaAsignado.objects.filter(
+                pk=self.dia_asignado_id,
+                completado=False
+            ).update(completado=True, updated_at=timezone.now())
+
+    @staticmethod
+    def parse_ritmo(texto):
+        """Convierte un ritmo como '5:30/km' a segundos por km (None si no se reconoce)"""
+        coincidencia = RITMO_REGEX.match(texto or '')
+        if not coincidencia:
+            return None
+        minutos, segundos = int(coincidencia.group(1)), int(coincidencia.group(2))
+        if segundos >= 60:
+            return None
+        return minutos * 60 + segundos
+
+    def calcular_ritmo_seg_km(self):
+        """Ritmo en seg/km: el informado en 'ritmo' o, si no hay, duración / distancia"""
+        ritmo = EjecucionEntrenamiento.parse_ritmo(self.ritmo)
+        if ritmo is not None:
+            return ritmo
+        if self.distancia_km and self.duracion_minutos and self.distancia_km > 0:
+            return round(self.duracion_minutos * 60 / float(self.distancia_km))
+        return None
+
+    @staticmethod
+    def resolver_contexto(dia_asignado_ids):
+        """
+        {dia_asignado_id: (alumno_id, tipo_actividad_id)} en una sola consulta.
+        El tipo es el de la rutina del día o, en días sin rutina, el del plan.
+        """
+        filas = DiaAsignado.objects.filter(pk__in=dia_asignado_ids).values_list(
+            'id',
+            'asignacion_plan__alumno_id',
+            'dia_plantilla__rutina__tipo_actividad_id',
+            'asignacion_plan__plan__tipo_actividad_id'
+        )
+        return {
+            dia_id: (alumno_id, tipo_rutina_id or tipo_plan_id)
+            for dia_id, alumno_id, tipo_rutina_id, tipo_plan_id in filas
+        }
 
     @property
     def ritmo_promedio_calculo(self):
@@ -103,8 +221,11 @@ class ImagenEjecucion(models.Model):
         verbose_name='Ejecución'
     )
     imagen = models.ImageField(
-        upload_to='ejecuciones/%Y/%m/%d/',
-        verbose_name='Imagen'
+        upload_to='ejecuciones/',
+        storage=execution_image_storage,
+        max_length=255,
+        verbose_name='Imagen',
+        help_text='Se guarda una sola vez por contenido (ver ContentAddressedStorage)'
     )
     descripcion = models.TextField(
         blank=True,
@@ -115,11 +236,130 @@ class ImagenEjecucion(models.Model):
         verbose_name='Fecha de Carga'
     )
 
+    # Versiones reducidas, generadas fuera del request (ver ImageRenditionService)
+    ancho = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        editable=False,
+        verbose_name='Ancho Original (px)'
+    )
+    alto = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        editable=False,
+        verbose_name='Alto Original (px)'
+    )
+    miniatura = models.ImageField(
+        upload_to='ejecuciones/miniaturas/%Y/%m/%d/',
+        null=True,
+        blank=True,
+        editable=False,
+        width_field='miniatura_ancho',
+        height_field='miniatura_alto',
+        verbose_name='Miniatura'
+    )
+    miniatura_ancho = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        editable=False
+    )
+    miniatura_alto = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        editable=False
+    )
+    display = models.ImageField(
+        upload_to='ejecuciones/display/%Y/%m/%d/',
+        null=True,
+        blank=True,
+        editable=False,
+        width_field='display_ancho',
+        height_field='display_alto',
+        verbose_name='Versión para Pantalla'
+    )
+    display_ancho = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        editable=False
+    )
+    display_alto = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        editable=False
+    )
+    procesada = models.BooleanField(
+        default=False,
+        editable=False,
+        verbose_name='Procesada',
+        help_text='Indica si ya se generaron la miniatura y la versión para pantalla'
+    )
+
     class Meta:
         db_table = 'imagen_ejecucion'
         verbose_name = 'Imagen de Ejecución'
         verbose_name_plural = 'Imágenes de Ejecución'
         ordering = ['uploaded_at']
+        indexes = [
+            models.Index(fields=['procesada']),
+        ]
+
+    def __str__(self):
+        return f"Imagen - {self.ejecucion}"
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._imagen_original = instance.__dict__.get('imagen')
+        return instance
+
+    def save(self, *args, **kwargs):
+        """Si cambia el archivo, las versiones reducidas deben regenerarse"""
+        if self.procesada and self.imagen.name != getattr(self, '_imagen_original', None):
+            self.procesada = False
+            if kwargs.get('update_fields') is not None:
+                kwargs['update_fields'] = set(kwargs['update_fields']) | {'procesada'}
+        super().save(*args, **kwargs)
+        self._imagen_original = self.imagen.name
+
+
+class SerieMuestras(models.Model):
+    """
+    Muestras completas (pulsaciones, velocidad, altitud) de una ejecución
+    importada de un track, guardadas como arrays empaquetados en lugar de
+    una fila por muestra. Incluye una vista reducida precalculada para los
+    gráficos (ver ExecutionSamplesService)
+    """
+    ejecucion = models.OneToOneField(
+        EjecucionEntrenamiento,
+        on_delete=models.CASCADE,
+        related_name='serie_muestras',
+        verbose_name='Ejecución'
+    )
+    inicio = models.DateTimeField(
+        verbose_name='Inicio'
+    )
+    puntos = models.PositiveIntegerField(
+        verbose_name='Cantidad de Muestras'
+    )
+    duracion_seg = models.PositiveIntegerField(
+        verbose_name='Duración (seg)'
+    )
+    # Arrays little-endian: segundos desde el inicio (uint32), pulsaciones
+    # (int16, -1 sin dato), velocidad en m/s y altitud en m (float32, NaN sin dato)
+    tiempo = models.BinaryField(editable=False)
+    pulsaciones = models.BinaryField(editable=False)
+    velocidad = models.BinaryField(editable=False)
+    altitud = models.BinaryField(editable=False)
+    vista = models.BinaryField(
+        editable=False,
+        help_text='Vista reducida (LTTB) de cada canal para gráficos'
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'serie_muestras'
+        verbose_name = 'Serie de Muestras'
+        verbose_name_plural = 'Series de Muestras'
 
     def __str__(self):
-        return f"Imagen - {self.ejecucion}"
\ No newline at end of file
+        return f"Muestras - {self.ejecucion_id} ({self.puntos})"
@@ -0,0 +1,36 @@
+from django.db import models
+from .base import TimeStampedModel
+
+class BlobMedia(TimeStampedModel):
+    """
+    Archivo guardado una sola vez en el storage direccionado por contenido
+    (ver ContentAddressedStorage) con la cantidad de registros que lo usan.
+    Los blobs sin referencias los elimina gc_blobs_media
+    """
+    nombre = models.CharField(
+        max_length=255,
+        unique=True,
+        verbose_name='Nombre',
+        help_text='Ruta relativa a MEDIA_ROOT (incluye el hash SHA-256 del contenido)'
+    )
+    tamano = models.PositiveBigIntegerField(
+        null=True,
+        blank=True,
+        verbose_name='Tamaño (bytes)'
+    )
+    referencias = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Referencias'
+    )
+
+    class Meta:
+        db_table = 'blob_media'
+        verbose_name = 'Blob de Media'
+        verbose_name_plural = 'Blobs de Media'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['referencias', 'updated_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.nombre} ({self.referencias})"
@@ -13,6 +13,10 @@ class AsignacionPlan(TimeStampedModel):
         ('completado', 'Completado'),
         ('cancelado', 'Cancelado'),
     ]
+    MODO_CALENDARIO_CHOICES = [
+        ('materializado', 'Materializado'),
+        ('virtual', 'Virtual'),
+    ]
 
     plan = models.ForeignKey(
         PlanEntrenamiento,
@@ -40,6 +44,13 @@ class AsignacionPlan(TimeStampedModel):
         default='activo',
         verbose_name='Estado'
     )
+    modo_calendario = models.CharField(
+        max_length=20,
+        choices=MODO_CALENDARIO_CHOICES,
+        default='materializado',
+        verbose_name='Modo de Calendario',
+        help_text='Virtual = los días se derivan de la plantilla y solo se guardan al registrar una ejecución'
+    )
 
     class Meta:
         db_table = 'asignacion_plan'
@@ -70,11 +81,17 @@ class AsignacionPlan(TimeStampedModel):
     def esta_activo(self):
         return self.estado == 'activo'
 
+    @property
+    def es_virtual(self):
+        return self.modo_calendario == 'virtual'
+
 
 class DiaAsignado(TimeStampedModel):
     """
     Días específicos asignados con fechas concretas
-    Se generan automáticamente cuando se asigna un plan a un alumno
+    Se generan automáticamente cuando se asigna un plan a un alumno.
+    En modo de calendario virtual solo existe la fila cuando el día
+    tiene una ejecución registrada (ver CalendarService)
     """
     asignacion_plan = models.ForeignKey(
         AsignacionPlan,
@@ -108,6 +125,12 @@ class DiaAsignado(TimeStampedModel):
         unique_together = [['asignacion_plan', 'fecha_especifica']]
         indexes = [
             models.Index(fields=['asignacion_plan', 'fecha_especifica']),
+            # Tablero diario del entrenador: todos los días de una fecha
+            models.Index(
+                fields=['fecha_especifica', 'asignacion_plan'],
+                include=['dia_plantilla', 'completado'],
+                name='dia_asig_fecha_asig_idx'
+            ),
             models.Index(fields=['completado']),
         ]
 
@@ -90,6 +90,20 @@ class Alumno(TimeStampedModel):
         verbose_name='Altura (m)',
         help_text='Altura en metros'
     )
+    fc_reposo = models.PositiveSmallIntegerField(
+        null=True,
+        blank=True,
+        validators=[MinValueValidator(30), MaxValueValidator(120)],
+        verbose_name='FC en Reposo',
+        help_text='Para el cálculo de carga (TRIMP). Por defecto 60'
+    )
+    fc_maxima = models.PositiveSmallIntegerField(
+        null=True,
+        blank=True,
+        validators=[MinValueValidator(120), MaxValueValidator(250)],
+        verbose_name='FC Máxima',
+        help_text='Para el cálculo de carga (TRIMP). Por defecto 220 - edad'
+    )
     notas = models.TextField(
         blank=True,
         verbose_name='Notas'
@@ -0,0 +1,60 @@
+from django.db import models
+from .base import TimeStampedModel
+
+class EventoWebhook(TimeStampedModel):
+    """
+    Bandeja de entrada de webhooks del proveedor de pagos. La vista solo
+    registra el evento (clave de idempotencia única) y responde; la
+    activación la aplica en lotes procesar_webhooks
+    """
+    TIPO_CHOICES = [
+        ('coach_activation', 'Activación de Entrenador'),
+    ]
+
+    RESULTADO_CHOICES = [
+        ('activado', 'Activado'),
+        ('no_encontrado', 'Entrenador no encontrado'),
+    ]
+
+    clave = models.CharField(
+        max_length=255,
+        unique=True,
+        verbose_name='Clave de idempotencia',
+        help_text='Idempotency-Key del proveedor (o derivada del evento)'
+    )
+    tipo = models.CharField(
+        max_length=30,
+        choices=TIPO_CHOICES,
+        default='coach_activation',
+        verbose_name='Tipo'
+    )
+    user_id = models.PositiveIntegerField(verbose_name='ID de usuario')
+    payload = models.JSONField(default=dict, blank=True, verbose_name='Payload')
+    procesado_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name='Procesado'
+    )
+    resultado = models.CharField(
+        max_length=20,
+        choices=RESULTADO_CHOICES,
+        blank=True,
+        verbose_name='Resultado'
+    )
+
+    class Meta:
+        db_table = 'evento_webhook'
+        verbose_name = 'Evento de Webhook'
+        verbose_name_plural = 'Eventos de Webhook'
+        ordering = ['-created_at']
+        indexes = [
+            # Eventos pendientes en orden de llegada (lo que lee el drenador)
+            models.Index(
+                fields=['id'],
+                condition=models.Q(procesado_at__isnull=True),
+                name='evento_webhook_pendiente_idx'
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.tipo} {self.user_id} ({self.clave})"
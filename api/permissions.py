@@ -0,0 +1,28 @@
+from rest_framework.permissions import BasePermission
+
+
+class IsCoach(BasePermission):
+    """
+    Permite el acceso solo a entrenadores con la cuenta activada (pago confirmado).
+    """
+    message = 'Solo los entrenadores activos pueden realizar esta acción.'
+
+    def has_permission(self, request, view):
+        user = request.user
+        if not user or not user.is_authenticated:
+            return False
+        entrenador = getattr(user, 'entrenador', None)
+        return entrenador is not None and entrenador.is_active
+
+
+class IsStudent(BasePermission):
+    """
+    Permite el acceso solo a usuarios con perfil de alumno.
+    """
+    message = 'Solo los alumnos pueden realizar esta acción.'
+
+    def has_permission(self, request, view):
+        user = request.user
+        if not user or not user.is_authenticated:
+            return False
+        return getattr(user, 'alumno', None) is not None
@@ -0,0 +1,38 @@
+from rest_framework import serializers
+
+from ..models.activity_types import TipoActividad
+from ..models.analytics import ResumenSemanal, RecordPersonal
+from .calendar import CatalogTypeField
+
+
+class ResumenSemanalSerializer(serializers.ModelSerializer):
+    tipo_actividad = CatalogTypeField(TipoActividad, 'tipo_actividad', allow_null=True)
+    pulsaciones_promedio = serializers.IntegerField(allow_null=True)
+
+    class Meta:
+        model = ResumenSemanal
+        fields = (
+            'semana', 'tipo_actividad', 'distancia_km', 'duracion_minutos',
+            'sesiones', 'pulsaciones_promedio'
+        )
+
+
+class RecordPersonalSerializer(serializers.ModelSerializer):
+    tipo_actividad = CatalogTypeField(TipoActividad, 'tipo_actividad', allow_null=True)
+    categoria_display = serializers.CharField(source='get_categoria_display')
+
+    class Meta:
+        model = RecordPersonal
+        fields = (
+            'tipo_actividad', 'categoria', 'categoria_display', 'ritmo_seg_km',
+            'tiempo_seg', 'distancia_km', 'fecha', 'ejecucion'
+        )
+
+
+class RecordQuerySerializer(serializers.Serializer):
+    tipo_actividad = serializers.IntegerField(min_value=1, required=False)
+
+
+class DateRangeSerializer(serializers.Serializer):
+    desde = serializers.DateField(required=False)
+    hasta = serializers.DateField(required=False)
@@ -1,7 +1,19 @@
 from django.contrib.auth.models import User
+from django.contrib.auth.validators import UnicodeUsernameValidator
+from django.db.models import QuerySet
 from rest_framework import serializers
 from rest_framework.validators import UniqueValidator
 from ..models.user_profiles import Entrenador, Alumno # Ajusta la ruta si es necesario
+from ..services.principal import PrincipalService, ROLE_ATTR
+
+
+class UserListSerializer(serializers.ListSerializer):
+    """Anota el rol en el queryset para no consultar los perfiles usuario por usuario"""
+
+    def to_representation(self, data):
+        if isinstance(data, QuerySet) and ROLE_ATTR not in data.query.annotations:
+            data = PrincipalService.with_role(data)
+        return super().to_representation(data)
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -15,6 +27,7 @@ class UserSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ('id', 'username', 'email', 'password', 'first_name', 'last_name', 'role')
+        list_serializer_class = UserListSerializer
         extra_kwargs = {
             'password': {'write_only': True, 'min_length': 8, 'required': True},
             'first_name': {'required': False},
@@ -27,12 +40,8 @@ class UserSerializer(serializers.ModelSerializer):
         return user
     
     def get_role(self, obj):
-        # Intentar determinar el rol después de la creación/consulta
-        if hasattr(obj, 'entrenador') and obj.entrenador:
-            return 'coach'
-        if hasattr(obj, 'alumno') and obj.alumno:
-            return 'student'
-        return None
+        # Anotado por UserListSerializer / PrincipalService.with_role, o cacheado en la instancia
+        return PrincipalService.role(obj)
 
 # --- 2. Serializer de Perfil de Entrenador ---
 class EntrenadorProfileSerializer(serializers.ModelSerializer):
@@ -56,4 +65,60 @@ class AlumnoProfileSerializer(serializers.ModelSerializer):
         # Se reemplaza 'entrenador' por 'entrenador_id' para el input
         fields = (
             'entrenador_id', 'fecha_nacimiento', 'telefono', 'peso', 'altura', 'notas'
-        )
\ No newline at end of file
+        )
+
+
+# --- Variantes para el registro async ---
+# Sin validadores que consulten la base: la unicidad y el entrenador se
+# verifican con el ORM async en AsyncRegisterView
+class AsyncUserSerializer(UserSerializer):
+    email = serializers.EmailField(required=True)
+
+    class Meta(UserSerializer.Meta):
+        extra_kwargs = {
+            **UserSerializer.Meta.extra_kwargs,
+            'username': {'validators': [UnicodeUsernameValidator()]},
+        }
+
+
+class AsyncAlumnoProfileSerializer(AlumnoProfileSerializer):
+    entrenador_id = serializers.IntegerField(min_value=1, label="ID del Entrenador")
+
+
+# Máximo de alumnos por importación
+MAX_ALUMNOS_IMPORTACION = 1000
+
+
+class AlumnoImportRowSerializer(serializers.Serializer):
+    """
+    Fila de la importación masiva de alumnos (usuario + perfil). La unicidad
+    de username / email se valida en bloque en RegistrationService, no aquí.
+    """
+    username = serializers.CharField(max_length=150, validators=[UnicodeUsernameValidator()])
+    email = serializers.EmailField()
+    password = serializers.CharField(min_length=8, write_only=True)
+    first_name = serializers.CharField(max_length=150, required=False, allow_blank=True)
+    last_name = serializers.CharField(max_length=150, required=False, allow_blank=True)
+    fecha_nacimiento = serializers.DateField(required=False)
+    telefono = serializers.CharField(max_length=15, required=False, allow_blank=True)
+    peso = serializers.DecimalField(max_digits=5, decimal_places=2, min_value=0, required=False)
+    altura = serializers.DecimalField(max_digits=5, decimal_places=2, min_value=0, required=False)
+    notas = serializers.CharField(required=False, allow_blank=True)
+
+    CAMPOS_USUARIO = ('username', 'email', 'password', 'first_name', 'last_name')
+
+
+class AlumnoImportSerializer(serializers.Serializer):
+    """JSON con la lista de alumnos o un archivo CSV con las mismas columnas"""
+    alumnos = serializers.ListField(
+        child=serializers.DictField(),
+        required=False,
+        allow_empty=False,
+        max_length=MAX_ALUMNOS_IMPORTACION
+    )
+    archivo = serializers.FileField(required=False)
+
+    def validate(self, attrs):
+        if not attrs.get('alumnos') and not attrs.get('archivo'):
+            raise serializers.ValidationError("Debe enviar 'alumnos' (JSON) o 'archivo' (CSV).")
+        return attrs
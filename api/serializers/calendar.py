@@ -0,0 +1,90 @@
+from rest_framework import serializers
+
+from ..models.activity_types import TipoActividad, TipoRutina
+from ..models.routine import Rutina
+from ..models.plan_assignment import DiaAsignado
+from ..models.execution import EjecucionEntrenamiento
+from ..services.catalog import CatalogService
+
+# Máximo de días por consulta de calendario
+MAX_DIAS_RANGO = 92
+
+
+class CalendarRangeSerializer(serializers.Serializer):
+    desde = serializers.DateField()
+    hasta = serializers.DateField()
+
+    def validate(self, attrs):
+        if attrs['hasta'] < attrs['desde']:
+            raise serializers.ValidationError({"to": "La fecha 'to' debe ser posterior a 'from'."})
+        if (attrs['hasta'] - attrs['desde']).days + 1 > MAX_DIAS_RANGO:
+            raise serializers.ValidationError(
+                {"to": f"El rango no puede superar los {MAX_DIAS_RANGO} días."}
+            )
+        return attrs
+
+
+class CatalogTypeField(serializers.Field):
+    """
+    {'id', 'nombre'} de un TipoActividad / TipoRutina leído de CatalogService
+    a partir de <relacion>_id, sin JOIN ni consulta por fila. Los tipos
+    personalizados se buscan en el catálogo del entrenador de la instancia
+    (entrenador_id) o del contexto ('entrenador_id').
+    """
+
+    def __init__(self, modelo, relacion, **kwargs):
+        self.modelo = modelo
+        self.relacion = relacion
+        kwargs.update(source='*', read_only=True)
+        super().__init__(**kwargs)
+
+    def to_representation(self, instancia):
+        entrenador_id = getattr(instancia, 'entrenador_id', None) or self.context.get('entrenador_id')
+        tipo = CatalogService.lookup(self.modelo, getattr(instancia, f'{self.relacion}_id'), entrenador_id)
+        return tipo and {'id': tipo.id, 'nombre': tipo.nombre}
+
+
+class CalendarRutinaSerializer(serializers.ModelSerializer):
+    tipo_actividad = CatalogTypeField(TipoActividad, 'tipo_actividad')
+    tipo_rutina = CatalogTypeField(TipoRutina, 'tipo_rutina', allow_null=True)
+
+    class Meta:
+        model = Rutina
+        fields = ('id', 'nombre', 'descripcion', 'detalles', 'tipo_actividad', 'tipo_rutina')
+
+
+class CalendarEjecucionSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = EjecucionEntrenamiento
+        fields = (
+            'id', 'fecha_hora_ejecucion', 'distancia_km', 'duracion_minutos', 'ritmo',
+            'pulsaciones_promedio', 'pulsaciones_max', 'calificacion', 'comentarios'
+        )
+
+
+class CalendarDaySerializer(serializers.ModelSerializer):
+    """
+    Día del calendario del alumno. Se identifica por (asignacion_plan, fecha)
+    para que el cliente no dependa de que el día esté materializado.
+    Requiere el queryset de CalendarView (select_related + prefetch de ejecuciones).
+    """
+    asignacion_plan = serializers.IntegerField(source='asignacion_plan_id')
+    fecha = serializers.DateField(source='fecha_especifica')
+    es_descanso = serializers.BooleanField(source='dia_plantilla.es_descanso')
+    notas = serializers.CharField(source='dia_plantilla.notas')
+    rutina = CalendarRutinaSerializer(source='dia_plantilla.rutina', allow_null=True)
+    ultima_ejecucion = serializers.SerializerMethodField()
+
+    class Meta:
+        model = DiaAsignado
+        fields = (
+            'asignacion_plan', 'fecha', 'dia_semana', 'completado',
+            'es_descanso', 'notas', 'rutina', 'ultima_ejecucion'
+        )
+
+    def get_ultima_ejecucion(self, obj):
+        # Los días virtuales no tienen ejecuciones (se materializan al registrar una)
+        ejecuciones = getattr(obj, 'ejecuciones_recientes', None)
+        if not ejecuciones:
+            return None
+        return CalendarEjecucionSerializer(ejecuciones[0]).data
@@ -0,0 +1,93 @@
+from rest_framework import serializers
+
+from ..models.execution import EjecucionEntrenamiento
+
+# Máximo de ejecuciones por llamada de sincronización
+MAX_EJECUCIONES_LOTE = 500
+
+
+class EjecucionIngestItemSerializer(serializers.ModelSerializer):
+    """
+    Ejecución de una sincronización por lotes. El día se indica con
+    dia_asignado o con (asignacion_plan, fecha), que sirve también para
+    días todavía no materializados (calendario virtual).
+    Los IDs se validan en bloque en ExecutionIngestService, no aquí.
+    """
+    dia_asignado = serializers.IntegerField(min_value=1, required=False)
+    asignacion_plan = serializers.IntegerField(min_value=1, required=False)
+    fecha = serializers.DateField(required=False)
+
+    class Meta:
+        model = EjecucionEntrenamiento
+        fields = (
+            'dia_asignado', 'asignacion_plan', 'fecha',
+            'fecha_hora_ejecucion', 'comentarios', 'ritmo',
+            'pulsaciones_promedio', 'pulsaciones_max',
+            'distancia_km', 'duracion_minutos', 'calificacion'
+        )
+
+    def validate(self, attrs):
+        if attrs.get('dia_asignado') is None and (
+            attrs.get('asignacion_plan') is None or attrs.get('fecha') is None
+        ):
+            raise serializers.ValidationError(
+                "Debe indicar 'dia_asignado' o 'asignacion_plan' y 'fecha'."
+            )
+        return attrs
+
+
+class EjecucionIngestSerializer(serializers.Serializer):
+    ejecuciones = serializers.ListField(
+        child=serializers.DictField(),
+        allow_empty=False,
+        max_length=MAX_EJECUCIONES_LOTE
+    )
+
+
+# Tamaño máximo de un archivo GPX / TCX
+MAX_TRACK_BYTES = 20 * 1024 * 1024
+TRACK_EXTENSIONES = ('.gpx', '.tcx')
+
+
+class TrackImportSerializer(serializers.Serializer):
+    """
+    Importación de un track de reloj GPS. Las métricas (distancia, duración,
+    ritmo y pulsaciones) se calculan del archivo; el día se indica igual que
+    en la sincronización por lotes.
+    """
+    archivo = serializers.FileField()
+    dia_asignado = serializers.IntegerField(min_value=1, required=False)
+    asignacion_plan = serializers.IntegerField(min_value=1, required=False)
+    fecha = serializers.DateField(required=False)
+    comentarios = serializers.CharField(required=False, allow_blank=True)
+    calificacion = serializers.IntegerField(min_value=1, max_value=5, required=False)
+
+    def validate_archivo(self, archivo):
+        if not archivo.name.lower().endswith(TRACK_EXTENSIONES):
+            raise serializers.ValidationError("El archivo debe ser .gpx o .tcx.")
+        if archivo.size > MAX_TRACK_BYTES:
+            raise serializers.ValidationError(
+                f"El archivo supera el máximo de {MAX_TRACK_BYTES // (1024 * 1024)} MB."
+            )
+        return archivo
+
+    def validate(self, attrs):
+        if attrs.get('dia_asignado') is None and (
+            attrs.get('asignacion_plan') is None or attrs.get('fecha') is None
+        ):
+            raise serializers.ValidationError(
+                "Debe indicar 'dia_asignado' o 'asignacion_plan' y 'fecha'."
+            )
+        return attrs
+
+
+class SampleChartQuerySerializer(serializers.Serializer):
+    """Resolución y rango (segundos desde el inicio) del gráfico de muestras"""
+    puntos = serializers.IntegerField(min_value=10, max_value=5000, default=500)
+    desde = serializers.IntegerField(min_value=0, required=False)
+    hasta = serializers.IntegerField(min_value=0, required=False)
+
+    def validate(self, attrs):
+        if attrs.get('desde') is not None and attrs.get('hasta') is not None and attrs['desde'] > attrs['hasta']:
+            raise serializers.ValidationError("'desde' no puede ser posterior a 'hasta'.")
+        return attrs
@@ -0,0 +1,9 @@
+from rest_framework import serializers
+
+
+class ExecutionExportQuerySerializer(serializers.Serializer):
+    formato = serializers.ChoiceField(choices=['csv', 'ndjson'], default='csv')
+    desde = serializers.DateField(required=False)
+    hasta = serializers.DateField(required=False)
+    alumno = serializers.IntegerField(min_value=1, required=False)
+    gzip = serializers.BooleanField(default=False)
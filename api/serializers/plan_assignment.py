@@ -0,0 +1,25 @@
+from rest_framework import serializers
+from ..models.plan_assignment import AsignacionPlan
+
+
+class CohortAssignmentSerializer(serializers.Serializer):
+    alumno_ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=2000,
+        label="IDs de Alumnos"
+    )
+    fecha_inicio = serializers.DateField()
+    fecha_fin = serializers.DateField(required=False)
+    modo_calendario = serializers.ChoiceField(
+        choices=AsignacionPlan.MODO_CALENDARIO_CHOICES,
+        default='materializado'
+    )
+
+    def validate(self, attrs):
+        fecha_fin = attrs.get('fecha_fin')
+        if fecha_fin and fecha_fin < attrs['fecha_inicio']:
+            raise serializers.ValidationError(
+                {"fecha_fin": "La fecha de fin debe ser posterior a la fecha de inicio."}
+            )
+        return attrs
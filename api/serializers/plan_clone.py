@@ -0,0 +1,6 @@
+from rest_framework import serializers
+
+
+class PlanCloneSerializer(serializers.Serializer):
+    nombre = serializers.CharField(max_length=200, required=False)
+    is_template = serializers.BooleanField(required=False)
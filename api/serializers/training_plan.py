@@ -0,0 +1,39 @@
+from rest_framework import serializers
+
+from ..models.activity_types import TipoActividad
+from ..models.training_plan import PlanEntrenamiento, Semana, DiaPlantilla
+from .calendar import CatalogTypeField, CalendarRutinaSerializer
+
+
+class DiaPlantillaTreeSerializer(serializers.ModelSerializer):
+    rutina = CalendarRutinaSerializer(allow_null=True)
+    es_descanso = serializers.BooleanField()
+
+    class Meta:
+        model = DiaPlantilla
+        fields = ('id', 'dia_semana', 'orden', 'notas', 'es_descanso', 'rutina')
+
+
+class SemanaTreeSerializer(serializers.ModelSerializer):
+    dias_plantilla = DiaPlantillaTreeSerializer(many=True)
+
+    class Meta:
+        model = Semana
+        fields = ('id', 'numero_semana', 'nombre', 'descripcion', 'dias_plantilla')
+
+
+class PlanTreeSerializer(serializers.ModelSerializer):
+    """
+    Representación anidada completa del plan
+    (semanas -> dias_plantilla -> rutina -> tipos).
+    Requiere el queryset de PlanTreeService.
+    """
+    tipo_actividad = CatalogTypeField(TipoActividad, 'tipo_actividad')
+    semanas = SemanaTreeSerializer(many=True)
+
+    class Meta:
+        model = PlanEntrenamiento
+        fields = (
+            'id', 'entrenador', 'nombre', 'descripcion', 'duracion_semanas',
+            'is_template', 'tipo_actividad', 'semanas'
+        )
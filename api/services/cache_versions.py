@@ -0,0 +1,31 @@
+import time
+
+from django.core.cache import cache
+
+
+def _seed():
+    # Mayor que cualquier versión sembrada antes: si la clave se pierde
+    # (desalojo, flush, reinicio) la numeración no vuelve a valores ya usados
+    return time.time_ns()
+
+
+def current_version(clave):
+    """Versión guardada en la cache compartida; si no existe se siembra con el reloj"""
+    version = cache.get(clave)
+    if version is None:
+        semilla = _seed()
+        cache.add(clave, semilla, timeout=None)
+        version = cache.get(clave, semilla)
+    return version
+
+
+def bump_version(clave):
+    """Incrementa la versión (o la siembra si se perdió) y la retorna"""
+    cache.add(clave, _seed(), timeout=None)
+    try:
+        return cache.incr(clave)
+    except ValueError:
+        # La clave fue desalojada entre add() e incr()
+        semilla = _seed()
+        cache.set(clave, semilla, timeout=None)
+        return semilla
@@ -0,0 +1,169 @@
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+
+from ..models.training_plan import DiaPlantilla
+from ..models.plan_assignment import AsignacionPlan, DiaAsignado
+from .plan_assignment import PlanAssignmentService
+
+
+class CalendarService:
+    """
+    Lectura y escritura del calendario de un alumno con independencia del
+    modo de la asignación (materializado o virtual).
+
+    En modo virtual los días se calculan a partir de fecha_inicio y del árbol
+    Semana/DiaPlantilla; solo los días con ejecuciones tienen fila propia.
+    Los días virtuales se devuelven como instancias de DiaAsignado sin guardar.
+    """
+
+    @staticmethod
+    def assignments_for(alumno, desde, hasta):
+        """Asignaciones del alumno que se solapan con el rango de fechas"""
+        return (
+            AsignacionPlan.objects
+            .filter(alumno=alumno, fecha_inicio__lte=hasta)
+            .filter(Q(fecha_fin__isnull=True) | Q(fecha_fin__gte=desde))
+        )
+
+    @staticmethod
+    def days_in_range(asignaciones, desde, hasta, queryset=None, plantilla_related=()):
+        """
+        Días de las asignaciones entre desde y hasta (inclusive), ordenados por fecha.
+
+        queryset permite pasar un QuerySet de DiaAsignado con select_related /
+        prefetch_related ya aplicados para los días guardados; plantilla_related
+        son las relaciones de DiaPlantilla a precargar para los días virtuales
+        (por ejemplo 'rutina__tipo_actividad').
+        """
+        asignaciones = list(asignaciones)
+        if queryset is None:
+            queryset = DiaAsignado.objects.all()
+
+        guardados = list(queryset.filter(
+            asignacion_plan__in=asignaciones,
+            fecha_especifica__range=(desde, hasta)
+        ))
+
+        virtuales = [a for a in asignaciones if a.es_virtual]
+        if not virtuales:
+            return guardados
+
+        ocupados = {(d.asignacion_plan_id, d.fecha_especifica) for d in guardados}
+        plantillas = PlanAssignmentService.expand_templates(
+            {a.plan_id for a in virtuales},
+            plantilla_related
+        )
+
+        dias = guardados
+        for asignacion in virtuales:
+            for dia in PlanAssignmentService.build_days(asignacion, plantillas[asignacion.plan_id]):
+                if not desde <= dia.fecha_especifica <= hasta:
+                    continue
+                if (asignacion.id, dia.fecha_especifica) in ocupados:
+                    continue
+                dias.append(dia)
+
+        dias.sort(key=lambda d: (d.fecha_especifica, d.asignacion_plan_id))
+        return dias
+
+    @staticmethod
+    def template_day_for(asignacion, fecha):
+        """DiaPlantilla que corresponde a una fecha concreta de la asignación"""
+        if fecha < asignacion.fecha_inicio:
+            return None
+        if asignacion.fecha_fin and fecha > asignacion.fecha_fin:
+            return None
+
+        numero_semana = (fecha - asignacion.fecha_inicio).days // 7 + 1
+        dia_semana = DiaPlantilla.DIAS_SEMANA[fecha.weekday()][0]
+        return (
+            DiaPlantilla.objects
+            .filter(
+                semana__plan_id=asignacion.plan_id,
+                semana__numero_semana=numero_semana,
+                dia_semana=dia_semana
+            )
+            .order_by('orden', 'id')
+            .first()
+        )
+
+    @staticmethod
+    def materialize_day(asignacion, fecha):
+        """
+        Devuelve el DiaAsignado guardado de la fecha, creándolo desde la
+        plantilla si todavía no existe (primer uso en modo virtual).
+        Retorna None si la fecha no tiene día plantilla.
+        """
+        existente = DiaAsignado.objects.filter(
+            asignacion_plan=asignacion,
+            fecha_especifica=fecha
+        ).first()
+        if existente:
+            return existente
+
+        dia_plantilla = CalendarService.template_day_for(asignacion, fecha)
+        if dia_plantilla is None:
+            return None
+
+        try:
+            with transaction.atomic():
+                return DiaAsignado.objects.create(
+                    asignacion_plan=asignacion,
+                    dia_plantilla=dia_plantilla,
+                    fecha_especifica=fecha,
+                    dia_semana=dia_plantilla.dia_semana
+                )
+        except IntegrityError:
+            # Otra petición lo materializó en paralelo
+            return DiaAsignado.objects.get(asignacion_plan=asignacion, fecha_especifica=fecha)
+
+    @staticmethod
+    def materialize_days(asignaciones, pares):
+        """
+        Versión por lotes de materialize_day().
+
+        asignaciones: {asignacion_id: AsignacionPlan}; pares: iterable de
+        (asignacion_id, fecha). Crea con un único bulk_create los días que
+        falten y retorna {(asignacion_id, fecha): dia_asignado_id}; los pares
+        sin día plantilla quedan fuera del resultado.
+        """
+        pares = set(pares)
+        if not pares:
+            return {}
+
+        def existentes():
+            filas = (
+                DiaAsignado.objects
+                .filter(
+                    asignacion_plan_id__in={asignacion_id for asignacion_id, _ in pares},
+                    fecha_especifica__in={fecha for _, fecha in pares}
+                )
+                .values_list('asignacion_plan_id', 'fecha_especifica', 'id')
+            )
+            return {
+                (asignacion_id, fecha): dia_id
+                for asignacion_id, fecha, dia_id in filas
+                if (asignacion_id, fecha) in pares
+            }
+
+        resultado = existentes()
+        faltantes = pares - resultado.keys()
+        if not faltantes:
+            return resultado
+
+        plantillas = PlanAssignmentService.expand_templates(
+            {asignaciones[asignacion_id].plan_id for asignacion_id, _ in faltantes}
+        )
+        nuevos = []
+        for asignacion_id, fecha in faltantes:
+            asignacion = asignaciones[asignacion_id]
+            for dia in PlanAssignmentService.build_days(asignacion, plantillas[asignacion.plan_id]):
+                if dia.fecha_especifica == fecha:
+                    nuevos.append(dia)
+                    break
+
+        if nuevos:
+            # ignore_conflicts: otra petición pudo materializar el mismo día en paralelo
+            DiaAsignado.objects.bulk_create(nuevos, ignore_conflicts=True)
+            resultado = existentes()
+        return resultado
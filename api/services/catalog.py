@@ -0,0 +1,228 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import NamedTuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+
+CATALOG_VERSION_PREFIX = 'catalogo:version:'
+# Segundos entre verificaciones de la versión compartida (cambios hechos en otros procesos)
+CATALOG_VERSION_CHECK = 1.0
+# Edad máxima (segundos) de un índice en memoria: se recarga aunque la versión no
+# haya cambiado (cubre versiones perdidas por desalojo o caída de la cache)
+CATALOG_MAX_AGE = 300
+# Entrenadores con tipos personalizados en memoria por modelo (LRU)
+CATALOG_COACH_LRU = 256
+# Dueños (tipo_id -> entrenador_id) de tipos personalizados recordados por modelo (LRU)
+CATALOG_OWNER_LRU = 4096
+
+
+class TipoCatalogo(NamedTuple):
+    """Tipo de actividad / rutina en el catálogo en memoria (inmutable, compartido entre hilos)"""
+    id: int
+    nombre: str
+    descripcion: str
+    entrenador_id: int | None
+
+    @property
+    def es_global(self):
+        return self.entrenador_id is None
+
+
+def _clave_nombre(nombre):
+    return nombre.strip().casefold()
+
+
+# Versión de los índices cargados dentro de una transacción: no coincide con
+# ninguna y fuera de la transacción se recargan (pudo ver tipos que después
+# se revierten)
+_PROVISORIA = object()
+
+
+class _Indice:
+    """Tipos de un alcance (globales o de un entrenador) por id y por nombre"""
+    __slots__ = ('version', 'cargado', 'verificado', 'por_id', 'por_nombre')
+
+    def __init__(self, version, tipos):
+        self.version = version
+        self.cargado = self.verificado = time.monotonic()
+        self.por_id = {tipo.id: tipo for tipo in tipos}
+        self.por_nombre = {_clave_nombre(tipo.nombre): tipo for tipo in tipos}
+
+
+_VACIO = _Indice(None, [])
+
+
+class Catalogo:
+    """Tipos globales más los personalizados de un entrenador, que ganan por nombre"""
+
+    def __init__(self, globales, propios=_VACIO):
+        self._globales = globales
+        self._propios = propios
+
+    def by_id(self, tipo_id):
+        return self._propios.por_id.get(tipo_id) or self._globales.por_id.get(tipo_id)
+
+    def by_name(self, nombre):
+        clave = _clave_nombre(nombre)
+        return self._propios.por_nombre.get(clave) or self._globales.por_nombre.get(clave)
+
+    def all(self):
+        combinados = {**self._globales.por_nombre, **self._propios.por_nombre}
+        return sorted(combinados.values(), key=lambda tipo: _clave_nombre(tipo.nombre))
+
+
+class CatalogService:
+    """
+    Catálogo en memoria de TipoActividad / TipoRutina.
+
+    Los tipos globales de cada modelo se guardan en memoria del proceso y
+    los personalizados de cada entrenador se cargan al primer uso en un LRU
+    de CATALOG_COACH_LRU entrenadores. Cada alcance lleva una versión en la
+    cache default (Redis, compartida entre procesos) que las escrituras
+    incrementan (ver api.signals); un proceso la vuelve a leer como mucho
+    cada CATALOG_VERSION_CHECK segundos y recarga igual los índices con más
+    de CATALOG_MAX_AGE segundos, así que las búsquedas por id o nombre son
+    accesos a diccionarios. El dueño de un tipo que no es global ni del
+    entrenador consultado se recuerda en otro LRU para no repetir su consulta.
+    """
+
+    _lock = threading.Lock()
+    _globales = {}
+    _entrenadores = {}
+    _duenos = {}
+
+    @staticmethod
+    def version_key(modelo, entrenador_id=None):
+        alcance = 'global' if entrenador_id is None else entrenador_id
+        return f"{CATALOG_VERSION_PREFIX}{modelo._meta.label_lower}:{alcance}"
+
+    @staticmethod
+    def _load(modelo, entrenador_id, version):
+        tipos = modelo.objects.filter(entrenador_id=entrenador_id) if entrenador_id is not None \
+            else modelo.objects.filter(entrenador__isnull=True)
+        return _Indice(version, [
+            TipoCatalogo(*fila)
+            for fila in tipos.values_list('id', 'nombre', 'descripcion', 'entrenador_id')
+        ])
+
+    @staticmethod
+    def catalog(modelo, entrenador_id=None):
+        """Catálogo combinado (globales + personalizados del entrenador)"""
+        etiqueta = modelo._meta.label_lower
+        ahora = time.monotonic()
+        with CatalogService._lock:
+            globales = CatalogService._globales.get(etiqueta)
+            lru = CatalogService._entrenadores.setdefault(etiqueta, OrderedDict())
+            propios = None
+            if entrenador_id is not None:
+                propios = lru.get(entrenador_id)
+                if propios is not None:
+                    lru.move_to_end(entrenador_id)
+
+        alcances = {None: globales}
+        if entrenador_id is not None:
+            alcances[entrenador_id] = propios
+        pendientes = {
+            alcance: indice for alcance, indice in alcances.items()
+            if indice is None
+            or ahora - indice.cargado > CATALOG_MAX_AGE
+            or ahora - indice.verificado > CATALOG_VERSION_CHECK
+            or (indice.version is _PROVISORIA and not connection.in_atomic_block)
+        }
+        if pendientes:
+            claves = {alcance: CatalogService.version_key(modelo, alcance) for alcance in pendientes}
+            versiones = cache.get_many(claves.values())
+            for alcance, indice in pendientes.items():
+                version = versiones.get(claves[alcance], 0)
+                vigente = indice is not None and ahora - indice.cargado <= CATALOG_MAX_AGE
+                if vigente and indice.version == version:
+                    indice.verificado = ahora
+                else:
+                    if connection.in_atomic_block:
+                        version = _PROVISORIA
+                    alcances[alcance] = CatalogService._load(modelo, alcance, version)
+
+            maximo = getattr(settings, 'CATALOG_COACH_LRU', CATALOG_COACH_LRU)
+            with CatalogService._lock:
+                CatalogService._globales[etiqueta] = alcances[None]
+                if entrenador_id is not None:
+                    lru[entrenador_id] = alcances[entrenador_id]
+                    lru.move_to_end(entrenador_id)
+                    while len(lru) > maximo:
+                        lru.popitem(last=False)
+
+        return Catalogo(alcances[None], alcances.get(entrenador_id, _VACIO))
+
+    @staticmethod
+    def lookup(modelo, tipo_id, entrenador_id=None):
+        """
+        Tipo por id. Si no es global ni del entrenador indicado (p. ej. el
+        tipo de una fila sin entrenador conocido) se usa el catálogo de su
+        dueño, que se consulta una vez y queda recordado en este proceso.
+        """
+        if tipo_id is None:
+            return None
+        tipo = CatalogService.catalog(modelo, entrenador_id).by_id(tipo_id)
+        if tipo is not None:
+            return tipo
+
+        etiqueta = modelo._meta.label_lower
+        with CatalogService._lock:
+            duenos = CatalogService._duenos.setdefault(etiqueta, OrderedDict())
+            dueno = duenos.get(tipo_id)
+            if dueno is not None:
+                duenos.move_to_end(tipo_id)
+        if dueno is not None and dueno != entrenador_id:
+            tipo = CatalogService.catalog(modelo, dueno).by_id(tipo_id)
+        if tipo is None:
+            # Dueño desconocido o ya no vigente (tipo reasignado o borrado)
+            dueno = modelo.objects.filter(pk=tipo_id).values_list('entrenador_id', flat=True).first()
+            maximo = getattr(settings, 'CATALOG_OWNER_LRU', CATALOG_OWNER_LRU)
+            with CatalogService._lock:
+                if dueno is None:
+                    duenos.pop(tipo_id, None)
+                else:
+                    duenos[tipo_id] = dueno
+                    duenos.move_to_end(tipo_id)
+                    while len(duenos) > maximo:
+                        duenos.popitem(last=False)
+            if dueno is not None and dueno != entrenador_id:
+                tipo = CatalogService.catalog(modelo, dueno).by_id(tipo_id)
+        return tipo
+
+    @staticmethod
+    def _forget(etiqueta, entrenador_ids):
+        with CatalogService._lock:
+            for entrenador_id in entrenador_ids:
+                if entrenador_id is None:
+                    CatalogService._globales.pop(etiqueta, None)
+                else:
+                    CatalogService._entrenadores.get(etiqueta, {}).pop(entrenador_id, None)
+
+    @staticmethod
+    def invalidate(modelo, entrenador_ids):
+        """Incrementa la versión de los alcances (None = globales) y los descarta de este proceso"""
+        entrenador_ids = set(entrenador_ids)
+        for entrenador_id in entrenador_ids:
+            clave = CatalogService.version_key(modelo, entrenador_id)
+            cache.add(clave, 0, timeout=None)
+            try:
+                cache.incr(clave)
+            except ValueError:
+                # La clave fue desalojada entre add() e incr()
+                cache.set(clave, 1, timeout=None)
+        CatalogService._forget(modelo._meta.label_lower, entrenador_ids)
+
+    @staticmethod
+    def changed(modelo, entrenador_ids):
+        """
+        Escritura en tipos de los alcances indicados: este proceso los
+        descarta ya (la propia transacción ve el cambio) y la versión
+        compartida se incrementa tras el commit
+        """
+        entrenador_ids = set(entrenador_ids)
+        CatalogService._forget(modelo._meta.label_lower, entrenador_ids)
+        transaction.on_commit(lambda: CatalogService.invalidate(modelo, entrenador_ids))
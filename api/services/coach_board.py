@@ -0,0 +1,147 @@
+from django.core.cache import cache
+from django.db.models import FilteredRelation, Q
+from django.utils import timezone
+
+from ..models.activity_types import TipoActividad
+from ..models.plan_assignment import AsignacionPlan
+from .catalog import CatalogService
+from .plan_assignment import PlanAssignmentService
+
+# Segundos que se reutiliza el tablero de un entrenador
+BOARD_CACHE_TTL = 60
+
+BOARD_FIELDS = (
+    'id', 'plan_id', 'fecha_inicio', 'fecha_fin', 'modo_calendario', 'plan__nombre',
+    'alumno_id', 'alumno__user__first_name', 'alumno__user__last_name', 'alumno__user__username',
+    'dia_hoy__completado',
+    'dia_hoy__dia_plantilla_id',
+    'dia_hoy__dia_plantilla__notas',
+    'dia_hoy__dia_plantilla__rutina_id',
+    'dia_hoy__dia_plantilla__rutina__nombre',
+    'dia_hoy__dia_plantilla__rutina__detalles',
+    'dia_hoy__dia_plantilla__rutina__tipo_actividad_id',
+)
+
+
+class CoachBoardService:
+    @staticmethod
+    def cache_key(entrenador_id, fecha):
+        return f"coach_board:{entrenador_id}:{fecha.isoformat()}"
+
+    @staticmethod
+    def today_board(entrenador, fecha=None):
+        """
+        Entrenamiento del día de cada alumno del entrenador con un plan activo.
+
+        Una sola consulta recorre las asignaciones activas y hace LEFT JOIN con
+        el día asignado de la fecha (índice fecha_especifica + asignacion_plan).
+        Solo las asignaciones virtuales sin día guardado requieren una consulta
+        extra a la plantilla. El resultado se cachea BOARD_CACHE_TTL segundos.
+        """
+        if fecha is None:
+            fecha = timezone.localdate()
+
+        clave = CoachBoardService.cache_key(entrenador.pk, fecha)
+        tablero = cache.get(clave)
+        if tablero is None:
+            tablero = CoachBoardService._build_board(entrenador.pk, fecha)
+            cache.set(clave, tablero, BOARD_CACHE_TTL)
+        return tablero
+
+    @staticmethod
+    def _build_board(entrenador_id, fecha):
+        filas = (
+            AsignacionPlan.objects
+            .filter(
+                alumno__entrenador_id=entrenador_id,
+                estado='activo',
+                fecha_inicio__lte=fecha
+            )
+            .filter(Q(fecha_fin__isnull=True) | Q(fecha_fin__gte=fecha))
+            .annotate(dia_hoy=FilteredRelation(
+                'dias_asignados',
+                condition=Q(dias_asignados__fecha_especifica=fecha)
+            ))
+            .order_by('alumno__user__first_name', 'alumno__user__last_name', 'alumno_id')
+            .values(*BOARD_FIELDS)
+        )
+
+        tipos = CatalogService.catalog(TipoActividad, entrenador_id)
+        tablero = []
+        pendientes_virtuales = []
+        for fila in filas:
+            if fila['dia_hoy__dia_plantilla_id'] is not None:
+                tablero.append(CoachBoardService._entry(fila, fecha, tipos))
+            elif fila['modo_calendario'] == 'virtual':
+                pendientes_virtuales.append(fila)
+
+        if pendientes_virtuales:
+            tablero.extend(CoachBoardService._virtual_entries(pendientes_virtuales, fecha, tipos))
+            tablero.sort(key=lambda entrada: (entrada['alumno'].lower(), entrada['alumno_id']))
+        return tablero
+
+    @staticmethod
+    def _type_name(tipos, tipo_id):
+        tipo = tipos.by_id(tipo_id)
+        if tipo is None:
+            # Tipo personalizado de otro entrenador (rutina de un plan ajeno)
+            tipo = CatalogService.lookup(TipoActividad, tipo_id)
+        return tipo and tipo.nombre
+
+    @staticmethod
+    def _entry(fila, fecha, tipos, dia_plantilla=None):
+        if dia_plantilla is not None:
+            rutina = dia_plantilla.rutina
+            completado = False
+            notas = dia_plantilla.notas
+            rutina_data = rutina and {
+                'id': rutina.id,
+                'nombre': rutina.nombre,
+                'detalles': rutina.detalles,
+                'tipo_actividad': CoachBoardService._type_name(tipos, rutina.tipo_actividad_id),
+            }
+        else:
+            completado = fila['dia_hoy__completado']
+            notas = fila['dia_hoy__dia_plantilla__notas']
+            rutina_data = None
+            if fila['dia_hoy__dia_plantilla__rutina_id'] is not None:
+                rutina_data = {
+                    'id': fila['dia_hoy__dia_plantilla__rutina_id'],
+                    'nombre': fila['dia_hoy__dia_plantilla__rutina__nombre'],
+                    'detalles': fila['dia_hoy__dia_plantilla__rutina__detalles'],
+                    'tipo_actividad': CoachBoardService._type_name(
+                        tipos, fila['dia_hoy__dia_plantilla__rutina__tipo_actividad_id']
+                    ),
+                }
+
+        nombre = f"{fila['alumno__user__first_name']} {fila['alumno__user__last_name']}".strip()
+        return {
+            'alumno_id': fila['alumno_id'],
+            'alumno': nombre or fila['alumno__user__username'],
+            'asignacion_plan': fila['id'],
+            'plan': fila['plan__nombre'],
+            'fecha': fecha,
+            'es_descanso': rutina_data is None,
+            'rutina': rutina_data,
+            'notas': notas,
+            'completado': completado,
+        }
+
+    @staticmethod
+    def _virtual_entries(filas, fecha, tipos):
+        """Deriva de la plantilla el día de las asignaciones en modo virtual"""
+        plantillas = PlanAssignmentService.expand_templates(
+            {fila['plan_id'] for fila in filas},
+            ('rutina',)
+        )
+
+        entradas = []
+        for fila in filas:
+            numero_semana = (fecha - fila['fecha_inicio']).days // 7 + 1
+            for semana, indice_dia, dia_plantilla in plantillas[fila['plan_id']]:
+                if semana != numero_semana:
+                    continue
+                if PlanAssignmentService.date_for(fila['fecha_inicio'], semana, indice_dia) == fecha:
+                    entradas.append(CoachBoardService._entry(fila, fecha, tipos, dia_plantilla))
+                    break
+        return entradas
@@ -0,0 +1,149 @@
+from collections import defaultdict
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db.models import Count, Q
+from django.db.models.functions import TruncWeek
+
+from ..models.user_profiles import Alumno
+from ..models.plan_assignment import AsignacionPlan, DiaAsignado
+from .cache_versions import current_version, bump_version
+from .plan_assignment import PlanAssignmentService
+
+COMPLIANCE_CACHE_TTL = 60 * 10
+
+
+class ComplianceService:
+    """
+    Cumplimiento planificado vs. completado por alumno y semana.
+
+    Solo cuentan las asignaciones activas y los días con rutina. Se calcula
+    con una agregación en la base (TruncWeek + Count condicional) y se
+    cachea por entrenador con un número de versión que se incrementa cada
+    vez que un alumno del entrenador registra o borra una ejecución o
+    cambia una de sus asignaciones (sembrado con el reloj, ver cache_versions).
+    """
+
+    @staticmethod
+    def version_key(entrenador_id):
+        return f"compliance:version:{entrenador_id}"
+
+    @staticmethod
+    def invalidate(entrenador_id):
+        bump_version(ComplianceService.version_key(entrenador_id))
+
+    @staticmethod
+    def invalidate_for_alumnos(alumno_ids):
+        entrenador_ids = (
+            Alumno.objects
+            .filter(pk__in=alumno_ids)
+            .values_list('entrenador_id', flat=True)
+            .distinct()
+        )
+        for entrenador_id in entrenador_ids:
+            ComplianceService.invalidate(entrenador_id)
+
+    @staticmethod
+    def coach_compliance(entrenador, desde, hasta):
+        version = current_version(ComplianceService.version_key(entrenador.pk))
+        clave = f"compliance:{entrenador.pk}:v{version}:{desde.isoformat()}:{hasta.isoformat()}"
+
+        resultado = cache.get(clave)
+        if resultado is None:
+            resultado = ComplianceService._compute(entrenador.pk, desde, hasta)
+            cache.set(clave, resultado, COMPLIANCE_CACHE_TTL)
+        return resultado
+
+    @staticmethod
+    def _compute(entrenador_id, desde, hasta):
+        filas = (
+            DiaAsignado.objects
+            .filter(
+                asignacion_plan__alumno__entrenador_id=entrenador_id,
+                asignacion_plan__estado='activo',
+                fecha_especifica__range=(desde, hasta)
+            )
+            .annotate(semana=TruncWeek('fecha_especifica'))
+            .values(
+                'asignacion_plan__alumno_id',
+                'asignacion_plan__alumno__user__first_name',
+                'asignacion_plan__alumno__user__last_name',
+                'asignacion_plan__alumno__user__username',
+                'semana'
+            )
+            .annotate(
+                # En modo virtual solo existen las filas ejecutadas: lo planificado sale de la plantilla
+                planificados=Count('id', filter=Q(
+                    dia_plantilla__rutina__isnull=False,
+                    asignacion_plan__modo_calendario='materializado'
+                )),
+                # Solo días con rutina, igual que lo planificado: un descanso
+                # completado no suma y el cumplimiento no pasa del 100%
+                completados=Count('id', filter=Q(
+                    dia_plantilla__rutina__isnull=False,
+                    completado=True
+                )),
+            )
+            .order_by()
+        )
+
+        celdas = {}
+        nombres = {}
+        for fila in filas:
+            alumno_id = fila['asignacion_plan__alumno_id']
+            nombre = (
+                f"{fila['asignacion_plan__alumno__user__first_name']} "
+                f"{fila['asignacion_plan__alumno__user__last_name']}"
+            ).strip()
+            nombres[alumno_id] = nombre or fila['asignacion_plan__alumno__user__username']
+            celdas[(alumno_id, fila['semana'])] = [fila['planificados'], fila['completados']]
+
+        for (alumno_id, semana), planificados in ComplianceService._virtual_planned(
+            entrenador_id, desde, hasta, nombres
+        ).items():
+            celdas.setdefault((alumno_id, semana), [0, 0])[0] += planificados
+
+        resultado = []
+        for (alumno_id, semana), (planificados, completados) in sorted(
+            celdas.items(), key=lambda item: (nombres[item[0][0]].lower(), item[0][0], item[0][1])
+        ):
+            resultado.append({
+                'alumno_id': alumno_id,
+                'alumno': nombres[alumno_id],
+                'semana': semana,
+                'planificados': planificados,
+                'completados': completados,
+                'cumplimiento': round(completados / planificados, 4) if planificados else None,
+            })
+        return resultado
+
+    @staticmethod
+    def _virtual_planned(entrenador_id, desde, hasta, nombres):
+        """Días con rutina por (alumno, semana) de las asignaciones virtuales"""
+        asignaciones = list(
+            AsignacionPlan.objects
+            .filter(
+                alumno__entrenador_id=entrenador_id,
+                estado='activo',
+                modo_calendario='virtual',
+                fecha_inicio__lte=hasta
+            )
+            .filter(Q(fecha_fin__isnull=True) | Q(fecha_fin__gte=desde))
+            .select_related('alumno__user')
+        )
+        if not asignaciones:
+            return {}
+
+        plantillas = PlanAssignmentService.expand_templates({a.plan_id for a in asignaciones})
+        planificados = defaultdict(int)
+        for asignacion in asignaciones:
+            nombres.setdefault(
+                asignacion.alumno_id,
+                asignacion.alumno.nombre_completo or asignacion.alumno.user.username
+            )
+            for dia in PlanAssignmentService.build_days(asignacion, plantillas[asignacion.plan_id]):
+                if dia.dia_plantilla.rutina_id is None or not desde <= dia.fecha_especifica <= hasta:
+                    continue
+                semana = dia.fecha_especifica - timedelta(days=dia.fecha_especifica.weekday())
+                planificados[(asignacion.alumno_id, semana)] += 1
+        return planificados
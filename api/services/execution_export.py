@@ -0,0 +1,104 @@
+import csv
+import json
+import zlib
+from datetime import timedelta
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from ..models.execution import EjecucionEntrenamiento
+from .weekly_rollup import start_of_day
+
+EXPORT_CHUNK_SIZE = 2000
+
+# Tamaño aproximado de cada bloque enviado al cliente
+EXPORT_BUFFER_BYTES = 64 * 1024
+
+EXPORT_COLUMNS = (
+    ('id', 'id'),
+    ('alumno_id', 'alumno_id'),
+    ('alumno__user__username', 'usuario'),
+    ('alumno__user__first_name', 'nombre'),
+    ('alumno__user__last_name', 'apellido'),
+    ('fecha_hora_ejecucion', 'fecha_hora_ejecucion'),
+    ('tipo_actividad__nombre', 'tipo_actividad'),
+    ('distancia_km', 'distancia_km'),
+    ('duracion_minutos', 'duracion_minutos'),
+    ('ritmo', 'ritmo'),
+    ('ritmo_seg_km', 'ritmo_seg_km'),
+    ('pulsaciones_promedio', 'pulsaciones_promedio'),
+    ('pulsaciones_max', 'pulsaciones_max'),
+    ('calificacion', 'calificacion'),
+    ('comentarios', 'comentarios'),
+)
+
+
+class _Echo:
+    """Objeto tipo archivo para csv.writer que devuelve la línea en vez de guardarla"""
+
+    def write(self, value):
+        return value
+
+
+class ExecutionExportService:
+    """
+    Exportación en streaming del historial de ejecuciones de un entrenador.
+    Las filas se leen con values_list + iterator() (cursor del lado del
+    servidor), por lo que la memoria no crece con la cantidad de filas.
+    """
+
+    @staticmethod
+    def rows(entrenador_id, desde=None, hasta=None, alumno_id=None):
+        ejecuciones = EjecucionEntrenamiento.objects.filter(alumno__entrenador_id=entrenador_id)
+        if alumno_id is not None:
+            ejecuciones = ejecuciones.filter(alumno_id=alumno_id)
+        # Límites como datetimes (no __date) para que se use el índice sobre fecha_hora_ejecucion
+        if desde is not None:
+            ejecuciones = ejecuciones.filter(fecha_hora_ejecucion__gte=start_of_day(desde))
+        if hasta is not None:
+            ejecuciones = ejecuciones.filter(fecha_hora_ejecucion__lt=start_of_day(hasta + timedelta(days=1)))
+
+        return (
+            ejecuciones
+            .order_by('alumno_id', 'fecha_hora_ejecucion')
+            .values_list(*(campo for campo, _ in EXPORT_COLUMNS))
+            .iterator(chunk_size=EXPORT_CHUNK_SIZE)
+        )
+
+    @staticmethod
+    def csv_lines(filas):
+        writer = csv.writer(_Echo())
+        yield writer.writerow([columna for _, columna in EXPORT_COLUMNS])
+        for fila in filas:
+            yield writer.writerow(fila)
+
+    @staticmethod
+    def ndjson_lines(filas):
+        columnas = [columna for _, columna in EXPORT_COLUMNS]
+        for fila in filas:
+            yield json.dumps(dict(zip(columnas, fila)), cls=DjangoJSONEncoder, ensure_ascii=False) + '\n'
+
+    @staticmethod
+    def encode(lineas, comprimir=False):
+        """
+        Agrupa las líneas en bloques de ~EXPORT_BUFFER_BYTES y, si se pide,
+        los comprime en gzip a medida que se generan.
+        """
+        compresor = zlib.compressobj(wbits=31) if comprimir else None
+        buffer = []
+        tamano = 0
+        for linea in lineas:
+            datos = linea.encode('utf-8')
+            buffer.append(datos)
+            tamano += len(datos)
+            if tamano >= EXPORT_BUFFER_BYTES:
+                bloque = b''.join(buffer)
+                buffer, tamano = [], 0
+                bloque = compresor.compress(bloque) if compresor else bloque
+                if bloque:
+                    yield bloque
+
+        bloque = b''.join(buffer)
+        if compresor:
+            bloque = compresor.compress(bloque) + compresor.flush()
+        if bloque:
+            yield bloque
@@ -0,0 +1,120 @@
+from django.db import transaction
+from django.utils import timezone
+
+from ..models.plan_assignment import AsignacionPlan, DiaAsignado
+from ..models.execution import EjecucionEntrenamiento
+from ..serializers.execution import EjecucionIngestItemSerializer
+from .calendar import CalendarService
+from .weekly_rollup import WeeklyRollupService
+from .training_load import TrainingLoadService
+from .personal_records import PersonalRecordService
+from .compliance import ComplianceService
+
+
+class ExecutionIngestService:
+    @staticmethod
+    def ingest(alumno, items):
+        """
+        Valida e inserta un lote de ejecuciones del alumno.
+
+        Los elementos inválidos se reportan por índice sin abortar el lote.
+        Las ejecuciones válidas se insertan con un bulk_create y los días
+        afectados se marcan completados con un único UPDATE ... WHERE id IN (...),
+        todo dentro de una transacción.
+        Retorna (ejecuciones_creadas, errores).
+        """
+        errores = []
+        validos = []
+        for indice, item in enumerate(items):
+            serializer = EjecucionIngestItemSerializer(data=item)
+            if serializer.is_valid():
+                validos.append((indice, serializer.validated_data))
+            else:
+                errores.append({'indice': indice, 'errores': serializer.errors})
+
+        if not validos:
+            return [], errores
+
+        with transaction.atomic():
+            dias = ExecutionIngestService._resolve_days(alumno, validos, errores)
+
+            ejecuciones = []
+            for indice, data in validos:
+                dia_id = dias.get(indice)
+                if dia_id is None:
+                    continue
+                campos = {
+                    campo: valor for campo, valor in data.items()
+                    if campo not in ('dia_asignado', 'asignacion_plan', 'fecha')
+                }
+                ejecuciones.append(EjecucionEntrenamiento(dia_asignado_id=dia_id, **campos))
+
+            if ejecuciones:
+                # bulk_create no llama a save(): los campos derivados se calculan aquí
+                contexto = EjecucionEntrenamiento.resolver_contexto(
+                    {ejecucion.dia_asignado_id for ejecucion in ejecuciones}
+                )
+                for ejecucion in ejecuciones:
+                    ejecucion.ritmo_seg_km = ejecucion.calcular_ritmo_seg_km()
+                    ejecucion.alumno_id, ejecucion.tipo_actividad_id = contexto[ejecucion.dia_asignado_id]
+
+                ejecuciones = EjecucionEntrenamiento.objects.bulk_create(ejecuciones)
+                DiaAsignado.objects.filter(
+                    pk__in={ejecucion.dia_asignado_id for ejecucion in ejecuciones},
+                    completado=False
+                ).update(completado=True, updated_at=timezone.now())
+
+                # bulk_create no emite post_save
+                WeeklyRollupService.add_executions(ejecuciones)
+                TrainingLoadService.add_executions(ejecuciones)
+                PersonalRecordService.add_executions(ejecuciones)
+                entrenador_id = alumno.entrenador_id
+                transaction.on_commit(lambda: ComplianceService.invalidate(entrenador_id))
+
+        errores.sort(key=lambda error: error['indice'])
+        return ejecuciones, errores
+
+    @staticmethod
+    def _resolve_days(alumno, validos, errores):
+        """
+        {indice: dia_asignado_id} de los elementos cuyo día pertenece al alumno.
+        Agrega a errores los que no.
+        """
+        dia_ids = {data['dia_asignado'] for _, data in validos if data.get('dia_asignado')}
+        propios = set(
+            DiaAsignado.objects
+            .filter(pk__in=dia_ids, asignacion_plan__alumno=alumno)
+            .values_list('id', flat=True)
+        ) if dia_ids else set()
+
+        pares = {
+            (data['asignacion_plan'], data['fecha'])
+            for _, data in validos if data.get('dia_asignado') is None
+        }
+        asignaciones = AsignacionPlan.objects.in_bulk(
+            {asignacion_id for asignacion_id, _ in pares}
+        ) if pares else {}
+        asignaciones = {
+            asignacion_id: asignacion for asignacion_id, asignacion in asignaciones.items()
+            if asignacion.alumno_id == alumno.pk
+        }
+        materializados = CalendarService.materialize_days(
+            asignaciones,
+            [par for par in pares if par[0] in asignaciones]
+        )
+
+        dias = {}
+        for indice, data in validos:
+            if data.get('dia_asignado') is not None:
+                dia_id = data['dia_asignado'] if data['dia_asignado'] in propios else None
+            else:
+                dia_id = materializados.get((data['asignacion_plan'], data['fecha']))
+
+            if dia_id is None:
+                errores.append({
+                    'indice': indice,
+                    'errores': {'dia_asignado': ["El día no existe o no pertenece al alumno."]}
+                })
+            else:
+                dias[indice] = dia_id
+        return dias
@@ -0,0 +1,218 @@
+import struct
+from datetime import datetime, timezone as dt_timezone
+
+import numpy as np
+
+from ..models.execution import SerieMuestras
+
+# Puntos por canal de la vista precalculada (la que piden los gráficos por defecto)
+VISTA_PUNTOS = 500
+# Ventana (en muestras) del promedio móvil de la velocidad; el GPS punto a punto es ruidoso
+VELOCIDAD_VENTANA = 5
+
+CANALES = ('pulsaciones', 'velocidad', 'altitud')
+TIPOS = {
+    'tiempo': np.dtype('<u4'),
+    'pulsaciones': np.dtype('<i2'),
+    'velocidad': np.dtype('<f4'),
+    'altitud': np.dtype('<f4'),
+}
+
+
+def lttb(x, y, puntos):
+    """
+    Largest-Triangle-Three-Buckets: elige `puntos` índices que conservan la
+    forma visual de la serie. Retorna los índices seleccionados.
+    """
+    n = x.size
+    if puntos >= n or puntos < 3:
+        return np.arange(n)
+
+    indices = np.empty(puntos, dtype=np.int64)
+    indices[0] = 0
+    indices[-1] = n - 1
+    limites = np.linspace(1, n - 1, puntos - 1).astype(np.int64)
+
+    anterior = 0
+    for i in range(puntos - 2):
+        inicio, fin = limites[i], limites[i + 1]
+        siguiente_fin = limites[i + 2] if i + 2 < limites.size else n
+        promedio_x = x[fin:siguiente_fin].mean() if siguiente_fin > fin else x[-1]
+        promedio_y = y[fin:siguiente_fin].mean() if siguiente_fin > fin else y[-1]
+
+        # Área del triángulo (anterior, candidato, promedio del bucket siguiente)
+        areas = np.abs(
+            (x[anterior] - promedio_x) * (y[inicio:fin] - y[anterior])
+            - (x[anterior] - x[inicio:fin]) * (promedio_y - y[anterior])
+        )
+        anterior = inicio + int(areas.argmax())
+        indices[i + 1] = anterior
+    return indices
+
+
+def min_max(x, y, puntos):
+    """
+    Reducción por buckets conservando el mínimo y el máximo de cada uno
+    (útil para zoom sobre picos de pulsaciones). Retorna los índices seleccionados.
+    """
+    n = x.size
+    if puntos >= n or puntos < 2:
+        return np.arange(n)
+
+    # Dos puntos (mínimo y máximo) por bucket
+    limites = np.linspace(0, n, max(puntos // 2, 1) + 1).astype(np.int64)
+    indices = []
+    for inicio, fin in zip(limites[:-1], limites[1:]):
+        if fin > inicio:
+            tramo = y[inicio:fin]
+            indices.extend((inicio + int(tramo.argmin()), inicio + int(tramo.argmax())))
+    return np.unique(np.array(indices, dtype=np.int64))
+
+
+class ExecutionSamplesService:
+    """
+    Serie de muestras de una ejecución: arrays empaquetados con tipos
+    compactos (uint32 / int16 / float32) y una vista LTTB precalculada de
+    VISTA_PUNTOS por canal, que el gráfico lee sin cargar los arrays completos.
+    """
+
+    @staticmethod
+    def channels_from_track(track, distancias):
+        """
+        Canales a resolución completa a partir del track importado y de las
+        distancias entre puntos consecutivos (TrackImportService.segment_distances)
+        """
+        tiempo = track['tiempo'] - track['tiempo'][0]
+        intervalos = np.diff(tiempo)
+        velocidad = np.full(tiempo.size, np.nan)
+        velocidad[1:] = np.divide(
+            distancias, intervalos, out=np.full(intervalos.size, np.nan), where=intervalos > 0
+        )
+        if velocidad.size > VELOCIDAD_VENTANA:
+            valida = ~np.isnan(velocidad)
+            ventana = np.ones(VELOCIDAD_VENTANA)
+            suma = np.convolve(np.where(valida, velocidad, 0), ventana, mode='same')
+            cantidad = np.convolve(valida.astype(np.float64), ventana, mode='same')
+            velocidad = np.divide(suma, cantidad, out=np.full(suma.size, np.nan), where=cantidad > 0)
+
+        pulsaciones = track['pulsaciones']
+        pulsaciones = np.where((pulsaciones >= 30) & (pulsaciones <= 250), pulsaciones, -1)
+        return {
+            'tiempo': np.round(tiempo),
+            'pulsaciones': np.round(pulsaciones),
+            'velocidad': velocidad,
+            'altitud': track['altitud'],
+        }
+
+    @staticmethod
+    def save_from_track(ejecucion, track, distancias):
+        canales = ExecutionSamplesService.channels_from_track(track, distancias)
+        empaquetados = {
+            nombre: np.ascontiguousarray(valores, dtype=TIPOS[nombre])
+            for nombre, valores in canales.items()
+        }
+        serie, _ = SerieMuestras.objects.update_or_create(
+            ejecucion=ejecucion,
+            defaults={
+                'inicio': datetime.fromtimestamp(float(track['tiempo'][0]), tz=dt_timezone.utc),
+                'puntos': int(empaquetados['tiempo'].size),
+                'duracion_seg': int(empaquetados['tiempo'][-1]),
+                'vista': ExecutionSamplesService._pack_view(
+                    ExecutionSamplesService._downsample(empaquetados, VISTA_PUNTOS, lttb)
+                ),
+                **{nombre: valores.tobytes() for nombre, valores in empaquetados.items()},
+            }
+        )
+        return serie
+
+    @staticmethod
+    def load(serie):
+        return {
+            nombre: np.frombuffer(bytes(getattr(serie, nombre)), dtype=tipo)
+            for nombre, tipo in TIPOS.items()
+        }
+
+    @staticmethod
+    def _valid(nombre, valores):
+        return valores >= 0 if nombre == 'pulsaciones' else ~np.isnan(valores)
+
+    @staticmethod
+    def _downsample(canales, puntos, metodo):
+        """{canal: (segundos, valores)} con a lo sumo `puntos` muestras válidas por canal"""
+        tiempo = canales['tiempo'].astype(np.float64)
+        reducidos = {}
+        for nombre in CANALES:
+            valores = canales[nombre]
+            validos = ExecutionSamplesService._valid(nombre, valores)
+            x = tiempo[validos]
+            y = valores[validos].astype(np.float64)
+            indices = metodo(x, y, puntos) if x.size else np.arange(0)
+            reducidos[nombre] = (x[indices], y[indices])
+        return reducidos
+
+    @staticmethod
+    def _pack_view(reducidos):
+        """Por canal: cantidad (uint32) + segundos (uint32[n]) + valores (float32[n])"""
+        partes = []
+        for nombre in CANALES:
+            x, y = reducidos[nombre]
+            partes.append(struct.pack('<I', x.size))
+            partes.append(x.astype('<u4').tobytes())
+            partes.append(y.astype('<f4').tobytes())
+        return b''.join(partes)
+
+    @staticmethod
+    def _unpack_view(datos):
+        datos = bytes(datos)
+        reducidos = {}
+        desplazamiento = 0
+        for nombre in CANALES:
+            (n,) = struct.unpack_from('<I', datos, desplazamiento)
+            desplazamiento += 4
+            x = np.frombuffer(datos, dtype='<u4', count=n, offset=desplazamiento)
+            desplazamiento += 4 * n
+            y = np.frombuffer(datos, dtype='<f4', count=n, offset=desplazamiento)
+            desplazamiento += 4 * n
+            reducidos[nombre] = (x, y)
+        return reducidos
+
+    @staticmethod
+    def chart(ejecucion_id, puntos=VISTA_PUNTOS, desde=None, hasta=None):
+        """
+        Datos para el gráfico de la ejecución. Sin rango y con la resolución
+        por defecto se responde desde la vista precalculada (una lectura de
+        pocos KB); un zoom (desde / hasta en segundos) o más puntos cargan los
+        arrays completos y se reducen con buckets mínimo / máximo.
+        Retorna None si la ejecución no tiene muestras.
+        """
+        completa = desde is None and hasta is None and puntos <= VISTA_PUNTOS
+        campos = ['inicio', 'puntos', 'duracion_seg'] + (['vista'] if completa else list(TIPOS))
+        serie = SerieMuestras.objects.filter(ejecucion_id=ejecucion_id).only(*campos).first()
+        if serie is None:
+            return None
+
+        if completa:
+            reducidos = ExecutionSamplesService._unpack_view(serie.vista)
+            if puntos < VISTA_PUNTOS:
+                for nombre, (x, y) in reducidos.items():
+                    indices = lttb(x.astype(np.float64), y.astype(np.float64), puntos)
+                    reducidos[nombre] = (x[indices], y[indices])
+        else:
+            canales = ExecutionSamplesService.load(serie)
+            rango = np.ones(canales['tiempo'].size, dtype=bool)
+            if desde is not None:
+                rango &= canales['tiempo'] >= desde
+            if hasta is not None:
+                rango &= canales['tiempo'] <= hasta
+            canales = {nombre: valores[rango] for nombre, valores in canales.items()}
+            reducidos = ExecutionSamplesService._downsample(canales, puntos, min_max)
+
+        return {
+            'inicio': serie.inicio,
+            'duracion_seg': serie.duracion_seg,
+            'puntos_originales': serie.puntos,
+            'canales': {
+                nombre: [[int(t), round(float(v), 2)] for t, v in zip(x, y)]
+                for nombre, (x, y) in reducidos.items()
+            },
+        }
@@ -0,0 +1,140 @@
+import io
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import DatabaseError, close_old_connections, transaction
+from PIL import Image, ImageOps
+
+from ..models.execution import ImagenEjecucion
+
+logger = logging.getLogger(__name__)
+
+# Miniatura de tamaño fijo (recorte centrado) para listados
+MINIATURA_TAMANO = (320, 320)
+MINIATURA_FORMATO = ('WEBP', 'webp', {'quality': 80, 'method': 4})
+
+# Versión para pantalla: se reduce sin recortar hasta entrar en el recuadro
+DISPLAY_MAXIMO = (1280, 1280)
+DISPLAY_FORMATO = ('JPEG', 'jpg', {'quality': 85, 'optimize': True, 'progressive': True})
+
+_executor = None
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=getattr(settings, 'IMAGE_RENDITION_WORKERS', 2),
+            thread_name_prefix='renditions'
+        )
+    return _executor
+
+
+def _encode(imagen, formato):
+    nombre_formato, _, opciones = formato
+    salida = io.BytesIO()
+    imagen.save(salida, nombre_formato, **opciones)
+    return salida.getvalue()
+
+
+def render_renditions(datos):
+    """
+    Genera la miniatura y la versión para pantalla a partir de los bytes de la
+    imagen original. Función pura (sin ORM) para poder ejecutarse en otro proceso.
+    Retorna {'ancho', 'alto', 'miniatura': bytes, 'display': bytes}.
+    """
+    with Image.open(io.BytesIO(datos)) as original:
+        # Respeta la orientación EXIF de las fotos del teléfono
+        imagen = ImageOps.exif_transpose(original)
+        ancho, alto = imagen.size
+        imagen = imagen.convert('RGB')
+
+        miniatura = ImageOps.fit(imagen, MINIATURA_TAMANO, Image.Resampling.LANCZOS)
+
+        display = imagen.copy()
+        display.thumbnail(DISPLAY_MAXIMO, Image.Resampling.LANCZOS)
+
+        return {
+            'ancho': ancho,
+            'alto': alto,
+            'miniatura': _encode(miniatura, MINIATURA_FORMATO),
+            'display': _encode(display, DISPLAY_FORMATO),
+        }
+
+
+class ImageRenditionService:
+    @staticmethod
+    def schedule(imagen_id):
+        """Encola el procesamiento de la imagen cuando se confirme la transacción actual"""
+        transaction.on_commit(lambda: _get_executor().submit(ImageRenditionService._run, imagen_id))
+
+    @staticmethod
+    def _run(imagen_id):
+        try:
+            ImageRenditionService.process(imagen_id)
+        except Exception:
+            logger.exception("Error generando las versiones de la imagen %s", imagen_id)
+        finally:
+            # El hilo del pool no pasa por el ciclo request/response
+            close_old_connections()
+
+    @staticmethod
+    def read_original(imagen):
+        with imagen.imagen.open('rb') as archivo:
+            return archivo.read()
+
+    @staticmethod
+    def process(imagen_id):
+        imagen = ImagenEjecucion.objects.filter(pk=imagen_id).first()
+        if imagen is None or not imagen.imagen:
+            return None
+        resultado = render_renditions(ImageRenditionService.read_original(imagen))
+        ImageRenditionService.store(imagen, resultado)
+        return imagen
+
+    @staticmethod
+    def store(imagen, resultado):
+        """Guarda en el storage las versiones generadas y actualiza el modelo"""
+        base = os.path.splitext(os.path.basename(imagen.imagen.name))[0]
+
+        anteriores = [campo.name for campo in (imagen.miniatura, imagen.display) if campo]
+
+        imagen.miniatura.save(
+            f"{base}.{MINIATURA_FORMATO[1]}", ContentFile(resultado['miniatura']), save=False
+        )
+        imagen.display.save(
+            f"{base}.{DISPLAY_FORMATO[1]}", ContentFile(resultado['display']), save=False
+        )
+        imagen.ancho = resultado['ancho']
+        imagen.alto = resultado['alto']
+        imagen.procesada = True
+        try:
+            # Savepoint: tras un fallo se puede seguir consultando dentro de una transacción
+            with transaction.atomic():
+                imagen.save(update_fields=[
+                    'ancho', 'alto', 'procesada',
+                    'miniatura', 'miniatura_ancho', 'miniatura_alto',
+                    'display', 'display_ancho', 'display_alto',
+                ])
+        except DatabaseError:
+            # Las versiones recién escritas no quedaron referenciadas
+            ImageRenditionService.delete_files(imagen)
+            if ImagenEjecucion.objects.filter(pk=imagen.pk).exists():
+                raise
+            logger.info("La imagen %s se borró mientras se procesaba", imagen.pk)
+            return
+
+        # Reprocesamiento: las versiones anteriores quedan huérfanas
+        for nombre in anteriores:
+            if nombre not in (imagen.miniatura.name, imagen.display.name):
+                imagen.miniatura.storage.delete(nombre)
+
+    @staticmethod
+    def delete_files(imagen):
+        """Borra del storage la miniatura y la versión para pantalla (son propias de cada imagen)"""
+        for campo in (imagen.miniatura, imagen.display):
+            if campo:
+                campo.storage.delete(campo.name)
@@ -0,0 +1,203 @@
+import os
+from datetime import timedelta
+
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.db.models import Count, F
+from django.utils import timezone
+
+from ..models.execution import ImagenEjecucion
+from ..models.media import BlobMedia
+from ..storage import blob_storage
+
+# Tiempo mínimo sin uso antes de borrar un blob (cubre subidas en curso sin confirmar)
+BLOB_GC_GRACE = timedelta(hours=6)
+# Carpetas (en el storage por defecto) de las versiones generadas por ImageRenditionService
+CARPETAS_VERSIONES = ('ejecuciones/miniaturas', 'ejecuciones/display')
+
+
+class MediaBlobService:
+    """
+    Conteo de referencias de los blobs de ContentAddressedStorage y
+    recolección de los que quedan sin uso
+    """
+
+    @staticmethod
+    def add_reference(nombre):
+        if not blob_storage.is_blob(nombre):
+            return
+        ahora = timezone.now()
+        actualizados = BlobMedia.objects.filter(nombre=nombre).update(
+            referencias=F('referencias') + 1, updated_at=ahora
+        )
+        if actualizados:
+            return
+        try:
+            tamano = blob_storage.size(nombre)
+        except OSError:
+            tamano = None
+        blob, creado = BlobMedia.objects.get_or_create(
+            nombre=nombre, defaults={'referencias': 1, 'tamano': tamano}
+        )
+        if not creado:
+            BlobMedia.objects.filter(pk=blob.pk).update(
+                referencias=F('referencias') + 1, updated_at=ahora
+            )
+
+    @staticmethod
+    def release(nombre):
+        if not blob_storage.is_blob(nombre):
+            return
+        BlobMedia.objects.filter(nombre=nombre, referencias__gt=0).update(
+            referencias=F('referencias') - 1, updated_at=timezone.now()
+        )
+
+    @staticmethod
+    def on_image_saved(imagen, update_fields=None):
+        """Mueve la referencia si cambió el archivo de la imagen"""
+        if update_fields is not None and 'imagen' not in update_fields:
+            return
+        anterior = getattr(imagen, '_imagen_original', None)
+        actual = imagen.imagen.name
+        if anterior == actual:
+            return
+        MediaBlobService.add_reference(actual)
+        MediaBlobService.release(anterior)
+
+    @staticmethod
+    def migrate_legacy(dry_run=False):
+        """
+        Pasa al storage por contenido las imágenes guardadas con la ruta
+        anterior (ejecuciones/%Y/%m/%d/) y borra los archivos duplicados.
+        Retorna la cantidad de imágenes migradas.
+        """
+        pendientes = (
+            ImagenEjecucion.objects
+            .exclude(imagen='')
+            .exclude(imagen__startswith=f"{blob_storage.prefijo}/")
+            .values_list('imagen', flat=True)
+            .distinct()
+        )
+        migradas = 0
+        for anterior in list(pendientes):
+            if dry_run:
+                migradas += 1
+                continue
+            try:
+                with default_storage.open(anterior, 'rb') as archivo:
+                    nombre = blob_storage.save(anterior, archivo)
+            except FileNotFoundError:
+                continue
+            # UPDATE directo: las referencias se recalculan al final con rebuild()
+            migradas += ImagenEjecucion.objects.filter(imagen=anterior).update(imagen=nombre)
+            default_storage.delete(anterior)
+        if not dry_run:
+            MediaBlobService.rebuild()
+        return migradas
+
+    @staticmethod
+    def rebuild():
+        """Recalcula las referencias desde ImagenEjecucion. Retorna la cantidad de blobs referenciados"""
+        conteos = dict(
+            ImagenEjecucion.objects
+            .filter(imagen__startswith=f"{blob_storage.prefijo}/")
+            .values('imagen')
+            .annotate(total=Count('id'))
+            .order_by()
+            .values_list('imagen', 'total')
+        )
+        ahora = timezone.now()
+        with transaction.atomic():
+            BlobMedia.objects.exclude(nombre__in=conteos).update(referencias=0, updated_at=ahora)
+            existentes = dict(BlobMedia.objects.filter(nombre__in=conteos).values_list('nombre', 'id'))
+            blobs = []
+            for nombre, total in conteos.items():
+                blob = BlobMedia(id=existentes.get(nombre), nombre=nombre, referencias=total, updated_at=ahora)
+                if blob.id is None:
+                    try:
+                        blob.tamano = blob_storage.size(nombre)
+                    except OSError:
+                        pass
+                blobs.append(blob)
+            BlobMedia.objects.bulk_update([b for b in blobs if b.id], ['referencias', 'updated_at'], batch_size=1000)
+            BlobMedia.objects.bulk_create([b for b in blobs if not b.id], batch_size=1000)
+        return len(conteos)
+
+    @staticmethod
+    def collect(gracia=BLOB_GC_GRACE, dry_run=False):
+        """
+        Borra los blobs sin referencias, los archivos huérfanos del directorio
+        de blobs (subidas cuya transacción no se confirmó) y las versiones de
+        imágenes que ya no existen, que no se tocaron en el período de gracia. Retorna (archivos eliminados, bytes liberados).
+        """
+        limite = timezone.now() - gracia
+        limite_ts = limite.timestamp()
+        eliminados = liberados = 0
+
+        candidatos = BlobMedia.objects.filter(referencias=0, updated_at__lt=limite).values_list('pk', flat=True)
+        for blob_id in list(candidatos):
+            with transaction.atomic():
+                blob = (
+                    BlobMedia.objects.select_for_update()
+                    .filter(pk=blob_id, referencias=0, updated_at__lt=limite)
+                    .first()
+                )
+                if blob is None:
+                    continue
+                ruta = blob_storage.path(blob.nombre)
+                try:
+                    estado = os.stat(ruta)
+                except FileNotFoundError:
+                    estado = None
+                if estado is not None and estado.st_mtime >= limite_ts:
+                    # Se volvió a subir hace poco: la referencia puede estar por confirmarse
+                    continue
+                if not dry_run:
+                    blob_storage.delete(blob.nombre)
+                    blob.delete()
+                if estado is not None:
+                    eliminados += 1
+                    liberados += estado.st_size
+
+        registrados = set(BlobMedia.objects.values_list('nombre', flat=True))
+        registrados.update(
+            ImagenEjecucion.objects
+            .filter(imagen__startswith=f"{blob_storage.prefijo}/")
+            .values_list('imagen', flat=True)
+        )
+        archivos, tamano = MediaBlobService._sweep(
+            blob_storage, blob_storage.prefijo, registrados, limite_ts, dry_run
+        )
+        eliminados += archivos
+        liberados += tamano
+
+        # Miniaturas y versiones para pantalla de imágenes que ya no existen
+        versiones = set()
+        for miniatura, display in ImagenEjecucion.objects.values_list('miniatura', 'display'):
+            versiones.update((miniatura, display))
+        for carpeta in CARPETAS_VERSIONES:
+            archivos, tamano = MediaBlobService._sweep(
+                default_storage, carpeta, versiones, limite_ts, dry_run
+            )
+            eliminados += archivos
+            liberados += tamano
+        return eliminados, liberados
+
+    @staticmethod
+    def _sweep(storage, carpeta, registrados, limite_ts, dry_run):
+        """Borra los archivos de la carpeta que no están registrados y no se tocaron desde limite_ts"""
+        eliminados = liberados = 0
+        for directorio, _, archivos in os.walk(storage.path(carpeta)):
+            for archivo in archivos:
+                ruta = os.path.join(directorio, archivo)
+                nombre = os.path.relpath(ruta, storage.location).replace(os.sep, '/')
+                if nombre in registrados:
+                    continue
+                estado = os.stat(ruta)
+                if estado.st_mtime >= limite_ts:
+                    continue
+                if not dry_run:
+                    os.unlink(ruta)
+                eliminados += 1
+                liberados += estado.st_size
+        return eliminados, liberados
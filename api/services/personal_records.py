@@ -0,0 +1,199 @@
+from decimal import Decimal
+
+from django.db import IntegrityError, transaction
+
+from ..models.analytics import RecordPersonal
+from ..models.execution import EjecucionEntrenamiento
+
+# Distancia (km) de cada categoría de record por ritmo
+DISTANCIAS_RECORD = {
+    '1k': 1.0,
+    '5k': 5.0,
+    '10k': 10.0,
+    '21k': 21.0975,
+    '42k': 42.195,
+}
+# Margen para distancias medidas por GPS (4.96 km cuenta como 5k)
+TOLERANCIA_DISTANCIA = 0.99
+
+CAMPOS_MARCA = ('id', 'alumno_id', 'tipo_actividad_id', 'distancia_km', 'ritmo_seg_km', 'fecha_hora_ejecucion')
+
+
+def _marcas(valores):
+    """
+    [(categoria, campos)] a las que aspira una ejecución. Una ejecución
+    cuenta para las categorías de distancia menor o igual a la recorrida,
+    con su ritmo promedio.
+    """
+    distancia = valores.get('distancia_km')
+    if valores.get('alumno_id') is None or not distancia:
+        return []
+
+    base = {
+        'ejecucion_id': valores['id'],
+        'distancia_km': distancia,
+        'fecha': valores['fecha_hora_ejecucion'],
+    }
+    marcas = [('distancia', dict(base, ritmo_seg_km=None, tiempo_seg=None))]
+    ritmo = valores.get('ritmo_seg_km')
+    if ritmo:
+        for categoria, km in DISTANCIAS_RECORD.items():
+            if float(distancia) >= km * TOLERANCIA_DISTANCIA:
+                marcas.append((categoria, dict(base, ritmo_seg_km=ritmo, tiempo_seg=round(ritmo * km))))
+    return marcas
+
+
+def _es_mejor(categoria, nueva, actual):
+    if actual is None:
+        return True
+    if categoria == 'distancia':
+        return Decimal(nueva['distancia_km']) > Decimal(actual['distancia_km'])
+    return nueva['ritmo_seg_km'] < actual['ritmo_seg_km']
+
+
+class PersonalRecordService:
+    """
+    Mantenimiento de RecordPersonal. Cada ejecución compite solo contra el
+    record vigente de su (alumno, tipo_actividad, categoría): no se recorre la
+    historia salvo al editar / borrar la ejecución que tiene el record.
+    """
+
+    @staticmethod
+    def _values(ejecucion):
+        return {campo: getattr(ejecucion, campo) for campo in CAMPOS_MARCA}
+
+    @staticmethod
+    def _best(filas):
+        """{(alumno_id, tipo_actividad_id, categoria): campos} con la mejor marca de las filas"""
+        mejores = {}
+        for valores in filas:
+            for categoria, campos in _marcas(valores):
+                clave = (valores['alumno_id'], valores['tipo_actividad_id'], categoria)
+                if _es_mejor(categoria, campos, mejores.get(clave)):
+                    mejores[clave] = campos
+        return mejores
+
+    @staticmethod
+    def _store(clave, campos):
+        """Reemplaza el record si la marca es mejor (comparación y escritura en un UPDATE)"""
+        alumno_id, tipo_actividad_id, categoria = clave
+        filtro = {'alumno_id': alumno_id, 'tipo_actividad_id': tipo_actividad_id, 'categoria': categoria}
+        if categoria == 'distancia':
+            condicion = {'distancia_km__lt': campos['distancia_km']}
+        else:
+            condicion = {'ritmo_seg_km__gt': campos['ritmo_seg_km']}
+
+        if RecordPersonal.objects.filter(**filtro, **condicion).update(**campos):
+            return
+        if RecordPersonal.objects.filter(**filtro).exists():
+            return
+        try:
+            with transaction.atomic():
+                RecordPersonal.objects.create(**filtro, **campos)
+        except IntegrityError:
+            # Otra transacción creó el record en paralelo
+            RecordPersonal.objects.filter(**filtro, **condicion).update(**campos)
+
+    @staticmethod
+    def offer(ejecuciones):
+        """Compara un lote de ejecuciones con los records vigentes"""
+        mejores = PersonalRecordService._best(
+            PersonalRecordService._values(ejecucion) for ejecucion in ejecuciones
+        )
+        if not mejores:
+            return
+
+        vigentes = {
+            (r['alumno_id'], r['tipo_actividad_id'], r['categoria']): r
+            for r in RecordPersonal.objects
+            .filter(alumno_id__in={clave[0] for clave in mejores})
+            .values('alumno_id', 'tipo_actividad_id', 'categoria', 'ritmo_seg_km', 'distancia_km')
+        }
+        for clave, campos in mejores.items():
+            if _es_mejor(clave[2], campos, vigentes.get(clave)):
+                PersonalRecordService._store(clave, campos)
+
+    @staticmethod
+    def recompute(pares):
+        """Recalcula desde las ejecuciones los records de los pares (alumno_id, tipo_actividad_id)"""
+        for alumno_id, tipo_actividad_id in pares:
+            if alumno_id is None:
+                continue
+            filas = (
+                EjecucionEntrenamiento.objects
+                .filter(alumno_id=alumno_id, tipo_actividad_id=tipo_actividad_id, distancia_km__gt=0)
+                .order_by('fecha_hora_ejecucion', 'id')
+                .values(*CAMPOS_MARCA)
+            )
+            mejores = PersonalRecordService._best(filas)
+            with transaction.atomic():
+                RecordPersonal.objects.filter(
+                    alumno_id=alumno_id, tipo_actividad_id=tipo_actividad_id
+                ).delete()
+                RecordPersonal.objects.bulk_create([
+                    RecordPersonal(
+                        alumno_id=clave[0], tipo_actividad_id=clave[1], categoria=clave[2], **campos
+                    )
+                    for clave, campos in mejores.items()
+                ])
+
+    @staticmethod
+    def on_saved(ejecucion, created):
+        if not created:
+            originales = ejecucion.valores_originales or {}
+            anterior = (originales.get('alumno_id'), originales.get('tipo_actividad_id'))
+            actual = (ejecucion.alumno_id, ejecucion.tipo_actividad_id)
+            # Si la ejecución tenía un record, la edición puede empeorarlo
+            if RecordPersonal.objects.filter(ejecucion=ejecucion).exists():
+                PersonalRecordService.recompute({anterior, actual})
+                return
+        PersonalRecordService.offer([ejecucion])
+
+    @staticmethod
+    def on_deleted(ejecucion):
+        # Los records de la ejecución se borran en cascada: se busca el siguiente mejor
+        originales = ejecucion.valores_originales or {}
+        PersonalRecordService.recompute({(
+            originales.get('alumno_id', ejecucion.alumno_id),
+            originales.get('tipo_actividad_id', ejecucion.tipo_actividad_id),
+        )})
+
+    @staticmethod
+    def add_executions(ejecuciones):
+        PersonalRecordService.offer(ejecuciones)
+
+    @staticmethod
+    def rebuild(alumno_ids=None):
+        """
+        Recalcula todos los records en una pasada sobre las ejecuciones.
+        Retorna la cantidad de records generados.
+        """
+        ejecuciones = EjecucionEntrenamiento.objects.filter(alumno__isnull=False, distancia_km__gt=0)
+        records = RecordPersonal.objects.all()
+        if alumno_ids is not None:
+            ejecuciones = ejecuciones.filter(alumno_id__in=alumno_ids)
+            records = records.filter(alumno_id__in=alumno_ids)
+
+        mejores = PersonalRecordService._best(
+            ejecuciones
+            .order_by('fecha_hora_ejecucion', 'id')
+            .values(*CAMPOS_MARCA)
+            .iterator(chunk_size=2000)
+        )
+        with transaction.atomic():
+            records.delete()
+            creados = RecordPersonal.objects.bulk_create([
+                RecordPersonal(
+                    alumno_id=clave[0], tipo_actividad_id=clave[1], categoria=clave[2], **campos
+                )
+                for clave, campos in mejores.items()
+            ], batch_size=2000)
+        return len(creados)
+
+    @staticmethod
+    def records(alumno_id, tipo_actividad_id=None):
+        """Records vigentes del alumno (índice único alumno + tipo + categoría)"""
+        records = RecordPersonal.objects.filter(alumno_id=alumno_id)
+        if tipo_actividad_id is not None:
+            records = records.filter(tipo_actividad_id=tipo_actividad_id)
+        return records
@@ -0,0 +1,181 @@
+from datetime import timedelta
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+
+from ..models.user_profiles import Alumno
+from ..models.training_plan import DiaPlantilla
+from ..models.plan_assignment import AsignacionPlan, DiaAsignado
+
+# Índice ISO (lunes = 0) de cada valor de DiaPlantilla.dia_semana
+DIA_SEMANA_INDICE = {
+    clave: indice for indice, (clave, _) in enumerate(DiaPlantilla.DIAS_SEMANA)
+}
+
+# Filas por INSERT al materializar días de muchas asignaciones a la vez
+COHORT_BATCH_SIZE = 5000
+
+
+class PlanAssignmentService:
+    @staticmethod
+    def expand_template(plan):
+        """
+        Recorre Plan -> Semana -> DiaPlantilla en una sola consulta y devuelve
+        una lista de tuplas (numero_semana, indice_dia, dia_plantilla).
+
+        El resultado no depende de la fecha de inicio, por lo que puede
+        reutilizarse para materializar varias asignaciones del mismo plan.
+        Si una semana tiene más de un día plantilla para el mismo día de la
+        semana, se conserva el de menor orden (la fecha es única por asignación).
+        """
+        plan_id = getattr(plan, 'pk', plan)
+        return PlanAssignmentService.expand_templates([plan_id])[plan_id]
+
+    @staticmethod
+    def expand_templates(plan_ids, related=()):
+        """
+        Igual que expand_template() pero para varios planes en una sola
+        consulta. related son relaciones extra de DiaPlantilla a precargar
+        con select_related (por ejemplo 'rutina__tipo_actividad').
+        Retorna un diccionario {plan_id: plantilla}.
+        """
+        plantillas = {plan_id: [] for plan_id in plan_ids}
+        dias = (
+            DiaPlantilla.objects
+            .filter(semana__plan_id__in=plantillas.keys())
+            .select_related('semana', *related)
+            .order_by('semana__plan_id', 'semana__numero_semana', 'orden', 'id')
+        )
+
+        vistos = set()
+        for dia in dias:
+            clave = (dia.semana.plan_id, dia.semana.numero_semana, DIA_SEMANA_INDICE[dia.dia_semana])
+            if clave in vistos:
+                continue
+            vistos.add(clave)
+            plantillas[clave[0]].append((clave[1], clave[2], dia))
+        return plantillas
+
+    @staticmethod
+    def date_for(fecha_inicio, numero_semana, indice_dia):
+        """
+        Fecha concreta de un día plantilla. La semana 1 son los 7 días que
+        empiezan en fecha_inicio, aunque no sea lunes.
+        """
+        desplazamiento = (numero_semana - 1) * 7 + (indice_dia - fecha_inicio.weekday()) % 7
+        return fecha_inicio + timedelta(days=desplazamiento)
+
+    @staticmethod
+    def build_days(asignacion, plantilla):
+        """
+        Construye (sin guardar) los DiaAsignado de una asignación a partir de
+        una plantilla ya expandida con expand_template().
+        """
+        dias = []
+        for numero_semana, indice_dia, dia_plantilla in plantilla:
+            fecha = PlanAssignmentService.date_for(asignacion.fecha_inicio, numero_semana, indice_dia)
+            if asignacion.fecha_fin and fecha > asignacion.fecha_fin:
+                continue
+            dias.append(DiaAsignado(
+                asignacion_plan=asignacion,
+                dia_plantilla=dia_plantilla,
+                fecha_especifica=fecha,
+                dia_semana=dia_plantilla.dia_semana,
+            ))
+        return dias
+
+    @staticmethod
+    def generate_days(asignacion, plantilla=None):
+        """
+        Materializa todos los DiaAsignado de la asignación con un único bulk_create.
+        Las asignaciones en modo virtual no materializan días.
+        """
+        if asignacion.es_virtual:
+            return []
+        if plantilla is None:
+            plantilla = PlanAssignmentService.expand_template(asignacion.plan_id)
+        dias = PlanAssignmentService.build_days(asignacion, plantilla)
+        return DiaAsignado.objects.bulk_create(dias)
+
+    @staticmethod
+    def default_end_date(plan, fecha_inicio):
+        """Último día del plan según su duración en semanas"""
+        return fecha_inicio + timedelta(days=plan.duracion_semanas * 7 - 1)
+
+    @staticmethod
+    def assign_plan(plan, alumno, fecha_inicio, fecha_fin=None, modo_calendario='materializado'):
+        """
+        Crea la asignación y todos sus días en una transacción atómica.
+        """
+        if fecha_fin is None:
+            fecha_fin = PlanAssignmentService.default_end_date(plan, fecha_inicio)
+
+        with transaction.atomic():
+            asignacion = AsignacionPlan(
+                plan=plan,
+                alumno=alumno,
+                fecha_inicio=fecha_inicio,
+                fecha_fin=fecha_fin,
+                modo_calendario=modo_calendario,
+            )
+            asignacion.clean()
+            asignacion.save()
+            PlanAssignmentService.generate_days(asignacion)
+        return asignacion
+
+    @staticmethod
+    def assign_cohort(plan, alumno_ids, fecha_inicio, fecha_fin=None, modo_calendario='materializado'):
+        """
+        Asigna el mismo plan a un grupo de alumnos con sentencias por lotes.
+
+        La plantilla se expande una única vez y se reutiliza para todos los
+        alumnos. Los alumnos inválidos se reportan en la lista de errores sin
+        abortar el resto del lote.
+        Retorna (asignaciones_creadas, errores).
+        """
+        if fecha_fin is None:
+            fecha_fin = PlanAssignmentService.default_end_date(plan, fecha_inicio)
+        if fecha_fin < fecha_inicio:
+            raise ValidationError('La fecha de fin debe ser posterior a la fecha de inicio')
+
+        alumno_ids = list(dict.fromkeys(alumno_ids))
+        alumnos = Alumno.objects.in_bulk(alumno_ids)
+        ya_asignados = set(
+            AsignacionPlan.objects
+            .filter(plan=plan, alumno_id__in=alumno_ids, estado='activo')
+            .values_list('alumno_id', flat=True)
+        )
+
+        errores = []
+        nuevas = []
+        for alumno_id in alumno_ids:
+            alumno = alumnos.get(alumno_id)
+            if alumno is None:
+                errores.append({'alumno_id': alumno_id, 'error': 'Alumno no encontrado.'})
+            elif alumno.entrenador_id != plan.entrenador_id:
+                errores.append({'alumno_id': alumno_id, 'error': 'El alumno no pertenece al entrenador del plan.'})
+            elif alumno_id in ya_asignados:
+                errores.append({'alumno_id': alumno_id, 'error': 'El alumno ya tiene este plan activo.'})
+            else:
+                nuevas.append(AsignacionPlan(
+                    plan=plan,
+                    alumno=alumno,
+                    fecha_inicio=fecha_inicio,
+                    fecha_fin=fecha_fin,
+                    modo_calendario=modo_calendario,
+                ))
+
+        if not nuevas:
+            return [], errores
+
+        with transaction.atomic():
+            asignaciones = AsignacionPlan.objects.bulk_create(nuevas)
+            if modo_calendario == 'virtual':
+                return asignaciones, errores
+
+            plantilla = PlanAssignmentService.expand_template(plan)
+            dias = []
+            for asignacion in asignaciones:
+                dias.extend(PlanAssignmentService.build_days(asignacion, plantilla))
+            DiaAsignado.objects.bulk_create(dias, batch_size=COHORT_BATCH_SIZE)
+        return asignaciones, errores
@@ -0,0 +1,137 @@
+from django.db import transaction
+
+from ..models.activity_types import TipoActividad, TipoRutina
+from ..models.routine import Rutina
+from ..models.training_plan import PlanEntrenamiento, Semana, DiaPlantilla
+from .catalog import CatalogService
+
+
+class PlanCloneService:
+    @staticmethod
+    def clone_plan(plan, entrenador=None, nombre=None, is_template=None):
+        """
+        Copia profunda de un plan (Semana y DiaPlantilla incluidos) con un
+        bulk_create por nivel, remapeando las FKs en memoria.
+
+        Si el destino es otro entrenador, los tipos personalizados del
+        entrenador de origen se mapean por nombre a los del destino (creándolos
+        si no existen) y las rutinas se copian a la cuenta del destino. Los
+        tipos globales se reutilizan tal cual.
+        """
+        if entrenador is None:
+            entrenador = plan.entrenador
+
+        semanas = list(plan.semanas.order_by('numero_semana'))
+        dias = list(
+            DiaPlantilla.objects
+            .filter(semana__plan=plan)
+            .select_related('rutina')
+            .order_by('semana_id', 'orden', 'id')
+        )
+
+        with transaction.atomic():
+            if entrenador.pk == plan.entrenador_id:
+                tipo_actividad_id = plan.tipo_actividad_id
+                rutinas = {}
+            else:
+                tipo_actividad_id, rutinas = PlanCloneService._map_to_coach(plan, dias, entrenador)
+
+            nuevo_plan = PlanEntrenamiento.objects.create(
+                entrenador=entrenador,
+                tipo_actividad_id=tipo_actividad_id,
+                nombre=nombre or plan.nombre,
+                descripcion=plan.descripcion,
+                duracion_semanas=plan.duracion_semanas,
+                is_template=plan.is_template if is_template is None else is_template,
+            )
+
+            nuevas_semanas = Semana.objects.bulk_create([
+                Semana(
+                    plan=nuevo_plan,
+                    numero_semana=semana.numero_semana,
+                    nombre=semana.nombre,
+                    descripcion=semana.descripcion,
+                )
+                for semana in semanas
+            ])
+            semana_map = {
+                original.pk: nueva.pk for original, nueva in zip(semanas, nuevas_semanas)
+            }
+
+            DiaPlantilla.objects.bulk_create([
+                DiaPlantilla(
+                    semana_id=semana_map[dia.semana_id],
+                    rutina_id=rutinas.get(dia.rutina_id, dia.rutina_id),
+                    dia_semana=dia.dia_semana,
+                    orden=dia.orden,
+                    notas=dia.notas,
+                )
+                for dia in dias
+            ])
+        return nuevo_plan
+
+    @staticmethod
+    def _map_to_coach(plan, dias, entrenador):
+        """
+        Prepara en el entrenador destino los tipos y rutinas que usa el plan.
+        Retorna (tipo_actividad_id del plan, {rutina_id_origen: rutina_id_destino}).
+        """
+        rutinas_origen = {dia.rutina.pk: dia.rutina for dia in dias if dia.rutina is not None}
+
+        tipos_actividad = PlanCloneService._map_types(
+            TipoActividad,
+            {plan.tipo_actividad_id} | {r.tipo_actividad_id for r in rutinas_origen.values()},
+            entrenador
+        )
+        tipos_rutina = PlanCloneService._map_types(
+            TipoRutina,
+            {r.tipo_rutina_id for r in rutinas_origen.values() if r.tipo_rutina_id},
+            entrenador
+        )
+
+        originales = list(rutinas_origen.values())
+        copias = Rutina.objects.bulk_create([
+            Rutina(
+                entrenador=entrenador,
+                tipo_actividad_id=tipos_actividad[rutina.tipo_actividad_id],
+                tipo_rutina_id=tipos_rutina.get(rutina.tipo_rutina_id),
+                nombre=rutina.nombre,
+                descripcion=rutina.descripcion,
+                detalles=rutina.detalles,
+            )
+            for rutina in originales
+        ])
+        rutinas = {original.pk: copia.pk for original, copia in zip(originales, copias)}
+        return tipos_actividad[plan.tipo_actividad_id], rutinas
+
+    @staticmethod
+    def _map_types(modelo, tipo_ids, entrenador):
+        """
+        {id_origen: id_destino} para TipoActividad / TipoRutina. Los globales se
+        conservan; los personalizados se buscan por nombre en el destino y se
+        crean los que falten.
+        """
+        tipos = list(modelo.objects.filter(pk__in=tipo_ids))
+        mapa = {tipo.pk: tipo.pk for tipo in tipos if tipo.es_global}
+
+        personalizados = [tipo for tipo in tipos if not tipo.es_global]
+        if not personalizados:
+            return mapa
+
+        existentes = dict(
+            modelo.objects
+            .filter(entrenador=entrenador, nombre__in=[tipo.nombre for tipo in personalizados])
+            .values_list('nombre', 'id')
+        )
+        faltantes = [tipo for tipo in personalizados if tipo.nombre not in existentes]
+        creados = modelo.objects.bulk_create([
+            modelo(entrenador=entrenador, nombre=tipo.nombre, descripcion=tipo.descripcion)
+            for tipo in faltantes
+        ])
+        existentes.update({tipo.nombre: tipo.pk for tipo in creados})
+        if creados:
+            # bulk_create no dispara post_save
+            CatalogService.changed(modelo, [entrenador.pk])
+
+        mapa.update({tipo.pk: existentes[tipo.nombre] for tipo in personalizados})
+        return mapa
@@ -0,0 +1,160 @@
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import partial
+
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from ..models.plan_assignment import AsignacionPlan, DiaAsignado
+from ..models.execution import EjecucionEntrenamiento
+from .plan_assignment import PlanAssignmentService, COHORT_BATCH_SIZE
+
+# Planes a sincronizar del bloque PlanSyncService.batch() en curso (None fuera de un bloque)
+_planes_en_lote = ContextVar('planes_en_lote', default=None)
+
+
+class PlanSyncService:
+    @staticmethod
+    def sync_on_commit(plan_id):
+        """
+        Sincroniza el plan cuando se confirme la transacción actual. Dentro
+        de batch() solo se anota y se encola una vez al salir del bloque.
+        """
+        pendientes = _planes_en_lote.get()
+        if pendientes is not None:
+            pendientes.add(plan_id)
+        else:
+            transaction.on_commit(lambda: PlanSyncService.sync_plan(plan_id))
+
+    @staticmethod
+    @contextmanager
+    def batch():
+        """
+        Agrupa las sincronizaciones pedidas en el bloque (p. ej. por las
+        señales de cada DiaPlantilla de un formulario) en una por plan,
+        encolada al commit al salir. Si el bloque termina con una excepción
+        no se encola nada; un batch() anidado usa el del bloque exterior.
+        """
+        if _planes_en_lote.get() is not None:
+            yield
+            return
+        token = _planes_en_lote.set(set())
+        try:
+            yield
+            plan_ids = _planes_en_lote.get()
+        finally:
+            _planes_en_lote.reset(token)
+        for plan_id in sorted(plan_ids):
+            transaction.on_commit(partial(PlanSyncService.sync_plan, plan_id))
+
+    @staticmethod
+    def sync_plan(plan, desde=None):
+        """
+        Propaga los cambios de la plantilla (Semana / DiaPlantilla) a los días
+        futuros ya generados de todas las asignaciones activas del plan.
+
+        Solo se tocan días desde la fecha indicada (por defecto hoy) que no
+        estén completados ni tengan ejecuciones; el historial nunca se reprocesa.
+        Los cambios se aplican con sentencias por lotes:
+        - UPDATE ... WHERE id IN (...) por cada día plantilla de destino
+        - DELETE ... WHERE id IN (...) de los días que ya no existen en la plantilla
+        - bulk_create de los días nuevos
+
+        Retorna un diccionario con la cantidad de filas actualizadas, creadas y eliminadas.
+        """
+        plan_id = getattr(plan, 'pk', plan)
+        if desde is None:
+            desde = timezone.localdate()
+
+        resultado = {'actualizados': 0, 'creados': 0, 'eliminados': 0}
+
+        asignaciones = list(
+            AsignacionPlan.objects
+            .filter(plan_id=plan_id, estado='activo', modo_calendario='materializado')
+            .exclude(fecha_fin__lt=desde)
+            .only('id', 'plan_id', 'fecha_inicio', 'fecha_fin')
+        )
+        if not asignaciones:
+            return resultado
+
+        plantilla = PlanAssignmentService.expand_template(plan_id)
+
+        existentes = (
+            DiaAsignado.objects
+            .filter(asignacion_plan__in=asignaciones, fecha_especifica__gte=desde)
+            .annotate(tiene_ejecuciones=Exists(
+                EjecucionEntrenamiento.objects.filter(dia_asignado=OuterRef('pk'))
+            ))
+            .values_list(
+                'id', 'asignacion_plan_id', 'fecha_especifica',
+                'dia_plantilla_id', 'completado', 'tiene_ejecuciones'
+            )
+        )
+        por_asignacion = defaultdict(dict)
+        for dia_id, asignacion_id, fecha, dia_plantilla_id, completado, tiene_ejecuciones in existentes:
+            por_asignacion[asignacion_id][fecha] = (
+                dia_id, dia_plantilla_id, completado or tiene_ejecuciones
+            )
+
+        actualizar = defaultdict(list)
+        eliminar = []
+        crear = []
+        for asignacion in asignaciones:
+            esperados = {
+                dia.fecha_especifica: dia
+                for dia in PlanAssignmentService.build_days(asignacion, plantilla)
+                if dia.fecha_especifica >= desde
+            }
+            actuales = por_asignacion.get(asignacion.id, {})
+
+            for fecha, (dia_id, dia_plantilla_id, historico) in actuales.items():
+                if historico:
+                    continue
+                esperado = esperados.get(fecha)
+                if esperado is None:
+                    eliminar.append(dia_id)
+                elif esperado.dia_plantilla_id != dia_plantilla_id:
+                    destino = (esperado.dia_plantilla_id, esperado.dia_semana)
+                    actualizar[destino].append(dia_id)
+
+            crear.extend(dia for fecha, dia in esperados.items() if fecha not in actuales)
+
+        with transaction.atomic():
+            for (dia_plantilla_id, dia_semana), ids in actualizar.items():
+                resultado['actualizados'] += DiaAsignado.objects.filter(pk__in=ids).update(
+                    dia_plantilla_id=dia_plantilla_id,
+                    dia_semana=dia_semana,
+                    updated_at=timezone.now()
+                )
+            if eliminar:
+                resultado['eliminados'], _ = DiaAsignado.objects.filter(pk__in=eliminar).delete()
+            if crear:
+                resultado['creados'] = len(
+                    DiaAsignado.objects.bulk_create(crear, batch_size=COHORT_BATCH_SIZE)
+                )
+        return resultado
+
+    @staticmethod
+    def delete_template_day(dia_plantilla, desde=None):
+        """
+        Elimina un día plantilla quitando antes sus días asignados futuros
+        sin ejecuciones. Si el día tiene historial (días pasados o completados)
+        la eliminación falla con ProtectedError y no se modifica nada. El resto
+        del plan se sincroniza al commit (ver api.signals).
+
+        Retorna la cantidad de días asignados eliminados.
+        """
+        if desde is None:
+            desde = timezone.localdate()
+
+        with PlanSyncService.batch(), transaction.atomic():
+            eliminados, _ = DiaAsignado.objects.filter(
+                dia_plantilla=dia_plantilla,
+                fecha_especifica__gte=desde,
+                completado=False,
+                ejecuciones__isnull=True
+            ).delete()
+            dia_plantilla.delete()
+        return eliminados
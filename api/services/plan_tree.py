@@ -0,0 +1,98 @@
+from django.core.cache import cache
+from django.db.models import Prefetch
+
+from ..models.training_plan import PlanEntrenamiento, Semana, DiaPlantilla
+from ..serializers.training_plan import PlanTreeSerializer
+from .cache_versions import current_version, bump_version
+
+# Las entradas viejas no se borran: dejan de leerse al cambiar la versión y expiran solas
+PLAN_TREE_CACHE_TTL = 60 * 60 * 24
+
+HITS_KEY = 'plan_tree:hits'
+MISSES_KEY = 'plan_tree:misses'
+
+
+def _incr(clave, delta=1):
+    cache.add(clave, 0, timeout=None)
+    try:
+        return cache.incr(clave, delta)
+    except ValueError:
+        # La clave fue desalojada entre add() e incr()
+        cache.set(clave, delta, timeout=None)
+        return delta
+
+
+class PlanTreeService:
+    """
+    Caché del árbol serializado de un plan, versionado por un contador por plan.
+
+    Cada escritura en PlanEntrenamiento, Semana, DiaPlantilla o Rutina
+    incrementa la versión (ver api.signals), así que los lectores nunca
+    reconstruyen el árbol mientras la entrada de la versión actual esté en caché.
+    El contador se siembra con el reloj (ver cache_versions): si se pierde,
+    la versión nueva no coincide con la de ningún árbol cacheado antes.
+    """
+
+    @staticmethod
+    def version_key(plan_id):
+        return f"plan_tree:version:{plan_id}"
+
+    @staticmethod
+    def tree_key(plan_id, version):
+        return f"plan_tree:{plan_id}:v{version}"
+
+    @staticmethod
+    def current_version(plan_id):
+        return current_version(PlanTreeService.version_key(plan_id))
+
+    @staticmethod
+    def bump(*plan_ids):
+        """Invalida el árbol cacheado de los planes indicados"""
+        for plan_id in plan_ids:
+            bump_version(PlanTreeService.version_key(plan_id))
+
+    @staticmethod
+    def queryset():
+        return (
+            PlanEntrenamiento.objects
+            .prefetch_related(Prefetch(
+                'semanas',
+                queryset=Semana.objects.order_by('numero_semana').prefetch_related(Prefetch(
+                    'dias_plantilla',
+                    queryset=DiaPlantilla.objects.select_related('rutina').order_by('orden', 'id')
+                ))
+            ))
+        )
+
+    @staticmethod
+    def get_tree(plan_id):
+        """
+        Árbol serializado del plan. Retorna None si el plan no existe.
+        """
+        version = PlanTreeService.current_version(plan_id)
+        clave = PlanTreeService.tree_key(plan_id, version)
+
+        arbol = cache.get(clave)
+        if arbol is not None:
+            _incr(HITS_KEY)
+            return arbol
+
+        _incr(MISSES_KEY)
+        plan = PlanTreeService.queryset().filter(pk=plan_id).first()
+        if plan is None:
+            return None
+
+        arbol = PlanTreeSerializer(plan).data
+        cache.set(clave, arbol, PLAN_TREE_CACHE_TTL)
+        return arbol
+
+    @staticmethod
+    def stats():
+        hits = cache.get(HITS_KEY, 0)
+        misses = cache.get(MISSES_KEY, 0)
+        total = hits + misses
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_ratio': round(hits / total, 4) if total else None,
+        }
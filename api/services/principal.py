@@ -0,0 +1,153 @@
+import copy
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db.models import Case, CharField, Exists, OuterRef, Value, When
+
+from ..models.user_profiles import Entrenador, Alumno
+
+# Atributo con el rol ('coach' / 'student' / None) en usuarios anotados
+ROLE_ATTR = 'rol'
+
+PRINCIPAL_CACHE_PREFIX = 'principal:'
+# Campos del usuario del entrenador que se cachean con el perfil del alumno
+CAMPOS_USUARIO_ENTRENADOR = ('id', 'username', 'first_name', 'last_name', 'email')
+
+
+def principal_queryset():
+    """Usuario con su perfil y, para alumnos, su entrenador, en un solo SELECT con JOINs"""
+    return User.objects.select_related('entrenador', 'alumno__entrenador__user')
+
+
+def role_expression():
+    """Rol del usuario calculado en el mismo SELECT (dos EXISTS sobre los perfiles)"""
+    return Case(
+        When(Exists(Entrenador.objects.filter(user_id=OuterRef('pk'))), then=Value('coach')),
+        When(Exists(Alumno.objects.filter(user_id=OuterRef('pk'))), then=Value('student')),
+        default=Value(None),
+        output_field=CharField(),
+    )
+
+
+class PrincipalService:
+    """
+    Resolución del rol de los usuarios sin consultas perezosas por
+    usuario: los listados se anotan con with_role() y un usuario suelto
+    resuelve su rol una vez y lo guarda en la instancia, que vive lo que
+    dura la petición.
+
+    El usuario autenticado (principal) se carga con su perfil en una
+    consulta. Solo los perfiles se guardan en cache PRINCIPAL_CACHE_TTL
+    segundos (las escrituras en User / Entrenador / Alumno los invalidan,
+    ver api.signals): el usuario, con su password e is_active, se lee
+    siempre de la base, así que una baja o un cambio de contraseña rigen
+    desde la petición siguiente.
+    """
+
+    @staticmethod
+    def cache_key(user_id):
+        return f"{PRINCIPAL_CACHE_PREFIX}{user_id}"
+
+    @staticmethod
+    def load(user_id):
+        """
+        Usuario con perfil precargado y rol resuelto: con los perfiles en
+        cache, una consulta por PK al usuario; sin ellos, una consulta con JOINs.
+        """
+        clave = PrincipalService.cache_key(user_id)
+        perfiles = cache.get(clave)
+        if perfiles is not None:
+            user = User.objects.filter(pk=user_id).first()
+            if user is None:
+                return None
+            PrincipalService._attach(user, perfiles)
+        else:
+            user = principal_queryset().filter(pk=user_id).first()
+            if user is None:
+                return None
+            cache.set(clave, PrincipalService._profiles(user), getattr(settings, 'PRINCIPAL_CACHE_TTL', 300))
+        PrincipalService.role(user)
+        return user
+
+    @staticmethod
+    def _profiles(user):
+        """
+        Copia de los perfiles cargados por principal_queryset() para la cache,
+        sin el usuario (ni su hash de contraseña). Del entrenador de un alumno
+        se guardan solo los datos de CAMPOS_USUARIO_ENTRENADOR.
+        """
+        cargados = user._state.fields_cache
+        entrenador = cargados.get('entrenador')
+        alumno = cargados.get('alumno')
+        if entrenador is not None:
+            entrenador = copy.copy(entrenador)
+            entrenador._state.fields_cache.pop('user', None)
+        if alumno is not None:
+            alumno = copy.copy(alumno)
+            alumno._state.fields_cache.pop('user', None)
+            entrenador_alumno = copy.copy(alumno.entrenador)
+            usuario = entrenador_alumno.user
+            entrenador_alumno._state.fields_cache['user'] = User.from_db(
+                usuario._state.db,
+                CAMPOS_USUARIO_ENTRENADOR,
+                [getattr(usuario, campo) for campo in CAMPOS_USUARIO_ENTRENADOR]
+            )
+            alumno._state.fields_cache['entrenador'] = entrenador_alumno
+        return {'entrenador': entrenador, 'alumno': alumno}
+
+    @staticmethod
+    def _attach(user, perfiles):
+        """Asocia al usuario recién leído los perfiles cacheados (sin consultas al usarlos)"""
+        for relacion, perfil in perfiles.items():
+            user._state.fields_cache[relacion] = perfil
+            if perfil is not None:
+                perfil._state.fields_cache['user'] = user
+
+    @staticmethod
+    def invalidate(user_ids):
+        """
+        Invalida los principales de los usuarios y de los alumnos de los que
+        sean entrenadores (su principal incluye al entrenador)
+        """
+        user_ids = set(user_ids)
+        if not user_ids:
+            return
+        user_ids.update(
+            Alumno.objects.filter(entrenador__user_id__in=user_ids).values_list('user_id', flat=True)
+        )
+        cache.delete_many([PrincipalService.cache_key(user_id) for user_id in user_ids])
+
+    @staticmethod
+    def with_role(queryset=None):
+        if queryset is None:
+            queryset = User.objects.all()
+        return queryset.annotate(**{ROLE_ATTR: role_expression()})
+
+    @staticmethod
+    def role(user):
+        """
+        Rol del usuario. Sin consultas si viene anotado o con el perfil ya
+        cargado (select_related / acceso previo); si no, una sola consulta.
+        """
+        if user is None or user.pk is None:
+            return None
+        if hasattr(user, ROLE_ATTR):
+            return getattr(user, ROLE_ATTR)
+
+        cargados = user._state.fields_cache
+        if cargados.get('entrenador') is not None:
+            rol = 'coach'
+        elif cargados.get('alumno') is not None:
+            rol = 'student'
+        elif 'entrenador' in cargados and 'alumno' in cargados:
+            # Ambos perfiles consultados y ausentes
+            rol = None
+        else:
+            rol = (
+                PrincipalService.with_role(User.objects.filter(pk=user.pk))
+                .values_list(ROLE_ATTR, flat=True)
+                .first()
+            )
+        setattr(user, ROLE_ATTR, rol)
+        return rol
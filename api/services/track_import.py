@@ -0,0 +1,220 @@
+from datetime import datetime, timezone as dt_timezone
+from decimal import Decimal
+from xml.etree.ElementTree import iterparse, ParseError
+
+import numpy as np
+from django.db import transaction
+
+from .execution_ingest import ExecutionIngestService
+from .execution_samples import ExecutionSamplesService
+
+EARTH_RADIUS_M = 6371008.8
+
+# Por debajo de esta velocidad (m/s) el alumno se considera detenido
+MOVING_SPEED_MIN = 0.5
+# Huecos entre puntos más largos que esto (pausa del reloj) no cuentan como movimiento
+MOVING_MAX_GAP_SEG = 30
+
+# Nombre local del elemento -> dato del punto (GPX 1.1 + TrackPointExtension, TCX v2)
+PUNTO_GPX = 'trkpt'
+PUNTO_TCX = 'Trackpoint'
+CONTENEDORES = {'trkseg', 'Track'}
+CAMPOS_PUNTO = {
+    'time': 'tiempo',
+    'Time': 'tiempo',
+    'LatitudeDegrees': 'lat',
+    'LongitudeDegrees': 'lon',
+    'hr': 'pulsaciones',
+    'Value': 'pulsaciones',  # HeartRateBpm/Value en TCX
+    'DistanceMeters': 'distancia',
+    'ele': 'altitud',
+    'AltitudeMeters': 'altitud',
+}
+
+
+def _nombre_local(tag):
+    return tag.rpartition('}')[2]
+
+
+def _a_float(texto):
+    try:
+        return float(texto)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def _epoch_segundos(tiempos):
+    """Convierte los ISO 8601 a segundos epoch; en bloque con NumPy si vienen en UTC ('Z')"""
+    if all(tiempo.endswith('Z') for tiempo in tiempos):
+        return np.array([tiempo[:-1] for tiempo in tiempos], dtype='datetime64[ms]').astype(np.float64) / 1000
+    return np.array([
+        datetime.fromisoformat(tiempo).astimezone(dt_timezone.utc).timestamp() for tiempo in tiempos
+    ])
+
+
+class TrackImportService:
+    """
+    Importación de tracks GPX / TCX exportados por relojes GPS.
+
+    El XML se lee en streaming con iterparse, liberando cada punto apenas se
+    procesa, y las métricas se calculan con operaciones vectorizadas de NumPy
+    sobre todos los puntos.
+    """
+
+    @staticmethod
+    def parse(archivo):
+        """
+        Lee los puntos del track. Retorna un diccionario de arrays NumPy
+        alineados: 'tiempo' (segundos epoch), 'lat', 'lon', 'pulsaciones',
+        'distancia' (acumulada, solo TCX) y 'altitud'; NaN donde falta el dato.
+        Lanza ValueError si el archivo no es un track válido.
+        """
+        if hasattr(archivo, 'seek'):
+            archivo.seek(0)
+
+        tiempos = []
+        columnas = {'lat': [], 'lon': [], 'pulsaciones': [], 'distancia': [], 'altitud': []}
+        # Cache de tag completo ({namespace}nombre) -> rol del elemento
+        roles = {}
+        punto = {}
+        contenedor = None
+        try:
+            for evento, elem in iterparse(archivo, events=('start', 'end')):
+                rol = roles.get(elem.tag)
+                if rol is None:
+                    rol = roles[elem.tag] = TrackImportService._rol(elem.tag)
+
+                if evento == 'start':
+                    if rol == 'contenedor':
+                        contenedor = elem
+                    elif rol == 'punto':
+                        # Descarta datos fuera de un punto (p. ej. <metadata><time>)
+                        punto = {}
+                elif rol == 'punto':
+                    if elem.get('lat') is not None:
+                        punto['lat'] = elem.get('lat')
+                        punto['lon'] = elem.get('lon')
+                    if punto.get('tiempo'):
+                        tiempos.append(punto['tiempo'].strip())
+                        for campo, valores in columnas.items():
+                            valores.append(_a_float(punto.get(campo)))
+                    # Solo se conserva el punto actual en memoria
+                    elem.clear()
+                    if contenedor is not None:
+                        del contenedor[:]
+                elif rol != 'otro':
+                    punto[rol] = elem.text
+        except ParseError as e:
+            raise ValueError(f"El archivo no es un XML válido: {e}")
+
+        if len(tiempos) < 2:
+            raise ValueError("El track no tiene puntos con fecha y hora.")
+
+        try:
+            track = {'tiempo': _epoch_segundos(tiempos)}
+        except ValueError:
+            raise ValueError("El track tiene fechas con formato inválido.")
+        track.update({campo: np.array(valores, dtype=np.float64) for campo, valores in columnas.items()})
+
+        # Algunos relojes exportan los puntos fuera de orden
+        if np.any(np.diff(track['tiempo']) < 0):
+            orden = np.argsort(track['tiempo'], kind='stable')
+            track = {campo: valores[orden] for campo, valores in track.items()}
+        return track
+
+    @staticmethod
+    def _rol(tag):
+        nombre = _nombre_local(tag)
+        if nombre in (PUNTO_GPX, PUNTO_TCX):
+            return 'punto'
+        if nombre in CONTENEDORES:
+            return 'contenedor'
+        return CAMPOS_PUNTO.get(nombre, 'otro')
+
+    @staticmethod
+    def segment_distances(track):
+        """Distancia en metros entre puntos consecutivos (haversine; DistanceMeters si no hay GPS)"""
+        lat = np.radians(track['lat'])
+        lon = np.radians(track['lon'])
+        dlat = np.diff(lat)
+        dlon = np.diff(lon)
+        a = np.sin(dlat / 2) ** 2 + np.cos(lat[:-1]) * np.cos(lat[1:]) * np.sin(dlon / 2) ** 2
+        distancias = 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.clip(a, 0, 1)))
+
+        sin_gps = np.isnan(distancias)
+        if sin_gps.any():
+            acumulada = np.diff(track['distancia'])
+            reemplazo = sin_gps & ~np.isnan(acumulada)
+            distancias[reemplazo] = np.maximum(acumulada[reemplazo], 0)
+        return np.nan_to_num(distancias, nan=0.0)
+
+    @staticmethod
+    def metrics(track, distancias=None):
+        """
+        Métricas de la ejecución a partir del track: inicio, distancia total,
+        tiempo en movimiento, ritmo sobre el tiempo en movimiento y
+        pulsaciones promedio / máxima.
+        """
+        if distancias is None:
+            distancias = TrackImportService.segment_distances(track)
+        intervalos = np.diff(track['tiempo'])
+        velocidades = np.divide(
+            distancias, intervalos, out=np.zeros_like(distancias), where=intervalos > 0
+        )
+        en_movimiento = (
+            (intervalos > 0)
+            & (intervalos <= MOVING_MAX_GAP_SEG)
+            & (velocidades >= MOVING_SPEED_MIN)
+        )
+
+        distancia_m = float(distancias.sum())
+        movimiento_seg = float(intervalos[en_movimiento].sum())
+
+        pulsaciones = track['pulsaciones']
+        pulsaciones = pulsaciones[(pulsaciones >= 30) & (pulsaciones <= 250)]
+
+        ritmo = ''
+        if distancia_m >= 10 and movimiento_seg > 0:
+            seg_km = int(round(movimiento_seg / (distancia_m / 1000)))
+            if seg_km < 100 * 60:
+                ritmo = f"{seg_km // 60}:{seg_km % 60:02d}/km"
+
+        return {
+            'inicio': datetime.fromtimestamp(float(track['tiempo'][0]), tz=dt_timezone.utc),
+            'distancia_km': Decimal(f"{distancia_m / 1000:.2f}"),
+            'tiempo_total_seg': int(track['tiempo'][-1] - track['tiempo'][0]),
+            'tiempo_movimiento_seg': int(round(movimiento_seg)),
+            'duracion_minutos': int(round(movimiento_seg / 60)),
+            'ritmo': ritmo,
+            'pulsaciones_promedio': int(round(pulsaciones.mean())) if pulsaciones.size else None,
+            'pulsaciones_max': int(pulsaciones.max()) if pulsaciones.size else None,
+            'puntos': int(track['tiempo'].size),
+        }
+
+    @staticmethod
+    def import_execution(alumno, track, datos):
+        """
+        Registra una ejecución del alumno con las métricas del track.
+        datos trae el día (dia_asignado o asignacion_plan + fecha) y los campos
+        que el alumno completa a mano (comentarios, calificación).
+        Las muestras completas se guardan en SerieMuestras.
+        Retorna (ejecucion o None, errores, metricas).
+        """
+        distancias = TrackImportService.segment_distances(track)
+        metricas = TrackImportService.metrics(track, distancias)
+        item = {
+            'fecha_hora_ejecucion': metricas['inicio'],
+            'distancia_km': metricas['distancia_km'],
+            'duracion_minutos': metricas['duracion_minutos'],
+            'ritmo': metricas['ritmo'],
+            'pulsaciones_promedio': metricas['pulsaciones_promedio'],
+            'pulsaciones_max': metricas['pulsaciones_max'],
+        }
+        item.update({campo: valor for campo, valor in datos.items() if valor is not None})
+
+        with transaction.atomic():
+            ejecuciones, errores = ExecutionIngestService.ingest(alumno, [item])
+            ejecucion = ejecuciones[0] if ejecuciones else None
+            if ejecucion is not None:
+                ExecutionSamplesService.save_from_track(ejecucion, track, distancias)
+        return ejecucion, errores, metricas
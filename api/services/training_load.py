@@ -0,0 +1,240 @@
+from datetime import timedelta
+
+import numpy as np
+from django.db import transaction
+from django.utils import timezone
+
+from ..models.analytics import CargaDiaria
+from ..models.execution import EjecucionEntrenamiento
+from ..models.user_profiles import Alumno
+from .weekly_rollup import local_date, start_of_day
+
+# Constantes de tiempo (días) de las cargas aguda y crónica
+ATL_DIAS = 7
+CTL_DIAS = 42
+
+FC_REPOSO_DEFECTO = 60
+FC_MAXIMA_DEFECTO = 190
+# Fracción de la reserva cardíaca que se asume en sesiones sin pulsaciones
+INTENSIDAD_SIN_PULSO = 0.6
+
+# Días por bloque de la EWMA vectorizada (acota el rango de las potencias)
+EWMA_BLOQUE = 365
+
+
+def trimp(duracion_minutos, pulsaciones, fc_reposo, fc_maxima):
+    """
+    TRIMP de Banister para arrays de sesiones:
+    duración * reserva * 0.64 * e^(1.92 * reserva), con
+    reserva = (FC promedio - FC reposo) / (FC máxima - FC reposo).
+    Las pulsaciones faltantes (NaN) usan INTENSIDAD_SIN_PULSO.
+    """
+    reserva = np.clip((pulsaciones - fc_reposo) / (fc_maxima - fc_reposo), 0, 1)
+    reserva = np.where(np.isnan(pulsaciones), INTENSIDAD_SIN_PULSO, reserva)
+    return np.nan_to_num(duracion_minutos) * reserva * 0.64 * np.exp(1.92 * reserva)
+
+
+def ewma(cargas, dias, inicial=0.0):
+    """
+    Media exponencial diaria x_t = x_{t-1} + (c_t - x_{t-1}) * (1 - e^(-1/dias))
+    sin bucle por día: dentro de cada bloque se usa la forma cerrada
+    x_k = d^k * (x_0 + a * sum_i c_i * d^-i).
+    """
+    decaimiento = np.exp(-1.0 / dias)
+    alfa = 1.0 - decaimiento
+    resultado = np.empty(cargas.size)
+    estado = inicial
+    for inicio in range(0, cargas.size, EWMA_BLOQUE):
+        bloque = cargas[inicio:inicio + EWMA_BLOQUE]
+        potencias = decaimiento ** np.arange(1, bloque.size + 1)
+        valores = potencias * (estado + alfa * np.cumsum(bloque / potencias))
+        resultado[inicio:inicio + bloque.size] = valores
+        estado = valores[-1]
+    return resultado
+
+
+class TrainingLoadService:
+    """
+    Curvas de carga (TRIMP / ATL / CTL / TSB) por alumno.
+
+    CargaDiaria guarda el estado de cada día desde la primera ejecución del
+    alumno hasta la última escritura; una ejecución nueva o editada solo
+    recalcula desde su fecha partiendo del estado del día anterior. Los días
+    posteriores a la última fila se derivan al leer (solo decaimiento).
+    """
+
+    @staticmethod
+    def heart_rate_limits(alumno):
+        fc_maxima = alumno.fc_maxima
+        if fc_maxima is None and alumno.fecha_nacimiento:
+            fc_maxima = 220 - alumno.edad
+        return alumno.fc_reposo or FC_REPOSO_DEFECTO, fc_maxima or FC_MAXIMA_DEFECTO
+
+    @staticmethod
+    def recompute(alumno_id, desde=None):
+        """
+        Recalcula CargaDiaria del alumno desde la fecha indicada (o desde su
+        primera ejecución) hasta hoy. Retorna la cantidad de días guardados.
+        """
+        with transaction.atomic():
+            # Serializa los recálculos concurrentes del mismo alumno
+            alumno = (
+                Alumno.objects.select_for_update()
+                .only('id', 'fecha_nacimiento', 'fc_reposo', 'fc_maxima')
+                .filter(pk=alumno_id).first()
+            )
+            if alumno is None:
+                return 0
+
+            previo = None
+            if desde is not None:
+                previo = (
+                    CargaDiaria.objects
+                    .filter(alumno_id=alumno_id, fecha__lt=desde)
+                    .order_by('-fecha')
+                    .values_list('fecha', 'atl', 'ctl')
+                    .first()
+                )
+
+            ejecuciones = EjecucionEntrenamiento.objects.filter(alumno_id=alumno_id)
+            if previo is not None:
+                inicio = previo[0] + timedelta(days=1)
+                atl_inicial, ctl_inicial = previo[1], previo[2]
+                ejecuciones = ejecuciones.filter(fecha_hora_ejecucion__gte=start_of_day(inicio))
+            else:
+                # Sin estado previo: se recalcula la historia completa
+                atl_inicial = ctl_inicial = 0.0
+                primera = ejecuciones.order_by('fecha_hora_ejecucion').values_list(
+                    'fecha_hora_ejecucion', flat=True
+                ).first()
+                inicio = local_date(primera) if primera is not None else None
+
+            filas = list(ejecuciones.values_list(
+                'fecha_hora_ejecucion', 'duracion_minutos', 'pulsaciones_promedio'
+            ))
+            if inicio is None:
+                CargaDiaria.objects.filter(alumno_id=alumno_id).delete()
+                return 0
+
+            fin = max([timezone.localdate()] + [local_date(fila[0]) for fila in filas])
+            dias = (fin - inicio).days + 1
+
+            cargas = np.zeros(dias)
+            if filas:
+                indices = np.array([(local_date(fila[0]) - inicio).days for fila in filas])
+                duraciones = np.array([fila[1] for fila in filas], dtype=np.float64)
+                pulsaciones = np.array([fila[2] for fila in filas], dtype=np.float64)
+                fc_reposo, fc_maxima = TrainingLoadService.heart_rate_limits(alumno)
+                np.add.at(cargas, indices, trimp(duraciones, pulsaciones, fc_reposo, fc_maxima))
+
+            atl = ewma(cargas, ATL_DIAS, atl_inicial)
+            ctl = ewma(cargas, CTL_DIAS, ctl_inicial)
+            # El balance del día es el de la víspera
+            tsb = np.concatenate(([ctl_inicial - atl_inicial], (ctl - atl)[:-1]))
+
+            anteriores = CargaDiaria.objects.filter(alumno_id=alumno_id)
+            if previo is not None:
+                anteriores = anteriores.filter(fecha__gte=inicio)
+            anteriores.delete()
+            CargaDiaria.objects.bulk_create([
+                CargaDiaria(
+                    alumno_id=alumno_id,
+                    fecha=inicio + timedelta(days=i),
+                    trimp=round(float(cargas[i]), 2),
+                    atl=float(atl[i]),
+                    ctl=float(ctl[i]),
+                    tsb=float(tsb[i]),
+                )
+                for i in range(dias)
+            ], batch_size=1000)
+        return dias
+
+    @staticmethod
+    def schedule(cambios):
+        """
+        Encola el recálculo tras el commit. cambios: iterable de
+        (alumno_id, fecha_hora); por alumno se recalcula desde la fecha menor.
+        """
+        desde = {}
+        for alumno_id, fecha_hora in cambios:
+            if alumno_id is None or fecha_hora is None:
+                continue
+            fecha = local_date(fecha_hora)
+            if alumno_id not in desde or fecha < desde[alumno_id]:
+                desde[alumno_id] = fecha
+        for alumno_id, fecha in desde.items():
+            transaction.on_commit(
+                lambda alumno_id=alumno_id, fecha=fecha: TrainingLoadService.recompute(alumno_id, fecha)
+            )
+
+    @staticmethod
+    def on_saved(ejecucion, created):
+        cambios = [(ejecucion.alumno_id, ejecucion.fecha_hora_ejecucion)]
+        originales = ejecucion.valores_originales
+        if not created and originales:
+            cambios.append((originales.get('alumno_id'), originales.get('fecha_hora_ejecucion')))
+        TrainingLoadService.schedule(cambios)
+
+    @staticmethod
+    def on_deleted(ejecucion):
+        originales = ejecucion.valores_originales or {}
+        TrainingLoadService.schedule([(
+            originales.get('alumno_id', ejecucion.alumno_id),
+            originales.get('fecha_hora_ejecucion', ejecucion.fecha_hora_ejecucion),
+        )])
+
+    @staticmethod
+    def add_executions(ejecuciones):
+        TrainingLoadService.schedule(
+            (ejecucion.alumno_id, ejecucion.fecha_hora_ejecucion) for ejecucion in ejecuciones
+        )
+
+    @staticmethod
+    def series(alumno_id, desde, hasta):
+        """
+        [{'fecha', 'trimp', 'atl', 'ctl', 'tsb'}] de cada día del rango.
+        Los días posteriores a la última fila guardada se completan por
+        decaimiento; los anteriores a la primera ejecución valen 0 (todo el
+        rango si el alumno no tiene ejecuciones hasta ese momento).
+        """
+        filas = list(
+            CargaDiaria.objects
+            .filter(alumno_id=alumno_id, fecha__range=(desde, hasta))
+            .order_by('fecha')
+            .values_list('fecha', 'trimp', 'atl', 'ctl', 'tsb')
+        )
+        ultima = filas[-1] if filas else (
+            CargaDiaria.objects
+            .filter(alumno_id=alumno_id, fecha__lt=desde)
+            .order_by('-fecha')
+            .values_list('fecha', 'trimp', 'atl', 'ctl', 'tsb')
+            .first()
+        )
+
+        # Días en 0 antes de la primera fila (todo el rango si no hay ejecuciones hasta el fin)
+        if filas:
+            primera = filas[0][0]
+        else:
+            primera = hasta + timedelta(days=1) if ultima is None else desde
+        serie = [
+            (desde + timedelta(days=i), 0.0, 0.0, 0.0, 0.0)
+            for i in range((primera - desde).days)
+        ]
+        serie.extend(filas)
+
+        if ultima is not None and ultima[0] < hasta:
+            fecha, _, atl, ctl, _ = ultima
+            primero = max(fecha + timedelta(days=1), desde)
+            k = np.arange((primero - fecha).days, (hasta - fecha).days + 1)
+            atl_futuro = atl * np.exp(-k / ATL_DIAS)
+            ctl_futuro = ctl * np.exp(-k / CTL_DIAS)
+            tsb_futuro = ctl * np.exp(-(k - 1) / CTL_DIAS) - atl * np.exp(-(k - 1) / ATL_DIAS)
+            serie.extend(
+                (primero + timedelta(days=i), 0.0, float(atl_futuro[i]), float(ctl_futuro[i]), float(tsb_futuro[i]))
+                for i in range(k.size)
+            )
+
+        return [
+            {'fecha': fecha, 'trimp': trimp_dia, 'atl': round(atl, 1), 'ctl': round(ctl, 1), 'tsb': round(tsb, 1)}
+            for fecha, trimp_dia, atl, ctl, tsb in serie
+        ]
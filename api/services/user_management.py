@@ -1,6 +1,100 @@
-from django.db import transaction
+import asyncio
+import csv
+import io
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+
+from django.conf import settings
+from django.db import IntegrityError, close_old_connections, transaction
+from django.contrib.auth.hashers import make_password
 from django.contrib.auth.models import User
 from ..models.user_profiles import Entrenador, Alumno
+from ..serializers.auth import AlumnoImportRowSerializer, MAX_ALUMNOS_IMPORTACION
+
+# Debajo de esta cantidad (o con un solo núcleo) no compensa pasar por el pool de procesos
+HASH_POOL_MINIMO = 8
+
+
+_hash_executor = None
+_hash_executor_lock = threading.Lock()
+
+
+def _hash_workers():
+    # Núcleos que este proceso puede usar (respeta taskset / cpuset del contenedor)
+    if hasattr(os, 'sched_getaffinity'):
+        nucleos = len(os.sched_getaffinity(0))
+    else:
+        nucleos = os.cpu_count() or 1
+    configurados = getattr(settings, 'PASSWORD_HASH_WORKERS', None)
+    return min(configurados, nucleos) if configurados else nucleos
+
+
+def _get_hash_executor():
+    """
+    Pool de procesos del hasheo, creado al primer uso y reutilizado entre
+    peticiones: el arranque de los procesos se paga una vez por worker y no
+    en cada importación. 'spawn': los procesos no heredan las conexiones
+    abiertas a la base; make_password solo necesita los settings, que el
+    hijo carga con DJANGO_SETTINGS_MODULE (sin django.setup()).
+    """
+    global _hash_executor
+    with _hash_executor_lock:
+        if _hash_executor is None:
+            _hash_executor = ProcessPoolExecutor(
+                max_workers=_hash_workers(),
+                mp_context=multiprocessing.get_context('spawn')
+            )
+        return _hash_executor
+
+
+def hash_passwords(passwords):
+    """
+    Hashea las contraseñas (PBKDF2 con la configuración de Django) en el
+    pool de procesos: PASSWORD_HASH_WORKERS procesos, sin superar los
+    núcleos disponibles.
+    """
+    global _hash_executor
+    workers = _hash_workers()
+    if len(passwords) < HASH_POOL_MINIMO or workers < 2:
+        return [make_password(password) for password in passwords]
+
+    pool = _get_hash_executor()
+    chunksize = max(len(passwords) // (workers * 4), 1)
+    try:
+        return list(pool.map(make_password, passwords, chunksize=chunksize))
+    except BrokenProcessPool:
+        # Murió un proceso del pool: se descarta y el próximo lote crea otro
+        with _hash_executor_lock:
+            if _hash_executor is pool:
+                _hash_executor = None
+        raise
+
+
+_registration_executor = None
+
+
+def _get_registration_executor():
+    """Pool acotado para el hasheo y la transacción del registro async"""
+    global _registration_executor
+    if _registration_executor is None:
+        _registration_executor = ThreadPoolExecutor(
+            max_workers=getattr(settings, 'REGISTRATION_WORKERS', 4),
+            thread_name_prefix='registro'
+        )
+    return _registration_executor
+
+
+def _register_in_thread(user_data, profile_data, role):
+    try:
+        return RegistrationService.register_user_and_profile(user_data, profile_data, role)
+    finally:
+        # Los hilos del pool no pasan por el ciclo de request: se cierra la conexión acá
+        close_old_connections()
+
 
 class RegistrationService:
     @staticmethod
@@ -28,6 +122,154 @@ class RegistrationService:
             # Re-lanza la excepción para que la vista la maneje
             raise e 
 
+    @staticmethod
+    async def registration_conflicts(user_data, profile_data, role):
+        """
+        Verificaciones contra la base del registro (username / email únicos,
+        entrenador activo) con el ORM async. Retorna {campo: [errores]}.
+        """
+        errores = {}
+        if await User.objects.filter(username=user_data['username']).aexists():
+            errores['username'] = ["Ya existe un usuario con este nombre."]
+        if await User.objects.filter(email=user_data['email']).aexists():
+            errores['email'] = ["Este campo debe ser único."]
+        if role == 'student':
+            entrenador_id = profile_data['entrenador_id']
+            if not await Entrenador.objects.filter(pk=entrenador_id, is_active=True).aexists():
+                errores['entrenador_id'] = [f'Clave primaria "{entrenador_id}" inválida - objeto no existe.']
+        return errores
+
+    @staticmethod
+    async def register_user_and_profile_async(user_data, profile_data, role):
+        """
+        register_user_and_profile fuera del event loop: el hasheo PBKDF2 y la
+        transacción corren en un pool de REGISTRATION_WORKERS hilos, así el
+        worker ASGI sigue atendiendo otras peticiones mientras tanto.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            _get_registration_executor(),
+            partial(_register_in_thread, user_data, profile_data, role)
+        )
+
+    @staticmethod
+    def read_students_csv(archivo):
+        """Filas (diccionarios) de un CSV con encabezado; acepta BOM y separador ',' o ';'"""
+        texto = io.TextIOWrapper(archivo.file if hasattr(archivo, 'file') else archivo, encoding='utf-8-sig')
+        try:
+            muestra = texto.read(4096)
+            texto.seek(0)
+            dialecto = csv.Sniffer().sniff(muestra, delimiters=',;') if muestra else csv.excel
+            return list(csv.DictReader(texto, dialect=dialecto))
+        finally:
+            texto.detach()
+
+    @staticmethod
+    def register_students_bulk(entrenador, filas):
+        """
+        Importación masiva de alumnos del entrenador.
+
+        Cada fila se valida por separado (incluida la unicidad de username y
+        email contra la base y dentro del mismo lote, en dos consultas); las
+        contraseñas válidas se hashean en paralelo en un pool de procesos y
+        se insertan User y Alumno con bulk_create en una sola transacción.
+        Las filas inválidas se reportan por índice sin abortar el resto,
+        también las que un registro concurrente deja sin username después
+        de la verificación (el INSERT falla y se reintenta sin ellas).
+        Retorna (usuarios_creados, errores).
+        """
+        if len(filas) > MAX_ALUMNOS_IMPORTACION:
+            raise ValueError(f"Máximo {MAX_ALUMNOS_IMPORTACION} alumnos por importación.")
+
+        errores = []
+        validas = []
+        for indice, fila in enumerate(filas):
+            # Las celdas vacías del CSV cuentan como campos no informados
+            fila = {campo: valor for campo, valor in fila.items() if campo and valor not in ('', None)}
+            serializer = AlumnoImportRowSerializer(data=fila)
+            if serializer.is_valid():
+                validas.append((indice, serializer.validated_data))
+            else:
+                errores.append({'indice': indice, 'errores': serializer.errors})
+
+        for _, data in validas:
+            # Misma normalización que create_user
+            data['username'] = User.normalize_username(data['username'])
+            data['email'] = User.objects.normalize_email(data['email'])
+
+        aceptadas, conflictos = RegistrationService._split_taken(validas)
+        errores.extend(conflictos)
+        usuarios = []
+        if aceptadas:
+            hashes = dict(zip(
+                (indice for indice, _ in aceptadas),
+                hash_passwords([data['password'] for _, data in aceptadas])
+            ))
+            while aceptadas:
+                try:
+                    usuarios = RegistrationService._insert_students(entrenador, aceptadas, hashes)
+                    break
+                except IntegrityError:
+                    # Otro registro tomó un username entre la verificación y el INSERT:
+                    # esas filas pasan a errores y se reintenta con el resto
+                    aceptadas, conflictos = RegistrationService._split_taken(aceptadas)
+                    if not conflictos:
+                        raise
+                    errores.extend(conflictos)
+
+        errores.sort(key=lambda error: error['indice'])
+        return usuarios, errores
+
+    @staticmethod
+    def _split_taken(validas):
+        """
+        Separa las filas cuyo username o email ya existe en la base o se
+        repite dentro del lote (dos consultas). Retorna (aceptadas, errores).
+        """
+        usernames = [data['username'] for _, data in validas]
+        emails = [data['email'] for _, data in validas]
+        usernames_tomados = set(User.objects.filter(username__in=usernames).values_list('username', flat=True))
+        emails_tomados = set(User.objects.filter(email__in=emails).values_list('email', flat=True))
+
+        aceptadas = []
+        errores = []
+        for indice, data in validas:
+            errores_fila = {}
+            if data['username'] in usernames_tomados:
+                errores_fila['username'] = ["Ya existe un usuario con este nombre."]
+            if data['email'] in emails_tomados:
+                errores_fila['email'] = ["Ya existe un usuario con este email."]
+            if errores_fila:
+                errores.append({'indice': indice, 'errores': errores_fila})
+                continue
+            # Las repeticiones dentro del archivo también cuentan
+            usernames_tomados.add(data['username'])
+            emails_tomados.add(data['email'])
+            aceptadas.append((indice, data))
+        return aceptadas, errores
+
+    @staticmethod
+    def _insert_students(entrenador, aceptadas, hashes):
+        """User y Alumno de las filas aceptadas con bulk_create en una transacción"""
+        campos_usuario = AlumnoImportRowSerializer.CAMPOS_USUARIO
+        with transaction.atomic():
+            usuarios = User.objects.bulk_create([
+                User(
+                    password=hashes[indice],
+                    **{campo: data.get(campo, '') for campo in campos_usuario if campo != 'password'}
+                )
+                for indice, data in aceptadas
+            ])
+            Alumno.objects.bulk_create([
+                Alumno(
+                    user=usuario,
+                    entrenador=entrenador,
+                    **{campo: valor for campo, valor in data.items() if campo not in campos_usuario}
+                )
+                for usuario, (_, data) in zip(usuarios, aceptadas)
+            ])
+        return usuarios
+
     @staticmethod
     def activate_coach(user_id):
         """
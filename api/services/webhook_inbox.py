@@ -0,0 +1,104 @@
+import uuid
+
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from ..models.user_profiles import Entrenador
+from ..models.webhooks import EventoWebhook
+from .principal import PrincipalService
+
+# Tiempo que se recuerda una clave en cache (cubre la ventana de reintentos del proveedor)
+IDEMPOTENCY_TTL = 60 * 60 * 24
+IDEMPOTENCY_CACHE_PREFIX = 'webhook:clave:'
+# Eventos por lote del drenador
+DRAIN_LOTE = 500
+
+
+class WebhookInboxService:
+    """
+    Bandeja de entrada de webhooks de pago.
+
+    La recepción escribe a lo sumo una fila por evento: la clave de
+    idempotencia es única en EventoWebhook y, una vez guardada la fila, se
+    recuerda en cache para que los reintentos del proveedor terminen ahí sin
+    tocar la base. La clave se cachea solo después del INSERT: si este falla,
+    el reintento vuelve a intentar registrar el evento. El drenador aplica
+    las activaciones pendientes de a lotes, con un solo UPDATE por lote.
+    """
+
+    @staticmethod
+    def idempotency_key(clave, user_id):
+        """
+        Clave del proveedor o, si no la manda, una única por entrega: sin clave
+        no hay forma de reconocer un reintento, y aplicar dos veces la
+        activación no tiene efecto (el drenador solo actualiza inactivos)
+        """
+        return str(clave) if clave else f'coach_activation:{user_id}:{uuid.uuid4().hex}'
+
+    @staticmethod
+    def receive(clave, user_id, payload=None):
+        """Registra el evento. Retorna False si es una entrega duplicada."""
+        clave_cache = f'{IDEMPOTENCY_CACHE_PREFIX}{clave}'
+        if cache.get(clave_cache) is not None:
+            return False
+        try:
+            with transaction.atomic():
+                EventoWebhook.objects.create(clave=clave, user_id=user_id, payload=payload or {})
+            nuevo = True
+        except IntegrityError:
+            # Ya registrada (entrega concurrente o clave olvidada por la cache)
+            nuevo = False
+        cache.set(clave_cache, 1, IDEMPOTENCY_TTL)
+        return nuevo
+
+    @staticmethod
+    def drain(lote=DRAIN_LOTE):
+        """
+        Aplica un lote de eventos pendientes. Varios drenadores pueden correr
+        en paralelo (skip_locked). Retorna (eventos procesados, entrenadores activados).
+        """
+        with transaction.atomic():
+            eventos = list(
+                EventoWebhook.objects
+                .select_for_update(skip_locked=True)
+                .filter(procesado_at__isnull=True)
+                .order_by('id')
+                .values_list('id', 'user_id')[:lote]
+            )
+            if not eventos:
+                return 0, 0
+
+            user_ids = {user_id for _, user_id in eventos}
+            existentes = set(
+                Entrenador.objects.filter(user_id__in=user_ids).values_list('user_id', flat=True)
+            )
+            ahora = timezone.now()
+            activados = 0
+            if existentes:
+                activados = Entrenador.objects.filter(
+                    user_id__in=existentes, is_active=False
+                ).update(is_active=True, updated_at=ahora)
+                # El UPDATE no dispara post_save: se invalida el principal cacheado
+                transaction.on_commit(lambda: PrincipalService.invalidate(existentes))
+
+            for resultado, ids in (
+                ('activado', [pk for pk, user_id in eventos if user_id in existentes]),
+                ('no_encontrado', [pk for pk, user_id in eventos if user_id not in existentes]),
+            ):
+                if ids:
+                    EventoWebhook.objects.filter(pk__in=ids).update(
+                        procesado_at=ahora, resultado=resultado, updated_at=ahora
+                    )
+        return len(eventos), activados
+
+    @staticmethod
+    def drain_pending(lote=DRAIN_LOTE):
+        """Drena hasta vaciar la bandeja. Retorna (eventos procesados, entrenadores activados)"""
+        procesados = activados = 0
+        while True:
+            eventos, lote_activados = WebhookInboxService.drain(lote)
+            if not eventos:
+                return procesados, activados
+            procesados += eventos
+            activados += lote_activados
@@ -0,0 +1,180 @@
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Count, DateField, DecimalField, F, Q, Sum
+from django.db.models.functions import Coalesce, TruncWeek
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from ..models.analytics import ResumenSemanal
+from ..models.execution import EjecucionEntrenamiento
+
+CAMPOS_TOTALES = (
+    'distancia_km', 'duracion_minutos', 'sesiones', 'pulsaciones_suma', 'pulsaciones_sesiones'
+)
+
+
+def local_date(fecha_hora):
+    """Fecha local de un datetime (acepta también el texto ISO sin parsear)"""
+    if isinstance(fecha_hora, str):
+        fecha_hora = parse_datetime(fecha_hora)
+    return timezone.localtime(fecha_hora).date() if timezone.is_aware(fecha_hora) else fecha_hora.date()
+
+
+def start_of_day(fecha):
+    """Inicio (00:00 en la zona horaria actual) de una fecha, para filtrar datetimes por rango"""
+    inicio = datetime.combine(fecha, time.min)
+    return timezone.make_aware(inicio) if settings.USE_TZ else inicio
+
+
+def week_start(fecha_hora):
+    """Lunes (fecha local) de la semana ISO de un datetime"""
+    fecha = local_date(fecha_hora)
+    return fecha - timedelta(days=fecha.weekday())
+
+
+class WeeklyRollupService:
+    """
+    Mantenimiento incremental de ResumenSemanal a partir de las ejecuciones.
+    Cada ejecución aporta a una clave (alumno, semana, tipo_actividad); al
+    editarla se resta su aporte anterior y se suma el nuevo.
+    """
+
+    @staticmethod
+    def _contribution(valores, signo=1):
+        """(clave, deltas) del aporte de una ejecución, o None si no tiene alumno"""
+        if valores.get('alumno_id') is None or valores.get('fecha_hora_ejecucion') is None:
+            return None
+
+        clave = (
+            valores['alumno_id'],
+            week_start(valores['fecha_hora_ejecucion']),
+            valores.get('tipo_actividad_id'),
+        )
+        pulsaciones = valores.get('pulsaciones_promedio')
+        deltas = {
+            'distancia_km': signo * Decimal(valores.get('distancia_km') or 0),
+            'duracion_minutos': signo * (valores.get('duracion_minutos') or 0),
+            'sesiones': signo,
+            'pulsaciones_suma': signo * (pulsaciones or 0),
+            'pulsaciones_sesiones': signo * (1 if pulsaciones else 0),
+        }
+        return clave, deltas
+
+    @staticmethod
+    def _values(ejecucion):
+        return {campo: getattr(ejecucion, campo) for campo in EjecucionEntrenamiento.CAMPOS_SEGUIDOS}
+
+    @staticmethod
+    def _accumulate(acumulado, aporte):
+        if aporte is None:
+            return
+        clave, deltas = aporte
+        for campo, valor in deltas.items():
+            acumulado[clave][campo] += valor
+
+    @staticmethod
+    def _apply(acumulado):
+        for (alumno_id, semana, tipo_actividad_id), deltas in acumulado.items():
+            if not any(deltas.values()):
+                continue
+            filtro = {
+                'alumno_id': alumno_id,
+                'semana': semana,
+                'tipo_actividad_id': tipo_actividad_id,
+            }
+            cambios = {campo: F(campo) + valor for campo, valor in deltas.items()}
+            if ResumenSemanal.objects.filter(**filtro).update(**cambios):
+                continue
+            if deltas['sesiones'] <= 0:
+                # Restar de una fila inexistente: el resumen ya se borró (p.ej. en cascada)
+                continue
+            try:
+                with transaction.atomic():
+                    ResumenSemanal.objects.create(**filtro, **deltas)
+            except IntegrityError:
+                # Otra transacción creó la fila en paralelo
+                ResumenSemanal.objects.filter(**filtro).update(**cambios)
+
+    @staticmethod
+    def on_saved(ejecucion, created):
+        acumulado = defaultdict(lambda: dict.fromkeys(CAMPOS_TOTALES, 0))
+        if not created and ejecucion.valores_originales:
+            WeeklyRollupService._accumulate(
+                acumulado,
+                WeeklyRollupService._contribution(ejecucion.valores_originales, signo=-1)
+            )
+        WeeklyRollupService._accumulate(
+            acumulado,
+            WeeklyRollupService._contribution(WeeklyRollupService._values(ejecucion))
+        )
+        WeeklyRollupService._apply(acumulado)
+
+    @staticmethod
+    def on_deleted(ejecucion):
+        valores = ejecucion.valores_originales or WeeklyRollupService._values(ejecucion)
+        acumulado = defaultdict(lambda: dict.fromkeys(CAMPOS_TOTALES, 0))
+        WeeklyRollupService._accumulate(
+            acumulado,
+            WeeklyRollupService._contribution(valores, signo=-1)
+        )
+        WeeklyRollupService._apply(acumulado)
+
+    @staticmethod
+    def add_executions(ejecuciones):
+        """Suma un lote de ejecuciones nuevas (p. ej. tras un bulk_create)"""
+        acumulado = defaultdict(lambda: dict.fromkeys(CAMPOS_TOTALES, 0))
+        for ejecucion in ejecuciones:
+            WeeklyRollupService._accumulate(
+                acumulado,
+                WeeklyRollupService._contribution(WeeklyRollupService._values(ejecucion))
+            )
+        WeeklyRollupService._apply(acumulado)
+
+    @staticmethod
+    def rebuild(alumno_ids=None):
+        """
+        Recalcula los resúmenes desde cero con una agregación en la base.
+        Retorna la cantidad de filas generadas.
+        """
+        ejecuciones = EjecucionEntrenamiento.objects.filter(alumno__isnull=False)
+        resumenes = ResumenSemanal.objects.all()
+        if alumno_ids is not None:
+            ejecuciones = ejecuciones.filter(alumno_id__in=alumno_ids)
+            resumenes = resumenes.filter(alumno_id__in=alumno_ids)
+
+        filas = (
+            ejecuciones
+            .annotate(semana=TruncWeek('fecha_hora_ejecucion', output_field=DateField()))
+            .values('alumno_id', 'semana', 'tipo_actividad_id')
+            .annotate(
+                total_distancia=Coalesce(
+                    Sum('distancia_km'), 0, output_field=DecimalField(max_digits=10, decimal_places=2)
+                ),
+                total_duracion=Coalesce(Sum('duracion_minutos'), 0),
+                total_sesiones=Count('id'),
+                total_pulsaciones=Coalesce(Sum('pulsaciones_promedio'), 0),
+                total_pulsaciones_sesiones=Count('id', filter=Q(pulsaciones_promedio__isnull=False)),
+            )
+            .order_by()
+        )
+
+        with transaction.atomic():
+            resumenes.delete()
+            creados = ResumenSemanal.objects.bulk_create([
+                ResumenSemanal(
+                    alumno_id=fila['alumno_id'],
+                    semana=fila['semana'],
+                    tipo_actividad_id=fila['tipo_actividad_id'],
+                    distancia_km=fila['total_distancia'],
+                    duracion_minutos=fila['total_duracion'],
+                    sesiones=fila['total_sesiones'],
+                    pulsaciones_suma=fila['total_pulsaciones'],
+                    pulsaciones_sesiones=fila['total_pulsaciones_sesiones'],
+                )
+                for fila in filas.iterator(chunk_size=2000)
+            ], batch_size=2000)
+        return len(creados)
@@ -0,0 +1,145 @@
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete, pre_delete
+from django.dispatch import receiver
+
+from .models.user_profiles import Entrenador, Alumno
+from .models.activity_types import TipoActividad, TipoRutina
+from .models.routine import Rutina
+from .models.training_plan import PlanEntrenamiento, Semana, DiaPlantilla
+from .models.plan_assignment import AsignacionPlan
+from .models.execution import EjecucionEntrenamiento, ImagenEjecucion
+from .services.plan_sync import PlanSyncService
+from .services.plan_tree import PlanTreeService
+from .services.weekly_rollup import WeeklyRollupService
+from .services.training_load import TrainingLoadService
+from .services.personal_records import PersonalRecordService
+from .services.compliance import ComplianceService
+from .services.image_renditions import ImageRenditionService
+from .services.media_blobs import MediaBlobService
+from .services.principal import PrincipalService
+from .services.catalog import CatalogService
+
+
+def _sync_plan_on_commit(plan_id):
+    # Una sincronización por plan dentro de PlanSyncService.batch() (admin, delete_template_day)
+    PlanSyncService.sync_on_commit(plan_id)
+
+
+def _bump_plan_tree_on_commit(*plan_ids):
+    # Tras el commit, para que ningún lector cachee datos sin confirmar con la versión nueva
+    transaction.on_commit(lambda: PlanTreeService.bump(*plan_ids))
+
+
+@receiver(post_save, sender=PlanEntrenamiento)
+@receiver(post_delete, sender=PlanEntrenamiento)
+def plan_changed(sender, instance, **kwargs):
+    _bump_plan_tree_on_commit(instance.pk)
+
+
+@receiver(post_save, sender=Semana)
+@receiver(post_delete, sender=Semana)
+def semana_changed(sender, instance, **kwargs):
+    """Cambios en la estructura de semanas mueven las fechas de los días"""
+    _sync_plan_on_commit(instance.plan_id)
+    _bump_plan_tree_on_commit(instance.plan_id)
+
+
+@receiver(post_save, sender=DiaPlantilla)
+@receiver(post_delete, sender=DiaPlantilla)
+def dia_plantilla_changed(sender, instance, **kwargs):
+    """Propaga la edición de un día plantilla a los días futuros asignados"""
+    plan_id = Semana.objects.filter(pk=instance.semana_id).values_list('plan_id', flat=True).first()
+    if plan_id is not None:
+        _sync_plan_on_commit(plan_id)
+        _bump_plan_tree_on_commit(plan_id)
+
+
+def _plans_using_rutina(rutina):
+    return list(
+        DiaPlantilla.objects
+        .filter(rutina=rutina)
+        .values_list('semana__plan_id', flat=True)
+        .distinct()
+    )
+
+
+@receiver(post_save, sender=Rutina)
+def rutina_saved(sender, instance, created, **kwargs):
+    if not created:
+        _bump_plan_tree_on_commit(*_plans_using_rutina(instance))
+
+
+@receiver(pre_delete, sender=Rutina)
+def rutina_deleted(sender, instance, **kwargs):
+    # pre_delete: después del borrado los días ya quedan con rutina NULL
+    _bump_plan_tree_on_commit(*_plans_using_rutina(instance))
+
+
+def _invalidate_compliance_on_commit(ejecucion):
+    alumno_id = ejecucion.alumno_id
+    if alumno_id is not None:
+        transaction.on_commit(lambda: ComplianceService.invalidate_for_alumnos([alumno_id]))
+
+
+@receiver(post_save, sender=AsignacionPlan)
+@receiver(post_delete, sender=AsignacionPlan)
+def asignacion_changed(sender, instance, **kwargs):
+    """El cumplimiento solo cuenta asignaciones activas"""
+    alumno_id = instance.alumno_id
+    transaction.on_commit(lambda: ComplianceService.invalidate_for_alumnos([alumno_id]))
+
+
+@receiver(post_save, sender=EjecucionEntrenamiento)
+def ejecucion_saved(sender, instance, created, **kwargs):
+    WeeklyRollupService.on_saved(instance, created)
+    TrainingLoadService.on_saved(instance, created)
+    PersonalRecordService.on_saved(instance, created)
+    _invalidate_compliance_on_commit(instance)
+
+
+@receiver(post_delete, sender=EjecucionEntrenamiento)
+def ejecucion_deleted(sender, instance, **kwargs):
+    WeeklyRollupService.on_deleted(instance)
+    TrainingLoadService.on_deleted(instance)
+    PersonalRecordService.on_deleted(instance)
+    _invalidate_compliance_on_commit(instance)
+
+
+@receiver(post_save, sender=ImagenEjecucion)
+def imagen_saved(sender, instance, update_fields=None, **kwargs):
+    MediaBlobService.on_image_saved(instance, update_fields)
+    # Las miniaturas se generan en segundo plano, fuera del request
+    if instance.imagen and not instance.procesada:
+        ImageRenditionService.schedule(instance.pk)
+
+
+@receiver(post_delete, sender=ImagenEjecucion)
+def imagen_deleted(sender, instance, **kwargs):
+    # El archivo puede estar compartido: se borra en gc_blobs_media si queda sin referencias
+    MediaBlobService.release(instance.imagen.name)
+    # Las versiones generadas son de esta imagen: se borran si el borrado se confirma
+    transaction.on_commit(lambda: ImageRenditionService.delete_files(instance))
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def user_changed(sender, instance, **kwargs):
+    transaction.on_commit(lambda: PrincipalService.invalidate([instance.pk]))
+
+
+@receiver(post_save, sender=Entrenador)
+@receiver(post_delete, sender=Entrenador)
+@receiver(post_save, sender=Alumno)
+@receiver(post_delete, sender=Alumno)
+def perfil_changed(sender, instance, **kwargs):
+    """El principal cacheado incluye el perfil (y el entrenador del alumno)"""
+    transaction.on_commit(lambda: PrincipalService.invalidate([instance.user_id]))
+
+
+@receiver(post_save, sender=TipoActividad)
+@receiver(post_delete, sender=TipoActividad)
+@receiver(post_save, sender=TipoRutina)
+@receiver(post_delete, sender=TipoRutina)
+def tipo_changed(sender, instance, **kwargs):
+    CatalogService.changed(sender, [instance.entrenador_id])
@@ -0,0 +1,80 @@
+import hashlib
+import os
+import tempfile
+
+from django.core.files.storage import FileSystemStorage
+
+# Directorio (relativo a MEDIA_ROOT) donde viven los blobs direccionados por contenido
+BLOB_PREFIX = 'ejecuciones/blobs'
+BLOB_CHUNK_SIZE = 64 * 1024
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    Storage que guarda cada archivo bajo el SHA-256 de su contenido:
+    ejecuciones/blobs/ab/cd/abcd...<ext>
+
+    El archivo subido se copia por bloques a un temporal mientras se calcula
+    el hash (nunca se carga entero en memoria) y luego se mueve a su ruta
+    definitiva con os.replace. Si el blob ya existe el temporal se descarta,
+    así que subir dos veces la misma captura ocupa un solo archivo.
+
+    Como un blob puede estar compartido por varios registros, los archivos
+    no se borran al eliminar un registro: las referencias se cuentan en
+    BlobMedia y gc_blobs_media elimina los que quedan sin uso.
+    """
+
+    def __init__(self, prefijo=BLOB_PREFIX, **kwargs):
+        self.prefijo = prefijo
+        super().__init__(**kwargs)
+
+    def blob_name(self, digest, extension=''):
+        return f"{self.prefijo}/{digest[:2]}/{digest[2:4]}/{digest}{extension}"
+
+    def is_blob(self, name):
+        return bool(name) and name.startswith(f"{self.prefijo}/")
+
+    def temp_dir(self):
+        return self.path(f"{self.prefijo}/tmp")
+
+    def get_available_name(self, name, max_length=None):
+        # El nombre definitivo depende del contenido y se resuelve en _save
+        return name
+
+    def _save(self, name, content):
+        extension = os.path.splitext(name)[1].lower()
+        directorio_tmp = self.temp_dir()
+        os.makedirs(directorio_tmp, exist_ok=True)
+
+        digest = hashlib.sha256()
+        with tempfile.NamedTemporaryFile(dir=directorio_tmp, delete=False) as temporal:
+            try:
+                for chunk in content.chunks(BLOB_CHUNK_SIZE):
+                    digest.update(chunk)
+                    temporal.write(chunk)
+            except BaseException:
+                temporal.close()
+                os.unlink(temporal.name)
+                raise
+
+        nombre = self.blob_name(digest.hexdigest(), extension)
+        destino = self.path(nombre)
+        if os.path.exists(destino):
+            os.unlink(temporal.name)
+            # Renueva la fecha para que el GC no lo borre mientras se confirma la referencia
+            os.utime(destino)
+            return nombre
+
+        os.makedirs(os.path.dirname(destino), exist_ok=True)
+        os.chmod(temporal.name, self.file_permissions_mode or 0o644)
+        os.replace(temporal.name, destino)
+        return nombre
+
+
+# La ubicación (MEDIA_ROOT) se lee de settings de forma perezosa
+blob_storage = ContentAddressedStorage()
+
+
+def execution_image_storage():
+    """Storage de ImagenEjecucion.imagen (callable para no fijar rutas en las migraciones)"""
+    return blob_storage
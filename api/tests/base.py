@@ -0,0 +1,59 @@
+from types import SimpleNamespace
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from ..models import (
+    Entrenador, Alumno, TipoActividad, TipoRutina, Rutina,
+    PlanEntrenamiento, Semana, DiaPlantilla
+)
+from ..services.plan_assignment import PlanAssignmentService
+
+LOCMEM = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+DIAS = [dia for dia, _ in DiaPlantilla.DIAS_SEMANA]
+
+
+@override_settings(CACHES=LOCMEM)
+class CacheTestCase(TestCase):
+    """TestCase con cache en memoria del proceso, vacía al empezar cada test"""
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+
+def create_plan_fixture(semanas=1, dias=('lunes',), descanso=(), inicio=None, modo_calendario='materializado'):
+    """
+    Entrenador -> alumno -> tipo -> rutina -> plan con `semanas` semanas.
+    Cada semana lleva los `dias` indicados, con la rutina salvo los de
+    `descanso`. Con `inicio` el plan se asigna al alumno desde esa fecha.
+    """
+    entrenador = Entrenador.objects.create(user=User.objects.create_user(username='coach'), is_active=True)
+    alumno = Alumno.objects.create(user=User.objects.create_user(username='alumno'), entrenador=entrenador)
+    tipo = TipoActividad.objects.create(nombre='Running', entrenador=entrenador)
+    rutina = Rutina.objects.create(
+        entrenador=entrenador, tipo_actividad=tipo, nombre='Fondo',
+        tipo_rutina=TipoRutina.objects.create(nombre='Series', entrenador=entrenador),
+    )
+    plan = PlanEntrenamiento.objects.create(
+        entrenador=entrenador, tipo_actividad=tipo, nombre='Base', duracion_semanas=semanas
+    )
+    lista_semanas = Semana.objects.bulk_create([
+        Semana(plan=plan, numero_semana=numero) for numero in range(1, semanas + 1)
+    ])
+    DiaPlantilla.objects.bulk_create([
+        DiaPlantilla(
+            semana=semana, dia_semana=dia, orden=DIAS.index(dia),
+            rutina=None if dia in descanso else rutina
+        )
+        for semana in lista_semanas
+        for dia in dias
+    ])
+    asignacion = None
+    if inicio is not None:
+        asignacion = PlanAssignmentService.assign_plan(plan, alumno, inicio, modo_calendario=modo_calendario)
+    return SimpleNamespace(
+        entrenador=entrenador, alumno=alumno, tipo=tipo, rutina=rutina,
+        plan=plan, semanas=lista_semanas, asignacion=asignacion,
+    )
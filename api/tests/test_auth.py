@@ -0,0 +1,14 @@
+from django.test import TestCase
+
+
+class AsyncRegisterSchemaTests(TestCase):
+
+    def test_async_register_is_documented(self):
+        response = self.client.get('/swagger/?format=openapi')
+        self.assertEqual(response.status_code, 200)
+        paths = response.json()['paths']
+        self.assertIn('/auth/register/async/', paths)
+        self.assertEqual(
+            paths['/auth/register/async/']['post']['parameters'],
+            paths['/auth/register/']['post']['parameters']
+        )
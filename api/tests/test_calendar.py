@@ -0,0 +1,61 @@
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from ..models import Alumno, EjecucionEntrenamiento
+from ..services.plan_assignment import PlanAssignmentService
+from ..views.calendar import CalendarView
+from .base import CacheTestCase, DIAS, create_plan_fixture
+
+SEMANAS = 16
+MODOS = ('materializado', 'virtual')
+# Alumno + asignaciones + días + ejecuciones (materializado) / plantilla (virtual)
+CONSULTAS = 4
+
+
+class CalendarQueryCountTests(CacheTestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.hoy = timezone.localdate()
+        # Rutina en días alternos de cada semana
+        fixture = create_plan_fixture(semanas=SEMANAS, dias=DIAS, descanso=DIAS[1::2])
+        entrenador, plan = fixture.entrenador, fixture.plan
+
+        cls.usuarios = {}
+        for modo in MODOS:
+            user = User.objects.create_user(username=f'alumno_{modo}')
+            alumno = Alumno.objects.create(user=user, entrenador=entrenador)
+            asignacion = PlanAssignmentService.assign_plan(
+                plan, alumno, cls.hoy - timedelta(days=30), modo_calendario=modo
+            )
+            if modo == 'materializado':
+                EjecucionEntrenamiento.objects.bulk_create([
+                    EjecucionEntrenamiento(dia_asignado=dia, fecha_hora_ejecucion=timezone.now())
+                    for dia in asignacion.dias_asignados.filter(fecha_especifica__lt=cls.hoy)
+                ])
+            cls.usuarios[modo] = user.pk
+
+    def _request(self, modo, desde, hasta):
+        request = APIRequestFactory().get('/api/calendario/', {
+            'from': desde.isoformat(), 'to': hasta.isoformat()
+        })
+        # Usuario recién leído, sin perfiles cargados, como en una petición real
+        force_authenticate(request, user=User.objects.get(pk=self.usuarios[modo]))
+        return request
+
+    def test_query_count_is_constant_across_ranges(self):
+        vista = CalendarView.as_view()
+        for modo in MODOS:
+            # Primera petición fuera de la medición: carga el catálogo de tipos en memoria
+            vista(self._request(modo, self.hoy, self.hoy))
+            for dias in (7, 31, 92):
+                with self.subTest(modo=modo, dias=dias):
+                    desde = self.hoy - timedelta(days=14)
+                    request = self._request(modo, desde, desde + timedelta(days=dias - 1))
+                    with self.assertNumQueries(CONSULTAS):
+                        response = vista(request)
+                    self.assertEqual(response.status_code, 200)
+                    self.assertEqual(len(response.data), dias)
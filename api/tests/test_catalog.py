@@ -0,0 +1,44 @@
+from django.contrib.auth.models import User
+
+from ..models import Entrenador, TipoActividad
+from ..services.catalog import CatalogService
+from .base import CacheTestCase
+
+
+class CatalogLookupTests(CacheTestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.entrenador = Entrenador.objects.create(user=User.objects.create_user(username='coach'))
+        cls.otro = Entrenador.objects.create(user=User.objects.create_user(username='otro'))
+        cls.tipos = TipoActividad.objects.bulk_create([
+            TipoActividad(nombre=f'Tipo {n}', entrenador=cls.otro) for n in range(3)
+        ])
+
+    def setUp(self):
+        super().setUp()
+        # Índices de otros tests del proceso
+        for indices in (CatalogService._globales, CatalogService._entrenadores, CatalogService._duenos):
+            indices.clear()
+
+    def test_owner_of_foreign_type_is_queried_once(self):
+        # Globales, catálogo del entrenador, dueño del primer tipo y catálogo del dueño
+        with self.assertNumQueries(4):
+            CatalogService.lookup(TipoActividad, self.tipos[0].pk, self.entrenador.pk)
+        with self.assertNumQueries(2):
+            for tipo in self.tipos[1:]:
+                self.assertEqual(
+                    CatalogService.lookup(TipoActividad, tipo.pk, self.entrenador.pk).nombre, tipo.nombre
+                )
+        with self.assertNumQueries(0):
+            for tipo in self.tipos:
+                CatalogService.lookup(TipoActividad, tipo.pk, self.entrenador.pk)
+
+    def test_deleted_type_is_not_served_from_remembered_owner(self):
+        tipo = self.tipos[0]
+        CatalogService.lookup(TipoActividad, tipo.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            TipoActividad.objects.get(pk=tipo.pk).delete()
+
+        self.assertIsNone(CatalogService.lookup(TipoActividad, tipo.pk))
+        self.assertNotIn(tipo.pk, CatalogService._duenos['api.tipoactividad'])
@@ -0,0 +1,53 @@
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.utils import timezone
+
+from ..models import DiaAsignado
+from ..services.compliance import ComplianceService
+from ..services.plan_assignment import PlanAssignmentService
+from .base import CacheTestCase, DIAS, create_plan_fixture
+
+
+class ComplianceTests(CacheTestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        # Rutina de lunes a miércoles, descanso el resto de la semana
+        fixture = create_plan_fixture(dias=DIAS, descanso=DIAS[3:])
+        cls.entrenador, cls.alumno, cls.plan = fixture.entrenador, fixture.alumno, fixture.plan
+        hoy = timezone.localdate()
+        cls.lunes = hoy - timedelta(days=hoy.weekday() + 7)
+
+    def _report(self):
+        return ComplianceService._compute(self.entrenador.pk, self.lunes, self.lunes + timedelta(days=6))
+
+    def test_completed_rest_days_do_not_count(self):
+        asignacion = PlanAssignmentService.assign_plan(self.plan, self.alumno, self.lunes)
+        asignacion.dias_asignados.update(completado=True)
+
+        [fila] = self._report()
+        self.assertEqual((fila['planificados'], fila['completados']), (3, 3))
+        self.assertEqual(fila['cumplimiento'], 1)
+
+    def test_inactive_assignments_are_excluded(self):
+        for modo in ('materializado', 'virtual'):
+            asignacion = PlanAssignmentService.assign_plan(
+                self.plan, self.alumno, self.lunes, modo_calendario=modo
+            )
+            asignacion.estado = 'cancelado'
+            asignacion.save()
+        DiaAsignado.objects.update(completado=True)
+
+        self.assertEqual(self._report(), [])
+
+    def test_report_recomputed_after_version_loss(self):
+        desde, hasta = self.lunes, self.lunes + timedelta(days=6)
+        asignacion = PlanAssignmentService.assign_plan(self.plan, self.alumno, self.lunes)
+        self.assertEqual(ComplianceService.coach_compliance(self.entrenador, desde, hasta)[0]['completados'], 0)
+
+        # Se pierde la versión y llega una escritura: no puede volver a un número ya usado
+        cache.delete(ComplianceService.version_key(self.entrenador.pk))
+        asignacion.dias_asignados.update(completado=True)
+        ComplianceService.invalidate(self.entrenador.pk)
+        self.assertEqual(ComplianceService.coach_compliance(self.entrenador, desde, hasta)[0]['completados'], 3)
@@ -0,0 +1,37 @@
+from datetime import timedelta
+
+from django.utils import timezone
+
+from ..models import EjecucionEntrenamiento
+from ..services.execution_export import ExecutionExportService
+from ..services.weekly_rollup import start_of_day
+from .base import CacheTestCase, create_plan_fixture
+
+
+class ExecutionExportRangeTests(CacheTestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.dia = timezone.localdate() - timedelta(days=10)
+        fixture = create_plan_fixture(inicio=cls.dia)
+        cls.entrenador = fixture.entrenador
+        dia_asignado = fixture.asignacion.dias_asignados.get()
+
+        # Primer y último instante locales del día, y los vecinos fuera del rango
+        medianoche = start_of_day(cls.dia)
+        cls.dentro = set()
+        for fecha_hora, incluida in (
+            (medianoche - timedelta(seconds=1), False),
+            (medianoche, True),
+            (medianoche + timedelta(days=1) - timedelta(seconds=1), True),
+            (medianoche + timedelta(days=1), False),
+        ):
+            ejecucion = EjecucionEntrenamiento.objects.create(
+                dia_asignado=dia_asignado, fecha_hora_ejecucion=fecha_hora
+            )
+            if incluida:
+                cls.dentro.add(ejecucion.pk)
+
+    def test_range_includes_whole_local_days(self):
+        filas = ExecutionExportService.rows(self.entrenador.pk, desde=self.dia, hasta=self.dia)
+        self.assertEqual({fila[0] for fila in filas}, self.dentro)
@@ -0,0 +1,75 @@
+import io
+import shutil
+import tempfile
+from unittest import mock
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import OperationalError
+from django.test import override_settings
+from django.utils import timezone
+from PIL import Image
+
+from ..models import EjecucionEntrenamiento, ImagenEjecucion
+from ..services.image_renditions import ImageRenditionService, render_renditions
+from .base import CacheTestCase, create_plan_fixture
+
+
+def _png():
+    salida = io.BytesIO()
+    Image.new('RGB', (640, 480), 'orange').save(salida, 'PNG')
+    return ContentFile(salida.getvalue(), name='captura.png')
+
+
+class ImageRenditionFilesTests(CacheTestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        asignacion = create_plan_fixture(inicio=timezone.localdate()).asignacion
+        cls.ejecucion = EjecucionEntrenamiento.objects.create(
+            dia_asignado=asignacion.dias_asignados.get(), fecha_hora_ejecucion=timezone.now()
+        )
+
+    def setUp(self):
+        super().setUp()
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        ajustes = override_settings(MEDIA_ROOT=media_root)
+        ajustes.enable()
+        self.addCleanup(ajustes.disable)
+
+    def _processed_image(self):
+        with self.captureOnCommitCallbacks():
+            imagen = ImagenEjecucion.objects.create(ejecucion=self.ejecucion, imagen=_png())
+        return ImageRenditionService.process(imagen.pk)
+
+    def test_delete_removes_renditions(self):
+        imagen = self._processed_image()
+        nombres = [imagen.miniatura.name, imagen.display.name]
+        self.assertTrue(all(default_storage.exists(nombre) for nombre in nombres))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            imagen.delete()
+        self.assertFalse(any(default_storage.exists(nombre) for nombre in nombres))
+
+    def test_image_deleted_while_processing_leaves_no_renditions(self):
+        with self.captureOnCommitCallbacks():
+            imagen = ImagenEjecucion.objects.create(ejecucion=self.ejecucion, imagen=_png())
+        resultado = render_renditions(ImageRenditionService.read_original(imagen))
+        ImagenEjecucion.objects.filter(pk=imagen.pk).delete()
+
+        ImageRenditionService.store(imagen, resultado)
+        self.assertFalse(default_storage.exists(imagen.miniatura.name))
+        self.assertFalse(default_storage.exists(imagen.display.name))
+
+    def test_database_error_on_existing_image_is_raised(self):
+        with self.captureOnCommitCallbacks():
+            imagen = ImagenEjecucion.objects.create(ejecucion=self.ejecucion, imagen=_png())
+        resultado = render_renditions(ImageRenditionService.read_original(imagen))
+
+        with mock.patch.object(ImagenEjecucion, 'save', side_effect=OperationalError('lock timeout')):
+            with self.assertRaises(OperationalError):
+                ImageRenditionService.store(imagen, resultado)
+        self.assertFalse(default_storage.exists(imagen.miniatura.name))
+        imagen.refresh_from_db()
+        self.assertFalse(imagen.procesada)
@@ -0,0 +1,61 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.db import transaction
+from django.utils import timezone
+
+from ..models import DiaPlantilla, DiaAsignado
+from ..services.plan_assignment import PlanAssignmentService
+from ..services.plan_sync import PlanSyncService
+from .base import CacheTestCase, create_plan_fixture
+
+
+class TemplateDaySyncTests(CacheTestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        fixture = create_plan_fixture(dias=())
+        cls.alumno, cls.rutina, cls.plan = fixture.alumno, fixture.rutina, fixture.plan
+        [cls.semana] = fixture.semanas
+
+    def _create_week(self):
+        with self.captureOnCommitCallbacks(execute=True), PlanSyncService.batch():
+            for orden, (dia, _) in enumerate(DiaPlantilla.DIAS_SEMANA):
+                DiaPlantilla.objects.create(semana=self.semana, rutina=self.rutina, dia_semana=dia, orden=orden)
+
+    def test_one_sync_per_plan_per_batch(self):
+        with mock.patch.object(PlanSyncService, 'sync_plan') as sync_plan:
+            self._create_week()
+        sync_plan.assert_called_once_with(self.plan.pk)
+
+    def test_each_save_syncs_outside_batch(self):
+        with mock.patch.object(PlanSyncService, 'sync_plan') as sync_plan:
+            with self.captureOnCommitCallbacks(execute=True):
+                DiaPlantilla.objects.create(semana=self.semana, dia_semana='lunes')
+                DiaPlantilla.objects.create(semana=self.semana, dia_semana='martes')
+        self.assertEqual(sync_plan.call_count, 2)
+
+    def test_failed_batch_queues_nothing(self):
+        with mock.patch.object(PlanSyncService, 'sync_plan') as sync_plan:
+            with self.captureOnCommitCallbacks(execute=True):
+                with self.assertRaises(RuntimeError):
+                    with PlanSyncService.batch(), transaction.atomic():
+                        DiaPlantilla.objects.create(semana=self.semana, dia_semana='lunes')
+                        raise RuntimeError
+            sync_plan.assert_not_called()
+
+            # El lote fallido no deja planes pendientes para el siguiente
+            with self.captureOnCommitCallbacks(execute=True):
+                with PlanSyncService.batch():
+                    DiaPlantilla.objects.create(semana=self.semana, dia_semana='martes')
+        sync_plan.assert_called_once_with(self.plan.pk)
+
+    def test_delete_template_day_with_assignments(self):
+        self._create_week()
+        PlanAssignmentService.assign_plan(self.plan, self.alumno, timezone.localdate() + timedelta(days=1))
+        dia_plantilla = DiaPlantilla.objects.get(semana=self.semana, dia_semana='lunes')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(PlanSyncService.delete_template_day(dia_plantilla), 1)
+        self.assertFalse(DiaPlantilla.objects.filter(pk=dia_plantilla.pk).exists())
+        self.assertEqual(DiaAsignado.objects.count(), 6)
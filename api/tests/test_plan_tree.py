@@ -0,0 +1,19 @@
+from django.core.cache import cache
+
+from ..services.plan_tree import PlanTreeService
+from .base import CacheTestCase
+
+
+class PlanTreeVersionTests(CacheTestCase):
+
+    def test_lost_version_does_not_repeat(self):
+        anteriores = {PlanTreeService.current_version(1)}
+        PlanTreeService.bump(1)
+        anteriores.add(PlanTreeService.current_version(1))
+
+        # Desalojo del contador seguido de una lectura y de una escritura
+        cache.delete(PlanTreeService.version_key(1))
+        self.assertNotIn(PlanTreeService.current_version(1), anteriores)
+        cache.delete(PlanTreeService.version_key(1))
+        PlanTreeService.bump(1)
+        self.assertNotIn(PlanTreeService.current_version(1), anteriores)
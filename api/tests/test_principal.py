@@ -0,0 +1,91 @@
+from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY, get_user
+from django.contrib.auth.models import AnonymousUser, User
+from django.contrib.sessions.backends.signed_cookies import SessionStore
+from django.core.cache import cache
+from django.test import RequestFactory
+
+from ..models import Entrenador, Alumno
+from ..permissions import IsCoach, IsStudent
+from ..services.principal import PrincipalService
+from .base import CacheTestCase
+
+BACKEND_ANTERIOR = 'django.contrib.auth.backends.ModelBackend'
+BACKEND_PRINCIPAL = 'api.auth_backends.PrincipalBackend'
+
+
+class PrincipalQueryCountTests(CacheTestCase):
+    """Consultas para resolver sesión -> usuario -> perfil -> permiso -> nombre del entrenador"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.coach_user = User.objects.create_user(username='coach', password='clave-coach-1', first_name='Coach')
+        cls.entrenador = Entrenador.objects.create(user=cls.coach_user, is_active=True)
+        cls.alumno_user = User.objects.create_user(username='alumno', password='clave-alumno-1')
+        Alumno.objects.create(user=cls.alumno_user, entrenador=cls.entrenador)
+
+    def _request(self, usuario, backend):
+        request = RequestFactory().get('/')
+        request.session = SessionStore()
+        request.session.update({
+            SESSION_KEY: str(usuario.pk),
+            BACKEND_SESSION_KEY: backend,
+            HASH_SESSION_KEY: usuario.get_session_auth_hash(),
+        })
+        return request
+
+    def _resolve_coach(self, backend):
+        request = self._request(self.coach_user, backend)
+        request.user = get_user(request)
+        self.assertTrue(IsCoach().has_permission(request, None))
+        self.assertEqual(request.user.entrenador.nombre_completo, 'Coach')
+        self.assertEqual(PrincipalService.role(request.user), 'coach')
+
+    def _resolve_student(self, backend):
+        request = self._request(self.alumno_user, backend)
+        request.user = get_user(request)
+        self.assertTrue(IsStudent().has_permission(request, None))
+        self.assertEqual(request.user.alumno.entrenador.nombre_completo, 'Coach')
+        self.assertEqual(PrincipalService.role(request.user), 'student')
+
+    def test_model_backend_baseline(self):
+        with self.assertNumQueries(2):
+            self._resolve_coach(BACKEND_ANTERIOR)
+        with self.assertNumQueries(4):
+            self._resolve_student(BACKEND_ANTERIOR)
+
+    def test_principal_backend_cold_and_warm(self):
+        for resolver in (self._resolve_coach, self._resolve_student):
+            with self.assertNumQueries(1):
+                resolver(BACKEND_PRINCIPAL)
+            with self.assertNumQueries(1):
+                resolver(BACKEND_PRINCIPAL)
+
+    def test_cached_profile_does_not_carry_password(self):
+        self._resolve_student(BACKEND_PRINCIPAL)
+        perfiles = cache.get(PrincipalService.cache_key(self.alumno_user.pk))
+        self.assertNotIn('user', perfiles['alumno']._state.fields_cache)
+        self.assertNotIn('password', perfiles['alumno'].entrenador.user.__dict__)
+
+    def test_deactivated_user_is_rejected_with_warm_cache(self):
+        self._resolve_coach(BACKEND_PRINCIPAL)
+        # UPDATE directo: no pasa por las señales que invalidan la cache
+        User.objects.filter(pk=self.coach_user.pk).update(is_active=False)
+        request = self._request(self.coach_user, BACKEND_PRINCIPAL)
+        self.assertIsInstance(get_user(request), AnonymousUser)
+
+    def test_password_change_ends_session_with_warm_cache(self):
+        self._resolve_coach(BACKEND_PRINCIPAL)
+        request = self._request(self.coach_user, BACKEND_PRINCIPAL)
+        usuario = User.objects.get(pk=self.coach_user.pk)
+        usuario.set_password('otra-clave-1')
+        User.objects.filter(pk=usuario.pk).update(password=usuario.password)
+        self.assertIsInstance(get_user(request), AnonymousUser)
+
+    def test_profile_save_invalidates_cache(self):
+        self._resolve_coach(BACKEND_PRINCIPAL)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.entrenador.is_active = False
+            self.entrenador.save()
+        request = self._request(self.coach_user, BACKEND_PRINCIPAL)
+        request.user = get_user(request)
+        self.assertFalse(IsCoach().has_permission(request, None))
@@ -0,0 +1,40 @@
+from datetime import date, timedelta
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+from ..models import Entrenador, Alumno, CargaDiaria
+from ..services.training_load import TrainingLoadService
+
+
+class TrainingLoadSeriesTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        entrenador = Entrenador.objects.create(user=User.objects.create_user(username='coach'))
+        cls.alumno = Alumno.objects.create(user=User.objects.create_user(username='alumno'), entrenador=entrenador)
+        cls.desde = date(2026, 3, 2)
+        cls.hasta = cls.desde + timedelta(days=6)
+
+    def _series(self):
+        return TrainingLoadService.series(self.alumno.pk, self.desde, self.hasta)
+
+    def _assert_zero_days(self, serie):
+        self.assertEqual([dia['fecha'] for dia in serie], [self.desde + timedelta(days=i) for i in range(7)])
+        self.assertTrue(all(dia['trimp'] == dia['atl'] == dia['ctl'] == dia['tsb'] == 0 for dia in serie))
+
+    def test_student_without_executions_gets_one_zero_day_per_day(self):
+        self._assert_zero_days(self._series())
+
+    def test_range_before_first_execution_is_zero(self):
+        CargaDiaria.objects.create(
+            alumno=self.alumno, fecha=self.hasta + timedelta(days=3), trimp=80, atl=11, ctl=2, tsb=0
+        )
+        self._assert_zero_days(self._series())
+
+    def test_days_before_first_row_are_padded(self):
+        CargaDiaria.objects.create(alumno=self.alumno, fecha=self.desde + timedelta(days=2), trimp=80, atl=11, ctl=2, tsb=0)
+        serie = self._series()
+        self.assertEqual(len(serie), 7)
+        self.assertEqual([dia['atl'] for dia in serie[:2]], [0, 0])
+        self.assertEqual(serie[2]['trimp'], 80)
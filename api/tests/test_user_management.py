@@ -0,0 +1,54 @@
+import os
+from unittest import mock
+
+from django.contrib.auth.hashers import check_password, make_password
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from ..models import Entrenador, Alumno
+from ..services import user_management
+from ..services.user_management import RegistrationService, hash_passwords, HASH_POOL_MINIMO
+
+
+@override_settings(PASSWORD_HASH_WORKERS=2)
+@mock.patch.object(os, 'sched_getaffinity', return_value={0, 1, 2, 3}, create=True)
+class HashPasswordsPoolTests(SimpleTestCase):
+
+    def test_pool_is_reused_between_batches(self, _):
+        passwords = [f'clave{n}' for n in range(HASH_POOL_MINIMO)]
+        hashes = hash_passwords(passwords)
+        pool = user_management._hash_executor
+        self.assertIsNotNone(pool)
+
+        self.assertEqual(len(hash_passwords(passwords)), len(passwords))
+        self.assertIs(user_management._hash_executor, pool)
+        self.assertTrue(all(check_password(p, h) for p, h in zip(passwords, hashes)))
+
+    def test_workers_capped_by_available_cores(self, sched_getaffinity):
+        sched_getaffinity.return_value = {0}
+        self.assertEqual(user_management._hash_workers(), 1)
+
+
+class StudentsBulkImportTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.entrenador = Entrenador.objects.create(user=User.objects.create_user(username='coach'), is_active=True)
+
+    def test_username_taken_during_hashing_is_reported_per_row(self):
+        filas = [
+            {'username': f'alumno{n}', 'email': f'alumno{n}@example.com', 'password': 'Clave-segura-123'}
+            for n in range(3)
+        ]
+
+        def hash_with_concurrent_registration(passwords):
+            # Otro registro toma el username de la segunda fila mientras se hashea
+            User.objects.create_user(username='alumno1')
+            return [make_password(password) for password in passwords]
+
+        with mock.patch.object(user_management, 'hash_passwords', side_effect=hash_with_concurrent_registration):
+            usuarios, errores = RegistrationService.register_students_bulk(self.entrenador, filas)
+
+        self.assertEqual(sorted(usuario.username for usuario in usuarios), ['alumno0', 'alumno2'])
+        self.assertEqual(errores, [{'indice': 1, 'errores': {'username': ["Ya existe un usuario con este nombre."]}}])
+        self.assertEqual(Alumno.objects.filter(entrenador=self.entrenador).count(), 2)
@@ -0,0 +1,49 @@
+from unittest import mock
+
+from django.contrib.auth.models import User
+
+from ..models import Entrenador, EventoWebhook
+from ..services.webhook_inbox import WebhookInboxService
+from .base import CacheTestCase
+
+RUTA = '/api/auth/payment/coach-activate/'
+
+
+class CoachActivationWebhookTests(CacheTestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='coach')
+        cls.entrenador = Entrenador.objects.create(user=cls.user, is_active=False)
+
+    def _post(self, **extra):
+        return self.client.post(RUTA, {'user_id': self.user.pk}, content_type='application/json', **extra)
+
+    def test_duplicate_delivery_does_not_write(self):
+        self.assertEqual(self._post(headers={'Idempotency-Key': 'evt_1'}).status_code, 202)
+        with self.assertNumQueries(0):
+            self.assertEqual(self._post(headers={'Idempotency-Key': 'evt_1'}).status_code, 200)
+        self.assertEqual(EventoWebhook.objects.count(), 1)
+
+    def test_retry_after_failed_insert_is_recorded(self):
+        with mock.patch.object(EventoWebhook.objects, 'create', side_effect=RuntimeError('base caída')):
+            with self.assertRaises(RuntimeError):
+                WebhookInboxService.receive('evt_2', self.user.pk)
+        self.assertTrue(WebhookInboxService.receive('evt_2', self.user.pk))
+        self.assertEqual(EventoWebhook.objects.filter(clave='evt_2').count(), 1)
+
+    def test_drain_activates_coach(self):
+        self._post(headers={'Idempotency-Key': 'evt_3'})
+        self.assertEqual(WebhookInboxService.drain_pending(), (1, 1))
+        self.entrenador.refresh_from_db()
+        self.assertTrue(self.entrenador.is_active)
+
+    def test_coach_reactivated_when_delivery_has_no_key(self):
+        self.assertEqual(self._post().status_code, 202)
+        WebhookInboxService.drain_pending()
+        Entrenador.objects.filter(pk=self.entrenador.pk).update(is_active=False)
+
+        self.assertEqual(self._post().status_code, 202)
+        self.assertEqual(WebhookInboxService.drain_pending(), (1, 1))
+        self.entrenador.refresh_from_db()
+        self.assertTrue(self.entrenador.is_active)
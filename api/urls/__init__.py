@@ -2,4 +2,8 @@ from django.urls import path, include
 
 urlpatterns = [
     path('auth/', include('api.urls.auth.urls')), 
-]
\ No newline at end of file
+    path('planes/', include('api.urls.planes.urls')),
+    path('calendario/', include('api.urls.calendario.urls')),
+    path('entrenador/', include('api.urls.entrenador.urls')),
+    path('ejecuciones/', include('api.urls.ejecuciones.urls')),
+]
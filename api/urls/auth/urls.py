@@ -1,9 +1,10 @@
 # api/urls/auth/urls.py
 
 from django.urls import path
-from ...views.auth import RegisterView, CoachActivationWebhookView 
+from ...views.auth import RegisterView, AsyncRegisterView, CoachActivationWebhookView
 
 urlpatterns = [
     path('register/', RegisterView.as_view(), name='register'),
+    path('register/async/', AsyncRegisterView.as_view(), name='register_async'),
     path('payment/coach-activate/', CoachActivationWebhookView.as_view(), name='coach_activation_webhook'),
 ]
\ No newline at end of file
@@ -0,0 +1,8 @@
+# api/urls/calendario/urls.py
+
+from django.urls import path
+from ...views.calendar import CalendarView
+
+urlpatterns = [
+    path('', CalendarView.as_view(), name='calendar'),
+]
@@ -0,0 +1,12 @@
+# api/urls/ejecuciones/urls.py
+
+from django.urls import path
+from ...views.execution import (
+    ExecutionBatchIngestView, ExecutionTrackImportView, ExecutionSamplesView
+)
+
+urlpatterns = [
+    path('lote/', ExecutionBatchIngestView.as_view(), name='execution_batch_ingest'),
+    path('importar/', ExecutionTrackImportView.as_view(), name='execution_track_import'),
+    path('<int:ejecucion_id>/muestras/', ExecutionSamplesView.as_view(), name='execution_samples'),
+]
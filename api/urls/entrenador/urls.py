@@ -0,0 +1,34 @@
+# api/urls/entrenador/urls.py
+
+from django.urls import path
+from ...views.coach import (
+    CoachTodayBoardView,
+    CoachComplianceView,
+    CoachExecutionExportView,
+    StudentWeeklySummaryView,
+    StudentTrainingLoadView,
+    StudentPersonalRecordsView,
+    StudentBulkImportView
+)
+
+urlpatterns = [
+    path('hoy/', CoachTodayBoardView.as_view(), name='coach_today_board'),
+    path('cumplimiento/', CoachComplianceView.as_view(), name='coach_compliance'),
+    path('exportar/', CoachExecutionExportView.as_view(), name='coach_execution_export'),
+    path('alumnos/importar/', StudentBulkImportView.as_view(), name='student_bulk_import'),
+    path(
+        'alumnos/<int:alumno_id>/semanas/',
+        StudentWeeklySummaryView.as_view(),
+        name='student_weekly_summary'
+    ),
+    path(
+        'alumnos/<int:alumno_id>/carga/',
+        StudentTrainingLoadView.as_view(),
+        name='student_training_load'
+    ),
+    path(
+        'alumnos/<int:alumno_id>/records/',
+        StudentPersonalRecordsView.as_view(),
+        name='student_personal_records'
+    ),
+]
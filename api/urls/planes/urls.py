@@ -0,0 +1,16 @@
+# api/urls/planes/urls.py
+
+from django.urls import path
+from ...views.plan_assignment import (
+    CohortAssignmentView,
+    PlanCloneView,
+    PlanTreeView,
+    PlanTreeCacheStatsView
+)
+
+urlpatterns = [
+    path('cache-stats/', PlanTreeCacheStatsView.as_view(), name='plan_tree_cache_stats'),
+    path('<int:plan_id>/', PlanTreeView.as_view(), name='plan_tree'),
+    path('<int:plan_id>/asignar/', CohortAssignmentView.as_view(), name='plan_assign_cohort'),
+    path('<int:plan_id>/clonar/', PlanCloneView.as_view(), name='plan_clone'),
+]
@@ -1,3 +1,10 @@
+import json
+
+from django.db import IntegrityError
+from django.http import JsonResponse
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
 from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.views import APIView
@@ -9,9 +16,78 @@ from drf_yasg import openapi
 from ..serializers.auth import (
     UserSerializer,
     EntrenadorProfileSerializer,
-    AlumnoProfileSerializer
+    AlumnoProfileSerializer,
+    AsyncUserSerializer,
+    AsyncAlumnoProfileSerializer
 )
 from ..services.user_management import RegistrationService
+from ..services.webhook_inbox import WebhookInboxService
+
+
+def registration_response_data(user, role):
+    response_data = {
+        "user_id": user.id,
+        "username": user.username,
+        "role": role
+    }
+
+    if role == 'coach':
+        response_data["message"] = (
+            "Registro de Entrenador exitoso. Por favor, complete el pago para activar su cuenta."
+        )
+        response_data["next_step"] = "/api/v1/payment/setup"
+    else:
+        response_data["message"] = "Registro de Alumno exitoso. ¡Bienvenido!"
+    return response_data
+
+
+REGISTER_REQUEST_BODY = openapi.Schema(
+    type=openapi.TYPE_OBJECT,
+    required=['username', 'email', 'password', 'role'],
+    properties={
+        "username": openapi.Schema(type=openapi.TYPE_STRING, example="juan23"),
+        "email": openapi.Schema(type=openapi.TYPE_STRING, example="juan@gmail.com"),
+        "password": openapi.Schema(type=openapi.TYPE_STRING, example="12345678"),
+        "first_name": openapi.Schema(type=openapi.TYPE_STRING, example="Juan"),
+        "last_name": openapi.Schema(type=openapi.TYPE_STRING, example="Pérez"),
+        "role": openapi.Schema(type=openapi.TYPE_STRING, enum=["coach", "student"], example="coach"),
+
+        # Campos de Perfil Entrenador
+        "especialidad": openapi.Schema(type=openapi.TYPE_STRING, example="Running"),
+        "telefono": openapi.Schema(type=openapi.TYPE_STRING, example="+54 11 5555 0000"),
+        "biografia": openapi.Schema(type=openapi.TYPE_STRING, example="Entrenador certificado AAT"),
+
+        # Campos de Perfil Alumno
+        "entrenador_id": openapi.Schema(type=openapi.TYPE_INTEGER, example=5),
+        "fecha_nacimiento": openapi.Schema(type=openapi.TYPE_STRING, example="1995-06-12"),
+        "peso": openapi.Schema(type=openapi.TYPE_NUMBER, example=70),
+        "altura": openapi.Schema(type=openapi.TYPE_NUMBER, example=1.75),
+        "notas": openapi.Schema(type=openapi.TYPE_STRING, example="Lesión rodilla derecha"),
+    }
+)
+
+REGISTER_RESPONSES = {
+    201: openapi.Response(
+        description="Usuario registrado correctamente.",
+        examples={
+            "coach": {
+                "user_id": 1,
+                "username": "juan23",
+                "role": "coach",
+                "message": "Registro de Entrenador exitoso. Por favor, complete el pago para activar su cuenta.",
+                "next_step": "/api/v1/payment/setup"
+            },
+            "student": {
+                "user_id": 10,
+                "username": "maria22",
+                "role": "student",
+                "message": "Registro de Alumno exitoso. ¡Bienvenido!"
+            }
+        }
+    ),
+    400: "Datos inválidos (por ejemplo, role incorrecto).",
+    500: "Error interno en el servicio de registro."
+}
 
 
 class RegisterView(APIView):
@@ -19,52 +95,8 @@ class RegisterView(APIView):
 
     @swagger_auto_schema(
         operation_description="Registro de usuarios (coach o student).",
-        request_body=openapi.Schema(
-            type=openapi.TYPE_OBJECT,
-            required=['username', 'email', 'password', 'role'],
-            properties={
-                "username": openapi.Schema(type=openapi.TYPE_STRING, example="juan23"),
-                "email": openapi.Schema(type=openapi.TYPE_STRING, example="juan@gmail.com"),
-                "password": openapi.Schema(type=openapi.TYPE_STRING, example="12345678"),
-                "first_name": openapi.Schema(type=openapi.TYPE_STRING, example="Juan"),
-                "last_name": openapi.Schema(type=openapi.TYPE_STRING, example="Pérez"),
-                "role": openapi.Schema(type=openapi.TYPE_STRING, enum=["coach", "student"], example="coach"),
-
-                # Campos de Perfil Entrenador
-                "especialidad": openapi.Schema(type=openapi.TYPE_STRING, example="Running"),
-                "telefono": openapi.Schema(type=openapi.TYPE_STRING, example="+54 11 5555 0000"),
-                "biografia": openapi.Schema(type=openapi.TYPE_STRING, example="Entrenador certificado AAT"),
-
-                # Campos de Perfil Alumno
-                "entrenador_id": openapi.Schema(type=openapi.TYPE_INTEGER, example=5),
-                "fecha_nacimiento": openapi.Schema(type=openapi.TYPE_STRING, example="1995-06-12"),
-                "peso": openapi.Schema(type=openapi.TYPE_NUMBER, example=70),
-                "altura": openapi.Schema(type=openapi.TYPE_NUMBER, example=1.75),
-                "notas": openapi.Schema(type=openapi.TYPE_STRING, example="Lesión rodilla derecha"),
-            }
-        ),
-        responses={
-            201: openapi.Response(
-                description="Usuario registrado correctamente.",
-                examples={
-                    "coach": {
-                        "user_id": 1,
-                        "username": "juan23",
-                        "role": "coach",
-                        "message": "Registro de Entrenador exitoso. Por favor, complete el pago para activar su cuenta.",
-                        "next_step": "/api/v1/payment/setup"
-                    },
-                    "student": {
-                        "user_id": 10,
-                        "username": "maria22",
-                        "role": "student",
-                        "message": "Registro de Alumno exitoso. ¡Bienvenido!"
-                    }
-                }
-            ),
-            400: "Datos inválidos (por ejemplo, role incorrecto).",
-            500: "Error interno en el servicio de registro."
-        }
+        request_body=REGISTER_REQUEST_BODY,
+        responses=REGISTER_RESPONSES
     )
     def post(self, request, *args, **kwargs):
         role = request.data.get('role', None)
@@ -93,46 +125,140 @@ class RegisterView(APIView):
                 role
             )
 
-            response_data = {
-                "user_id": user.id,
-                "username": user.username,
-                "role": role
-            }
+            return Response(registration_response_data(user, role), status=status.HTTP_201_CREATED)
+
+        except Exception as e:
+            return Response(
+                {"detail": "Error en el proceso de registro.", "error": str(e)},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+class AsyncRegisterSchemaView(APIView):
+    """
+    Documentación de AsyncRegisterView para swagger (no se enruta): drf_yasg
+    solo enumera APIViews y la vista async es una View de Django.
+    """
+    permission_classes = [AllowAny]
+
+    @swagger_auto_schema(
+        operation_description=(
+            "Registro de usuarios (coach o student) con una vista async nativa. "
+            "Mismo contrato que /api/auth/register/; rinde más que esta solo si el "
+            "servidor corre bajo ASGI (activapro.asgi)."
+        ),
+        request_body=REGISTER_REQUEST_BODY,
+        responses=REGISTER_RESPONSES
+    )
+    def post(self, request, *args, **kwargs):
+        return Response(status=status.HTTP_405_METHOD_NOT_ALLOWED)
+
+
+@method_decorator(csrf_exempt, name='dispatch')
+class AsyncRegisterView(View):
+    """
+    Mismo contrato que RegisterView como vista async nativa (servida por
+    activapro.asgi). La unicidad se consulta con el ORM async y el hasheo +
+    transacción corren en el pool de RegistrationService, sin ocupar el
+    event loop ni el hilo único de sync_to_async que usan las vistas sync.
+    """
+    http_method_names = ['post']
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        view = super().as_view(**initkwargs)
+        # El generador de swagger documenta la vista con AsyncRegisterSchemaView
+        view.cls = AsyncRegisterSchemaView
+        view.initkwargs = {}
+        return view
+
+    async def post(self, request, *args, **kwargs):
+        try:
+            data = json.loads(request.body or b'{}')
+        except ValueError:
+            return JsonResponse({"detail": "JSON inválido."}, status=status.HTTP_400_BAD_REQUEST)
+        if not isinstance(data, dict):
+            return JsonResponse({"detail": "Se esperaba un objeto JSON."}, status=status.HTTP_400_BAD_REQUEST)
+
+        role = data.get('role', None)
+        if role not in ('coach', 'student'):
+            return JsonResponse(
+                {"role": "Debe especificar un rol válido: 'coach' o 'student'."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
 
-            if role == 'coach':
-                response_data["message"] = (
-                    "Registro de Entrenador exitoso. Por favor, complete el pago para activar su cuenta."
-                )
-                response_data["next_step"] = "/api/v1/payment/setup"
-            else:
-                response_data["message"] = "Registro de Alumno exitoso. ¡Bienvenido!"
+        user_serializer = AsyncUserSerializer(data=data)
+        if not user_serializer.is_valid():
+            return JsonResponse(user_serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-            return Response(response_data, status=status.HTTP_201_CREATED)
+        if role == 'coach':
+            profile_serializer = EntrenadorProfileSerializer(data=data)
+        else:
+            profile_serializer = AsyncAlumnoProfileSerializer(data=data)
+        if not profile_serializer.is_valid():
+            return JsonResponse(profile_serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        user_validated_data = user_serializer.validated_data
+        profile_validated_data = profile_serializer.validated_data
+        errores = await RegistrationService.registration_conflicts(
+            user_validated_data, profile_validated_data, role
+        )
+        if errores:
+            return JsonResponse(errores, status=status.HTTP_400_BAD_REQUEST)
 
+        try:
+            user = await RegistrationService.register_user_and_profile_async(
+                user_validated_data,
+                profile_validated_data,
+                role
+            )
+        except IntegrityError:
+            # Otro registro con el mismo username ganó la carrera
+            return JsonResponse(
+                {"username": ["Ya existe un usuario con este nombre."]},
+                status=status.HTTP_400_BAD_REQUEST
+            )
         except Exception as e:
-            return Response(
+            return JsonResponse(
                 {"detail": "Error en el proceso de registro.", "error": str(e)},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
+        return JsonResponse(registration_response_data(user, role), status=status.HTTP_201_CREATED)
+
+
 class CoachActivationWebhookView(APIView):
+    """
+    Recibe el aviso de pago y lo deja en la bandeja de EventoWebhook; la
+    activación la aplica procesar_webhooks. Las entregas repetidas (misma
+    Idempotency-Key) se responden sin escribir en la base.
+    """
     permission_classes = [AllowAny]
 
     @swagger_auto_schema(
         operation_description="Webhook para activar cuenta de entrenador luego del pago.",
+        manual_parameters=[
+            openapi.Parameter(
+                'Idempotency-Key', openapi.IN_HEADER, type=openapi.TYPE_STRING, required=False,
+                description="Identificador único de la entrega (alternativa: event_id en el cuerpo)."
+            ),
+        ],
         request_body=openapi.Schema(
             type=openapi.TYPE_OBJECT,
             required=['user_id'],
             properties={
                 "user_id": openapi.Schema(type=openapi.TYPE_INTEGER, example=1),
+                "event_id": openapi.Schema(type=openapi.TYPE_STRING, example="evt_1Nx..."),
             }
         ),
         responses={
+            202: openapi.Response(
+                description="Evento encolado; la activación se aplica en segundo plano.",
+                examples={"application/json": {"message": "Evento recibido."}}
+            ),
             200: openapi.Response(
-                description="Entrenador activado correctamente.",
-                examples={"application/json": {"message": "Entrenador activado."}}
+                description="Entrega duplicada, ya registrada.",
+                examples={"application/json": {"message": "Evento duplicado."}}
             ),
-            404: "No se encontró el entrenador.",
             400: "Falta user_id.",
         }
     )
@@ -141,10 +267,15 @@ class CoachActivationWebhookView(APIView):
 
         if not user_id:
             return Response({"detail": "Falta el user_id."}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            user_id = int(user_id)
+        except (TypeError, ValueError):
+            return Response({"detail": "user_id inválido."}, status=status.HTTP_400_BAD_REQUEST)
 
-        success, message = RegistrationService.activate_coach(user_id)
-
-        if success:
-            return Response({"message": message}, status=status.HTTP_200_OK)
-        else:
-            return Response({"message": message}, status=status.HTTP_404_NOT_FOUND)
+        clave = WebhookInboxService.idempotency_key(
+            request.headers.get('Idempotency-Key') or request.data.get('event_id'), user_id
+        )
+        payload = dict(request.data) if isinstance(request.data, dict) else {}
+        if WebhookInboxService.receive(clave, user_id, payload):
+            return Response({"message": "Evento recibido."}, status=status.HTTP_202_ACCEPTED)
+        return Response({"message": "Evento duplicado."}, status=status.HTTP_200_OK)
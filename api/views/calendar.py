@@ -0,0 +1,75 @@
+from django.db.models import Prefetch
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from drf_yasg.utils import swagger_auto_schema
+from drf_yasg import openapi
+
+from ..models.plan_assignment import DiaAsignado
+from ..models.execution import EjecucionEntrenamiento
+from ..permissions import IsStudent
+from ..serializers.calendar import CalendarRangeSerializer, CalendarDaySerializer
+from ..services.calendar import CalendarService
+
+# Relaciones de DiaPlantilla que necesita CalendarDaySerializer
+# (los tipos salen de CatalogService)
+PLANTILLA_RELATED = ('rutina',)
+
+
+def calendar_days_queryset():
+    """
+    Días con todo lo que serializa el calendario en un número constante de
+    consultas: plantilla y rutina por JOIN y las ejecuciones con un
+    único prefetch (la más reciente primero).
+    """
+    return (
+        DiaAsignado.objects
+        .select_related(*(f'dia_plantilla__{relacion}' for relacion in PLANTILLA_RELATED))
+        .prefetch_related(Prefetch(
+            'ejecuciones',
+            queryset=EjecucionEntrenamiento.objects.order_by('-fecha_hora_ejecucion'),
+            to_attr='ejecuciones_recientes'
+        ))
+    )
+
+
+class CalendarView(APIView):
+    permission_classes = [IsStudent]
+
+    @swagger_auto_schema(
+        operation_description="Calendario del alumno autenticado entre dos fechas (máximo 92 días).",
+        manual_parameters=[
+            openapi.Parameter('from', openapi.IN_QUERY, type=openapi.TYPE_STRING, format='date', required=True),
+            openapi.Parameter('to', openapi.IN_QUERY, type=openapi.TYPE_STRING, format='date', required=True),
+        ],
+        responses={
+            200: CalendarDaySerializer(many=True),
+            400: "Rango de fechas inválido.",
+        }
+    )
+    def get(self, request):
+        rango = CalendarRangeSerializer(data={
+            'desde': request.query_params.get('from'),
+            'hasta': request.query_params.get('to'),
+        })
+        if not rango.is_valid():
+            errores = rango.errors
+            # Se exponen los errores con los nombres de los parámetros de la URL
+            for interno, externo in (('desde', 'from'), ('hasta', 'to')):
+                if interno in errores:
+                    errores[externo] = errores.pop(interno)
+            return Response(errores, status=status.HTTP_400_BAD_REQUEST)
+
+        desde = rango.validated_data['desde']
+        hasta = rango.validated_data['hasta']
+
+        asignaciones = CalendarService.assignments_for(request.user.alumno, desde, hasta)
+        dias = CalendarService.days_in_range(
+            asignaciones,
+            desde,
+            hasta,
+            queryset=calendar_days_queryset(),
+            plantilla_related=PLANTILLA_RELATED
+        )
+        return Response(CalendarDaySerializer(dias, many=True).data, status=status.HTTP_200_OK)
@@ -0,0 +1,325 @@
+import csv
+from datetime import timedelta
+
+from django.http import StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.parsers import JSONParser, MultiPartParser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from drf_yasg.utils import swagger_auto_schema
+from drf_yasg import openapi
+
+from ..models.user_profiles import Alumno
+from ..models.analytics import ResumenSemanal
+from ..permissions import IsCoach
+from ..serializers.analytics import (
+    ResumenSemanalSerializer, DateRangeSerializer, RecordPersonalSerializer, RecordQuerySerializer
+)
+from ..serializers.execution_export import ExecutionExportQuerySerializer
+from ..serializers.auth import AlumnoImportSerializer
+from ..services.coach_board import CoachBoardService
+from ..services.compliance import ComplianceService
+from ..services.execution_export import ExecutionExportService
+from ..services.training_load import TrainingLoadService
+from ..services.personal_records import PersonalRecordService
+from ..services.user_management import RegistrationService
+
+# Rango por defecto del reporte de cumplimiento
+CUMPLIMIENTO_SEMANAS_DEFECTO = 12
+# Rango por defecto de las curvas de carga
+CARGA_DIAS_DEFECTO = 180
+
+
+class CoachTodayBoardView(APIView):
+    permission_classes = [IsCoach]
+
+    @swagger_auto_schema(
+        operation_description="Entrenamiento de hoy de cada alumno del entrenador y si ya fue completado.",
+        responses={
+            200: openapi.Response(
+                description="Tablero del día.",
+                examples={
+                    "application/json": [
+                        {
+                            "alumno_id": 10,
+                            "alumno": "María Gómez",
+                            "asignacion_plan": 31,
+                            "plan": "Preparación 10K",
+                            "fecha": "2026-10-18",
+                            "es_descanso": False,
+                            "rutina": {
+                                "id": 4,
+                                "nombre": "5x800m",
+                                "detalles": "recuperación 2min",
+                                "tipo_actividad": "Running"
+                            },
+                            "notas": "",
+                            "completado": True
+                        }
+                    ]
+                }
+            ),
+        }
+    )
+    def get(self, request):
+        tablero = CoachBoardService.today_board(request.user.entrenador)
+        return Response(tablero, status=status.HTTP_200_OK)
+
+
+class StudentWeeklySummaryView(APIView):
+    permission_classes = [IsCoach]
+
+    @swagger_auto_schema(
+        operation_description="Totales semanales (km, minutos, sesiones, pulsaciones) de un alumno del entrenador.",
+        query_serializer=DateRangeSerializer,
+        responses={
+            200: ResumenSemanalSerializer(many=True),
+            404: "No se encontró el alumno.",
+        }
+    )
+    def get(self, request, alumno_id):
+        alumno = get_object_or_404(Alumno, pk=alumno_id, entrenador=request.user.entrenador)
+
+        rango = DateRangeSerializer(data=request.query_params)
+        rango.is_valid(raise_exception=True)
+
+        resumenes = ResumenSemanal.objects.filter(alumno=alumno)
+        if rango.validated_data.get('desde'):
+            resumenes = resumenes.filter(semana__gte=rango.validated_data['desde'])
+        if rango.validated_data.get('hasta'):
+            resumenes = resumenes.filter(semana__lte=rango.validated_data['hasta'])
+
+        return Response(
+            ResumenSemanalSerializer(
+                resumenes.order_by('semana'), many=True, context={'entrenador_id': alumno.entrenador_id}
+            ).data,
+            status=status.HTTP_200_OK
+        )
+
+
+class StudentTrainingLoadView(APIView):
+    permission_classes = [IsCoach]
+
+    @swagger_auto_schema(
+        operation_description=(
+            "Curvas de carga diaria de un alumno del entrenador: TRIMP, carga aguda (ATL, 7 días), "
+            "crónica (CTL, 42 días) y balance (TSB). Por defecto, los últimos 180 días."
+        ),
+        query_serializer=DateRangeSerializer,
+        responses={
+            200: openapi.Response(
+                description="Un elemento por día del rango.",
+                examples={
+                    "application/json": [
+                        {"fecha": "2026-10-12", "trimp": 96.4, "atl": 52.3, "ctl": 41.8, "tsb": -8.2}
+                    ]
+                }
+            ),
+            404: "No se encontró el alumno.",
+        }
+    )
+    def get(self, request, alumno_id):
+        alumno = get_object_or_404(Alumno, pk=alumno_id, entrenador=request.user.entrenador)
+
+        rango = DateRangeSerializer(data=request.query_params)
+        rango.is_valid(raise_exception=True)
+        hasta = rango.validated_data.get('hasta') or timezone.localdate()
+        desde = rango.validated_data.get('desde') or hasta - timedelta(days=CARGA_DIAS_DEFECTO - 1)
+        if desde > hasta:
+            return Response(
+                {"desde": "La fecha 'desde' debe ser anterior a 'hasta'."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        return Response(
+            TrainingLoadService.series(alumno.pk, desde, hasta),
+            status=status.HTTP_200_OK
+        )
+
+
+class StudentPersonalRecordsView(APIView):
+    permission_classes = [IsCoach]
+
+    @swagger_auto_schema(
+        operation_description=(
+            "Records personales de un alumno del entrenador por tipo de actividad: mejor ritmo "
+            "en 1k / 5k / 10k / media maratón / maratón (tiempo estimado a ese ritmo) y distancia más larga."
+        ),
+        query_serializer=RecordQuerySerializer,
+        responses={
+            200: RecordPersonalSerializer(many=True),
+            404: "No se encontró el alumno.",
+        }
+    )
+    def get(self, request, alumno_id):
+        alumno = get_object_or_404(Alumno, pk=alumno_id, entrenador=request.user.entrenador)
+
+        consulta = RecordQuerySerializer(data=request.query_params)
+        consulta.is_valid(raise_exception=True)
+
+        records = PersonalRecordService.records(
+            alumno.pk, consulta.validated_data.get('tipo_actividad')
+        )
+        return Response(
+            RecordPersonalSerializer(
+                records, many=True, context={'entrenador_id': alumno.entrenador_id}
+            ).data,
+            status=status.HTTP_200_OK
+        )
+
+
+class CoachComplianceView(APIView):
+    permission_classes = [IsCoach]
+
+    @swagger_auto_schema(
+        operation_description=(
+            "Cumplimiento por alumno y semana: días planificados (con rutina) vs. completados. "
+            "Por defecto, las últimas 12 semanas."
+        ),
+        query_serializer=DateRangeSerializer,
+        responses={
+            200: openapi.Response(
+                description="Cumplimiento por alumno y semana.",
+                examples={
+                    "application/json": [
+                        {
+                            "alumno_id": 10,
+                            "alumno": "María Gómez",
+                            "semana": "2026-10-12",
+                            "planificados": 4,
+                            "completados": 3,
+                            "cumplimiento": 0.75
+                        }
+                    ]
+                }
+            ),
+        }
+    )
+    def get(self, request):
+        rango = DateRangeSerializer(data=request.query_params)
+        rango.is_valid(raise_exception=True)
+
+        hasta = rango.validated_data.get('hasta') or timezone.localdate()
+        desde = rango.validated_data.get('desde') or (
+            hasta - timedelta(weeks=CUMPLIMIENTO_SEMANAS_DEFECTO)
+        )
+        if desde > hasta:
+            return Response(
+                {"desde": "La fecha 'desde' debe ser anterior a 'hasta'."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        resultado = ComplianceService.coach_compliance(request.user.entrenador, desde, hasta)
+        return Response(resultado, status=status.HTTP_200_OK)
+
+
+class CoachExecutionExportView(APIView):
+    permission_classes = [IsCoach]
+
+    @swagger_auto_schema(
+        operation_description=(
+            "Exporta en streaming el historial de ejecuciones de los alumnos del entrenador "
+            "en CSV o NDJSON, opcionalmente comprimido en gzip."
+        ),
+        query_serializer=ExecutionExportQuerySerializer,
+        responses={
+            200: "Archivo CSV / NDJSON (o .gz).",
+            404: "No se encontró el alumno.",
+        }
+    )
+    def get(self, request):
+        entrenador = request.user.entrenador
+        parametros = ExecutionExportQuerySerializer(data=request.query_params)
+        parametros.is_valid(raise_exception=True)
+        data = parametros.validated_data
+
+        alumno_id = data.get('alumno')
+        if alumno_id is not None:
+            get_object_or_404(Alumno, pk=alumno_id, entrenador=entrenador)
+
+        filas = ExecutionExportService.rows(
+            entrenador.pk,
+            desde=data.get('desde'),
+            hasta=data.get('hasta'),
+            alumno_id=alumno_id
+        )
+        if data['formato'] == 'csv':
+            lineas = ExecutionExportService.csv_lines(filas)
+            content_type = 'text/csv; charset=utf-8'
+        else:
+            lineas = ExecutionExportService.ndjson_lines(filas)
+            content_type = 'application/x-ndjson; charset=utf-8'
+
+        nombre = f"ejecuciones.{data['formato']}"
+        if data['gzip']:
+            nombre += '.gz'
+            content_type = 'application/gzip'
+
+        response = StreamingHttpResponse(
+            ExecutionExportService.encode(lineas, comprimir=data['gzip']),
+            content_type=content_type
+        )
+        response['Content-Disposition'] = f'attachment; filename="{nombre}"'
+        return response
+
+
+class StudentBulkImportView(APIView):
+    permission_classes = [IsCoach]
+    parser_classes = [JSONParser, MultiPartParser]
+
+    @swagger_auto_schema(
+        operation_description=(
+            "Alta masiva de alumnos del entrenador desde JSON ('alumnos') o un CSV ('archivo') con "
+            "las columnas username, email, password, first_name, last_name, fecha_nacimiento, "
+            "telefono, peso, altura, notas. Las filas inválidas se reportan por índice sin abortar el resto."
+        ),
+        request_body=AlumnoImportSerializer,
+        responses={
+            201: openapi.Response(
+                description="Alumnos registrados.",
+                examples={
+                    "application/json": {
+                        "creados": 2,
+                        "usuarios": [
+                            {"user_id": 31, "username": "maria22"},
+                            {"user_id": 32, "username": "pedro_r"}
+                        ],
+                        "errores": [
+                            {"indice": 2, "errores": {"email": ["Ya existe un usuario con este email."]}}
+                        ]
+                    }
+                }
+            ),
+            400: "Ninguna fila es válida o el archivo no se pudo leer.",
+        }
+    )
+    def post(self, request):
+        serializer = AlumnoImportSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        filas = serializer.validated_data.get('alumnos')
+        if filas is None:
+            try:
+                filas = RegistrationService.read_students_csv(serializer.validated_data['archivo'])
+            except (UnicodeDecodeError, csv.Error) as e:
+                return Response(
+                    {"archivo": f"No se pudo leer el CSV: {e}"},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+        try:
+            usuarios, errores = RegistrationService.register_students_bulk(request.user.entrenador, filas)
+        except ValueError as e:
+            return Response({"alumnos": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        response_data = {
+            "creados": len(usuarios),
+            "usuarios": [{"user_id": usuario.id, "username": usuario.username} for usuario in usuarios],
+            "errores": errores
+        }
+        if not usuarios:
+            return Response(response_data, status=status.HTTP_400_BAD_REQUEST)
+        return Response(response_data, status=status.HTTP_201_CREATED)
@@ -0,0 +1,165 @@
+from django.db.models import Q
+from django.http import Http404
+from rest_framework import status
+from rest_framework.parsers import MultiPartParser
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from drf_yasg.utils import swagger_auto_schema
+from drf_yasg import openapi
+
+from ..models.execution import EjecucionEntrenamiento
+from ..permissions import IsStudent
+from ..serializers.execution import (
+    EjecucionIngestSerializer, TrackImportSerializer, SampleChartQuerySerializer
+)
+from ..services.execution_ingest import ExecutionIngestService
+from ..services.track_import import TrackImportService
+from ..services.execution_samples import ExecutionSamplesService
+
+
+class ExecutionBatchIngestView(APIView):
+    permission_classes = [IsStudent]
+
+    @swagger_auto_schema(
+        operation_description=(
+            "Sincronización por lotes de ejecuciones (reloj / app). "
+            "Los elementos inválidos se reportan por índice sin abortar el lote."
+        ),
+        request_body=EjecucionIngestSerializer,
+        responses={
+            201: openapi.Response(
+                description="Ejecuciones registradas.",
+                examples={
+                    "application/json": {
+                        "creadas": 2,
+                        "ejecucion_ids": [120, 121],
+                        "errores": [
+                            {"indice": 2, "errores": {"fecha_hora_ejecucion": ["Este campo es requerido."]}}
+                        ]
+                    }
+                }
+            ),
+            400: "Ninguna ejecución del lote es válida.",
+        }
+    )
+    def post(self, request):
+        serializer = EjecucionIngestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        ejecuciones, errores = ExecutionIngestService.ingest(
+            request.user.alumno,
+            serializer.validated_data['ejecuciones']
+        )
+
+        response_data = {
+            "creadas": len(ejecuciones),
+            "ejecucion_ids": [ejecucion.id for ejecucion in ejecuciones],
+            "errores": errores
+        }
+        if not ejecuciones:
+            return Response(response_data, status=status.HTTP_400_BAD_REQUEST)
+        return Response(response_data, status=status.HTTP_201_CREATED)
+
+
+class ExecutionTrackImportView(APIView):
+    permission_classes = [IsStudent]
+    parser_classes = [MultiPartParser]
+
+    @swagger_auto_schema(
+        operation_description=(
+            "Registra una ejecución a partir de un archivo GPX o TCX del reloj. "
+            "Distancia, duración (tiempo en movimiento), ritmo y pulsaciones se calculan del track."
+        ),
+        request_body=TrackImportSerializer,
+        responses={
+            201: openapi.Response(
+                description="Ejecución registrada.",
+                examples={
+                    "application/json": {
+                        "ejecucion_id": 122,
+                        "metricas": {
+                            "inicio": "2026-10-12T09:58:03Z",
+                            "distancia_km": "10.04",
+                            "tiempo_total_seg": 3320,
+                            "tiempo_movimiento_seg": 3185,
+                            "duracion_minutos": 53,
+                            "ritmo": "5:17/km",
+                            "pulsaciones_promedio": 151,
+                            "pulsaciones_max": 174,
+                            "puntos": 3321
+                        }
+                    }
+                }
+            ),
+            400: "Archivo inválido o día inexistente.",
+        }
+    )
+    def post(self, request):
+        serializer = TrackImportSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        datos = dict(serializer.validated_data)
+        archivo = datos.pop('archivo')
+
+        try:
+            track = TrackImportService.parse(archivo)
+        except ValueError as e:
+            return Response({"archivo": [str(e)]}, status=status.HTTP_400_BAD_REQUEST)
+
+        ejecucion, errores, metricas = TrackImportService.import_execution(
+            request.user.alumno, track, datos
+        )
+        if ejecucion is None:
+            return Response(
+                {"errores": errores[0]['errores'] if errores else {}, "metricas": metricas},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        return Response(
+            {"ejecucion_id": ejecucion.id, "metricas": metricas},
+            status=status.HTTP_201_CREATED
+        )
+
+
+class ExecutionSamplesView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_description=(
+            "Muestras de pulsaciones, velocidad (m/s) y altitud de una ejecución importada, "
+            "reducidas para gráficos. Sin rango se usa la vista precalculada de 500 puntos; "
+            "con desde / hasta (segundos desde el inicio) se reduce el tramo pedido. "
+            "Accesible para el alumno y su entrenador."
+        ),
+        query_serializer=SampleChartQuerySerializer,
+        responses={
+            200: openapi.Response(
+                description="Canales como pares [segundo, valor].",
+                examples={
+                    "application/json": {
+                        "inicio": "2026-10-12T09:58:03Z",
+                        "duracion_seg": 3320,
+                        "puntos_originales": 3321,
+                        "canales": {
+                            "pulsaciones": [[0, 98.0], [7, 112.0]],
+                            "velocidad": [[1, 2.81], [7, 2.95]],
+                            "altitud": [[0, 25.4], [7, 25.6]]
+                        }
+                    }
+                }
+            ),
+            404: "La ejecución no existe, no es accesible o no tiene muestras.",
+        }
+    )
+    def get(self, request, ejecucion_id):
+        consulta = SampleChartQuerySerializer(data=request.query_params)
+        consulta.is_valid(raise_exception=True)
+
+        visible = Q(alumno__user=request.user) | Q(alumno__entrenador__user=request.user)
+        if not EjecucionEntrenamiento.objects.filter(visible, pk=ejecucion_id).exists():
+            raise Http404
+
+        datos = ExecutionSamplesService.chart(ejecucion_id, **consulta.validated_data)
+        if datos is None:
+            raise Http404
+        return Response(datos, status=status.HTTP_200_OK)
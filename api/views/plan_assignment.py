@@ -0,0 +1,155 @@
+from django.db.models import Q
+from django.shortcuts import get_object_or_404
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from rest_framework.permissions import IsAdminUser
+
+from drf_yasg.utils import swagger_auto_schema
+from drf_yasg import openapi
+
+from ..models.training_plan import PlanEntrenamiento
+from ..permissions import IsCoach
+from ..serializers.plan_assignment import CohortAssignmentSerializer
+from ..serializers.plan_clone import PlanCloneSerializer
+from ..serializers.training_plan import PlanTreeSerializer
+from ..services.plan_assignment import PlanAssignmentService
+from ..services.plan_clone import PlanCloneService
+from ..services.plan_tree import PlanTreeService
+
+
+class CohortAssignmentView(APIView):
+    permission_classes = [IsCoach]
+
+    @swagger_auto_schema(
+        operation_description="Asigna un plan (plantilla) a un grupo de alumnos en una sola llamada.",
+        request_body=CohortAssignmentSerializer,
+        responses={
+            201: openapi.Response(
+                description="Asignaciones creadas. Los alumnos con errores se reportan sin abortar el lote.",
+                examples={
+                    "application/json": {
+                        "creadas": 2,
+                        "asignaciones": [
+                            {"alumno_id": 10, "asignacion_id": 31},
+                            {"alumno_id": 11, "asignacion_id": 32}
+                        ],
+                        "errores": [
+                            {"alumno_id": 12, "error": "El alumno ya tiene este plan activo."}
+                        ]
+                    }
+                }
+            ),
+            400: "Datos inválidos o ningún alumno pudo ser asignado.",
+            404: "No se encontró el plan.",
+        }
+    )
+    def post(self, request, plan_id):
+        plan = get_object_or_404(
+            PlanEntrenamiento,
+            pk=plan_id,
+            entrenador=request.user.entrenador
+        )
+
+        serializer = CohortAssignmentSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        asignaciones, errores = PlanAssignmentService.assign_cohort(
+            plan,
+            data['alumno_ids'],
+            data['fecha_inicio'],
+            data.get('fecha_fin'),
+            data['modo_calendario']
+        )
+
+        response_data = {
+            "creadas": len(asignaciones),
+            "asignaciones": [
+                {"alumno_id": a.alumno_id, "asignacion_id": a.id} for a in asignaciones
+            ],
+            "errores": errores
+        }
+        if not asignaciones:
+            return Response(response_data, status=status.HTTP_400_BAD_REQUEST)
+        return Response(response_data, status=status.HTTP_201_CREATED)
+
+
+class PlanCloneView(APIView):
+    permission_classes = [IsCoach]
+
+    @swagger_auto_schema(
+        operation_description=(
+            "Clona un plan con todas sus semanas y días plantilla en la cuenta del entrenador. "
+            "Se pueden clonar los planes propios y las plantillas de otros entrenadores."
+        ),
+        request_body=PlanCloneSerializer,
+        responses={
+            201: openapi.Response(
+                description="Plan clonado.",
+                examples={"application/json": {"plan_id": 42, "nombre": "Preparación 10K (copia)"}}
+            ),
+            404: "No se encontró el plan.",
+        }
+    )
+    def post(self, request, plan_id):
+        entrenador = request.user.entrenador
+        plan = get_object_or_404(
+            PlanEntrenamiento.objects.filter(Q(entrenador=entrenador) | Q(is_template=True)),
+            pk=plan_id
+        )
+
+        serializer = PlanCloneSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        nuevo_plan = PlanCloneService.clone_plan(
+            plan,
+            entrenador=entrenador,
+            nombre=serializer.validated_data.get('nombre'),
+            is_template=serializer.validated_data.get('is_template')
+        )
+        return Response(
+            {"plan_id": nuevo_plan.id, "nombre": nuevo_plan.nombre},
+            status=status.HTTP_201_CREATED
+        )
+
+
+class PlanTreeView(APIView):
+    permission_classes = [IsCoach]
+
+    @swagger_auto_schema(
+        operation_description=(
+            "Plan completo con semanas, días plantilla, rutinas y tipos. "
+            "Se sirve desde una caché versionada que se invalida al editar el plan."
+        ),
+        responses={
+            200: PlanTreeSerializer,
+            404: "No se encontró el plan.",
+        }
+    )
+    def get(self, request, plan_id):
+        entrenador = request.user.entrenador
+        visible = PlanEntrenamiento.objects.filter(
+            Q(entrenador=entrenador) | Q(is_template=True),
+            pk=plan_id
+        ).exists()
+        arbol = PlanTreeService.get_tree(plan_id) if visible else None
+        if arbol is None:
+            return Response({"detail": "No se encontró el plan."}, status=status.HTTP_404_NOT_FOUND)
+        return Response(arbol, status=status.HTTP_200_OK)
+
+
+class PlanTreeCacheStatsView(APIView):
+    permission_classes = [IsAdminUser]
+
+    @swagger_auto_schema(
+        operation_description="Aciertos y fallos de la caché de árboles de planes.",
+        responses={
+            200: openapi.Response(
+                description="Contadores de la caché.",
+                examples={"application/json": {"hits": 950, "misses": 50, "hit_ratio": 0.95}}
+            ),
+        }
+    )
+    def get(self, request):
+        return Response(PlanTreeService.stats(), status=status.HTTP_200_OK)